@@ -128,15 +128,13 @@ def avaliar_e_incrementar():
         y_treino = []
         
         for i in range(len(sorteios_historico) - 1):
-            historico_parcial = sorteios_historico[:i+1]
             sorteio_alvo = sorteios_historico[i+1]
             
             # CORREÇÃO CRUCIAL:
             # O método 'get_previsoes' do despachante espera um dicionário de estatísticas,
-            # não uma lista de sorteios. Criamos uma instância temporária de Dados
-            # para calcular as estatísticas com base no histórico parcial.
-            dados_parciais = Dados()
-            dados_parciais.sorteios = historico_parcial
+            # não uma lista de sorteios. Usamos uma vista de Dados sobre o histórico
+            # parcial, que reutiliza os sorteios já carregados.
+            dados_parciais = dados.ate(i + 1)
             estatisticas_parciais, _ = dados_parciais.obter_estatisticas(todas_dependencias)
 
             # Passa as estatísticas calculadas corretamente para o despachante.
@@ -2,7 +2,6 @@
 import os
 import sys
 import json
-import numpy as np
 import joblib
 import datetime
 import importlib
@@ -17,8 +16,9 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 # Importa as classes e funções corretas para a nova estrutura do projeto
-from lib.despachante import Despachante, criar_despachante_otimizado
+from lib.despachante_new import Despachante, criar_despachante_otimizado
 from lib.dados import Dados
+from decisor.tensor_previsoes import TensorPrevisoes
 
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
@@ -37,6 +37,7 @@ MODELOS_ML_DIR = os.path.join(PROJECT_ROOT, 'modelos_ml')
 
 # NOVO: Caminho para histórico de otimização
 HISTORICO_OTIMIZACAO_PATH = os.path.join(PROJECT_ROOT, 'decisor', 'historico_otimizacao.json')
+PERFIL_HEURISTICAS_PATH = os.path.join(PROJECT_ROOT, 'decisor', 'perfil_heuristicas.json')
 
 if not os.path.exists(MODELOS_DIR):
     os.makedirs(MODELOS_DIR)
@@ -126,13 +127,14 @@ def avaliar_e_incrementar(usar_heuristicas_dinamicas: bool = True, forcar_reatre
 
     try:
         # 2. Carrega todas as heurísticas (FIXAS + DINÂMICAS) e o histórico de sorteios
-        dados = Dados()
+        dados = Dados(usar_cache_persistente=True)
         sorteios_historico = dados.sorteios
         
         print(f"📊 Carregando {len(sorteios_historico)} sorteios históricos...")
         
         # NOVO: Usar despachante otimizado com heurísticas dinâmicas
-        despachante = criar_despachante_otimizado() if usar_heuristicas_dinamicas else Despachante(usar_dinamicas=False)
+        despachante = (criar_despachante_otimizado(usar_cache_previsoes=True) if usar_heuristicas_dinamicas
+                       else Despachante(usar_dinamicas=False, usar_cache_previsoes=True))
         
         # NOVO: Reavaliar heurísticas dinâmicas se ativadas
         if usar_heuristicas_dinamicas:
@@ -144,8 +146,6 @@ def avaliar_e_incrementar(usar_heuristicas_dinamicas: bool = True, forcar_reatre
         print(f"🔧 Sistema com {stats['total_heuristicas']} heurísticas "
               f"({stats['heuristicas_fixas']} fixas + {stats['heuristicas_dinamicas']} dinâmicas)")
 
-        todas_dependencias = despachante.obter_todas_dependencias()
-
         # Obtém a lista de heurísticas disponíveis a partir dos metadados.
         metadados_heuristicas = despachante.obter_metadados()
         
@@ -160,37 +160,15 @@ def avaliar_e_incrementar(usar_heuristicas_dinamicas: bool = True, forcar_reatre
             return
 
         print(f"🔄 Simulando previsões de {len(heuristicas_ordenadas)} heurísticas para dados históricos...")
-        X_treino = []
-        y_treino = []
-        
         total_sorteios = len(sorteios_historico)
         print(f"📈 Processando {total_sorteios - 1} pontos de treino...")
         
-        for i in range(len(sorteios_historico) - 1):
-            if (i + 1) % 50 == 0:
-                print(f"   📊 Processados {i + 1}/{total_sorteios - 1} sorteios...")
-                
-            historico_parcial = sorteios_historico[:i+1]
-            sorteio_alvo = sorteios_historico[i+1]
-            
-            # CORREÇÃO CRUCIAL:
-            # O método 'get_previsoes' do despachante espera um dicionário de estatísticas,
-            # não uma lista de sorteios. Criamos uma instância temporária de Dados
-            # para calcular as estatísticas com base no histórico parcial.
-            dados_parciais = Dados()
-            dados_parciais.sorteios = historico_parcial
-            estatisticas_parciais, _ = dados_parciais.obter_estatisticas(todas_dependencias)
-
-            # Passa as estatísticas calculadas corretamente para o despachante.
-            previsoes_sorteio_atual = despachante.get_previsoes(estatisticas_parciais)
-
-            for num in range(1, 50):
-                feature_vector = [1 if num in previsoes_sorteio_atual.get(h, []) else 0 for h in heuristicas_ordenadas]
-                X_treino.append(feature_vector)
-                y_treino.append(1 if num in sorteio_alvo.get("numeros", []) else 0)
-
-        X_treino_np = np.array(X_treino)
-        y_treino_np = np.array(y_treino)
+        # As previsões de cada ponto do histórico vêm do tensor persistente de previsões,
+        # partilhado com o treino e os relatórios: só o que falta nele é simulado.
+        tensor = TensorPrevisoes.para_dados(dados).atualizar(dados, despachante)
+
+        X_treino_np = tensor.caracteristicas(heuristicas_ordenadas, fim=total_sorteios - 1)
+        y_treino_np = dados.matriz.incidencia[1:total_sorteios, :49].reshape(-1).astype(int)
 
         print(f"✅ Conjunto de treino criado: {X_treino_np.shape[0]} amostras, {X_treino_np.shape[1]} características")
 
@@ -264,6 +242,9 @@ def avaliar_e_incrementar(usar_heuristicas_dinamicas: bool = True, forcar_reatre
         print(f"   • Modelos treinados: {len(resultados_treino)}")
         print(f"   • Dataset: {X_treino_np.shape[0]} amostras × {X_treino_np.shape[1]} características")
         print(f"   • Sorteios processados: {total_sorteios}")
+
+        despachante.perfil.exportar_json(PERFIL_HEURISTICAS_PATH)
+        despachante.perfil.imprimir_resumo()
         
         if resultados_treino:
             melhor_modelo = max(resultados_treino.items(), key=lambda x: x[1]['score_treino'])
@@ -55,25 +55,20 @@ class HeuristicDecisor:
 
     def _get_feature_vector(self, previsoes_atuais: List[Dict[str, Any]]) -> np.ndarray:
         """
-        Cria um array NumPy de características (features) para um único sorteio.
-        (A lógica desta função permanece a mesma)
+        Cria um array NumPy de características (features) para um único sorteio:
+        49 linhas (números) x uma coluna por heurística, com 1 se a heurística sugeriu o número.
         """
-        previsoes_dict = {p.get('nome'): set(p.get('numeros', [])) for p in previsoes_atuais}
+        previsoes_dict = {p.get('nome'): p.get('numeros', []) for p in previsoes_atuais}
         
-        feature_vectors = []
-        for num in range(1, 50):
-            # Vetor binário que indica se cada heurística sugeriu o número
-            vector = [1 if num in previsoes_dict.get(nome, set()) else 0 for nome in self.heuristicas_ordenadas]
-            feature_vectors.append(vector)
+        feature_vectors = np.zeros((49, len(self.heuristicas_ordenadas)), dtype=int)
+        for coluna, nome in enumerate(self.heuristicas_ordenadas):
+            numeros = [num - 1 for num in previsoes_dict.get(nome, []) if 1 <= num <= 49]
+            feature_vectors[numeros, coluna] = 1
             
-        return np.array(feature_vectors)
+        return feature_vectors
 
-    def predict(self, detalhes_previsoes: List[Dict[str, Any]], n_resultados: int = 5) -> List[int]:
-        """
-        Faz a previsão usando o ensemble de modelos e retorna os 5 números mais prováveis.
-        """
-        feature_vectors = self._get_feature_vector(detalhes_previsoes)
-        
+    def _prever_de_caracteristicas(self, feature_vectors: np.ndarray, n_resultados: int = 5) -> List[int]:
+        """Combina as probabilidades do ensemble de modelos e devolve os números mais prováveis."""
         if feature_vectors.size == 0:
             return []
             
@@ -98,3 +93,18 @@ class HeuristicDecisor:
         previsao_final = [numero for prob, numero in probabilidades_por_numero[:n_resultados]]
         
         return previsao_final
+
+    def predict(self, detalhes_previsoes: List[Dict[str, Any]], n_resultados: int = 5) -> List[int]:
+        """
+        Faz a previsão usando o ensemble de modelos e retorna os 5 números mais prováveis.
+        """
+        return self._prever_de_caracteristicas(self._get_feature_vector(detalhes_previsoes), n_resultados)
+
+    def predict_do_tensor(self, tensor, linha: int = -1, n_resultados: int = 5) -> List[int]:
+        """
+        Como `predict`, mas com as características fatiadas de um `TensorPrevisoes` já
+        atualizado (por omissão a última linha: a previsão para o próximo sorteio).
+        """
+        linha = range(tensor.linhas)[linha]
+        feature_vectors = tensor.caracteristicas(self.heuristicas_ordenadas, linha, linha + 1)[:49]
+        return self._prever_de_caracteristicas(feature_vectors, n_resultados)
@@ -0,0 +1,206 @@
+# decisor/tensor_previsoes.py
+
+import os
+import re
+import json
+import hashlib
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+from lib.armazem_sorteios import PASTA_COMPILADA
+
+# Pasta (dentro de `dados/.compilado/<jogo>/`) com o tensor das previsões
+PASTA_TENSOR = 'previsoes'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+VERSAO_FORMATO = 1
+
+
+class TensorPrevisoes:
+    """
+    Tensor persistente das previsões das heurísticas: T sorteios x H heurísticas x
+    números, com um bit por número (`np.packbits`: 7 bytes por previsão no Totoloto).
+
+    A linha `i` é a previsão de cada heurística conhecendo os primeiros `i + 1`
+    sorteios (`dados.ate(i + 1)`), ou seja, a previsão para o sorteio `i + 1`; a última
+    linha é a previsão para o próximo sorteio. Cada heurística (numa dada versão do
+    código) é uma coluna num ficheiro próprio, lido com `np.memmap`: um sorteio novo
+    acrescenta uma linha a cada coluna e uma heurística nova ou alterada acrescenta
+    uma coluna, sem refazer as restantes. Treino, avaliação e relatórios fatiam o
+    tensor em vez de voltarem a simular as previsões sorteio a sorteio.
+
+    Heurísticas sem `versao` nos metadados (as dinâmicas) não são gravadas: as suas
+    colunas são recalculadas em cada `atualizar` e ficam só em memória.
+    """
+
+    def __init__(self, pasta: str, numero_maximo: int):
+        self.pasta = pasta
+        self.numero_maximo = numero_maximo
+        self.largura = -(-numero_maximo // 8)  # bytes por previsão
+        self.caminho_manifesto = os.path.join(pasta, ARQUIVO_MANIFESTO)
+        self.manifesto = self._ler()
+        self.linhas = 0
+        # Colunas da última atualização: {nome: id da coluna gravada ou array em memória}
+        self.colunas: Dict[str, Any] = {}
+
+    @classmethod
+    def para_dados(cls, dados) -> 'TensorPrevisoes':
+        """Tensor do jogo de `dados`, em `<caminho_dados>/.compilado/<jogo>/previsoes/`."""
+        pasta = os.path.join(dados.caminho_dados, PASTA_COMPILADA, dados.jogo.nome, PASTA_TENSOR)
+        return cls(pasta, dados.jogo.numero_maximo)
+
+    # --- Manifesto e ficheiros ---
+    def _vazio(self, n: int = None) -> Dict[str, Any]:
+        return {'versao': VERSAO_FORMATO, 'numero_maximo': self.numero_maximo, 'n': n,
+                'linhas': 0, 'assinatura': None, 'colunas': {}}
+
+    def _ler(self) -> Dict[str, Any]:
+        try:
+            with open(self.caminho_manifesto, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return self._vazio()
+        return manifesto if manifesto.get('versao') == VERSAO_FORMATO else self._vazio()
+
+    def _gravar(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{self.caminho_manifesto}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho_manifesto)
+
+    @staticmethod
+    def _id_coluna(nome: str, versao: str) -> str:
+        """Identificador (e nome do ficheiro) da coluna de uma heurística numa versão."""
+        nome_seguro = re.sub(r'[^\w-]', '_', nome)
+        return f"{nome_seguro}-{hashlib.sha1(versao.encode('utf-8')).hexdigest()[:12]}"
+
+    def _caminho(self, coluna: str) -> str:
+        return os.path.join(self.pasta, f"{coluna}.bits")
+
+    def _reiniciar(self, n: int):
+        """Apaga todas as colunas (o histórico mudou ou mudaram os parâmetros)."""
+        for coluna in self.manifesto.get('colunas', {}):
+            if os.path.exists(self._caminho(coluna)):
+                os.remove(self._caminho(coluna))
+        self.manifesto = self._vazio(n)
+
+    def _abrir(self, coluna: str, linhas: int) -> np.ndarray:
+        if linhas == 0:
+            return np.zeros((0, self.largura), dtype=np.uint8)
+        return np.memmap(self._caminho(coluna), dtype=np.uint8, mode='r', shape=(linhas, self.largura))
+
+    def _acrescentar(self, coluna: str, linhas: int, novas: np.ndarray):
+        """Acrescenta linhas empacotadas ao ficheiro da coluna, descartando restos de escritas interrompidas."""
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self._caminho(coluna)
+        with open(caminho, 'ab') as f:
+            f.truncate(linhas * self.largura)
+            f.write(np.ascontiguousarray(novas).tobytes())
+
+    # --- Atualização ---
+    def atualizar(self, dados, despachante, n: int = 5) -> 'TensorPrevisoes':
+        """
+        Completa o tensor com as previsões das heurísticas de `despachante` para todos
+        os sorteios de `dados`: só se calculam as linhas novas de cada coluna e as colunas
+        das heurísticas novas, alteradas ou sem versão, numa única passagem walk-forward
+        (`Dados.percorrer_prefixos`) que aproveita a cache de previsões do Despachante.
+        `dados` é o histórico completo: se não continuar o histórico gravado, o tensor é refeito.
+        """
+        total = len(dados.sorteios)
+        manifesto = self.manifesto
+        linhas_gravadas = manifesto['linhas']
+        if (manifesto.get('n') != n or manifesto.get('numero_maximo') != self.numero_maximo
+                or linhas_gravadas > total or manifesto.get('assinatura') != dados.ate(linhas_gravadas).assinatura()):
+            self._reiniciar(n)
+            manifesto = self.manifesto
+
+        metadados = despachante.obter_metadados()
+        self.colunas = {}
+        inicio_coluna = {}
+        for nome, meta in metadados.items():
+            if meta.get('versao'):
+                coluna = self._id_coluna(nome, meta['versao'])
+                gravada = manifesto['colunas'].get(coluna, {}).get('linhas', 0)
+                if gravada and not os.path.exists(self._caminho(coluna)):
+                    gravada = 0
+                self.colunas[nome] = coluna
+                inicio_coluna[nome] = gravada
+            else:
+                inicio_coluna[nome] = 0
+
+        em_falta = {nome: inicio for nome, inicio in inicio_coluna.items() if inicio < total}
+        bits = {nome: np.zeros((total - inicio, self.numero_maximo), dtype=bool) for nome, inicio in em_falta.items()}
+        if em_falta:
+            inicio = min(em_falta.values())
+            print(f"🧮 Tensor de previsões: {len(em_falta)} heurísticas, sorteios {inicio + 1} a {total}...")
+            dependencias = {dep for nome in em_falta for dep in metadados[nome]['dependencias']}
+            for i, estatisticas in dados.percorrer_prefixos(dependencias, inicio=inicio, fim=total):
+                nomes = [nome for nome, inicio_nome in em_falta.items() if inicio_nome <= i]
+                previsoes = despachante.get_previsoes_para(dados.ate(i + 1), n, estatisticas=estatisticas, nomes=nomes)
+                for nome in nomes:
+                    numeros = [num - 1 for num in previsoes.get(nome, []) if 1 <= num <= self.numero_maximo]
+                    bits[nome][i - em_falta[nome], numeros] = True
+
+        for nome, inicio in inicio_coluna.items():
+            novas = np.packbits(bits[nome], axis=1) if nome in bits else np.zeros((0, self.largura), np.uint8)
+            if nome not in self.colunas:
+                self.colunas[nome] = novas
+                continue
+            coluna = self.colunas[nome]
+            if len(novas):
+                self._acrescentar(coluna, inicio, novas)
+            manifesto['colunas'][coluna] = {'nome': nome, 'versao': metadados[nome]['versao'], 'linhas': total}
+
+        manifesto['linhas'] = total
+        manifesto['assinatura'] = dados.assinatura()
+        self._gravar()
+        self.linhas = total
+        return self
+
+    # --- Leitura ---
+    def _coluna(self, nome: str) -> np.ndarray:
+        coluna = self.colunas.get(nome)
+        if coluna is None:
+            return np.zeros((self.linhas, self.largura), dtype=np.uint8)
+        if isinstance(coluna, np.ndarray):
+            return coluna
+        return self._abrir(coluna, self.linhas)
+
+    def bits(self, nomes: Iterable[str] = None, inicio: int = 0, fim: int = None) -> np.ndarray:
+        """
+        Fatia `[inicio, fim)` das linhas, desempacotada: array (T x H x máximo) de 0/1.
+        Heurísticas sem coluna (ex.: que já não existem) ficam a zeros.
+        """
+        nomes = list(self.colunas) if nomes is None else list(nomes)
+        fatias = [self._coluna(nome)[inicio:fim] for nome in nomes]
+        if not fatias:
+            linhas = len(range(self.linhas)[inicio:fim])
+            return np.zeros((linhas, 0, self.numero_maximo), dtype=np.uint8)
+        return np.unpackbits(np.stack(fatias, axis=1), axis=-1, count=self.numero_maximo)
+
+    def caracteristicas(self, nomes: Iterable[str], inicio: int = 0, fim: int = None) -> np.ndarray:
+        """
+        Matriz de características do decisor, ((T · máximo) x H): uma linha por sorteio e
+        número (por esta ordem), com 1 nas heurísticas que sugeriram o número.
+        """
+        nomes = list(nomes)
+        return self.bits(nomes, inicio, fim).transpose(0, 2, 1).reshape(-1, len(nomes))
+
+    def previsoes(self, inicio: int = 0, fim: int = None, nomes: Iterable[str] = None) -> List[Dict[str, List[int]]]:
+        """Previsões `{heuristica: números}` de cada linha em `[inicio, fim)`."""
+        nomes = list(self.colunas) if nomes is None else list(nomes)
+        bits = self.bits(nomes, inicio, fim)
+        return [
+            {nome: (np.flatnonzero(linha[h]) + 1).tolist() for h, nome in enumerate(nomes)}
+            for linha in bits
+        ]
+
+    def acertos(self, incidencia: np.ndarray, nomes: Iterable[str] = None, inicio: int = 0) -> np.ndarray:
+        """
+        Números acertados por cada heurística (T x H), comparando as linhas a partir de
+        `inicio` com as linhas de `incidencia` (ex.: `dados.matriz.incidencia[inicio + 1:]`,
+        os sorteios que cada linha tentava prever).
+        """
+        bits = self.bits(nomes, inicio, inicio + len(incidencia))
+        return (bits & incidencia[:len(bits), np.newaxis, :self.numero_maximo]).sum(axis=2)
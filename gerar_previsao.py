@@ -20,6 +20,7 @@ from decisor.decisor_final import HeuristicDecisor
 DADOS_ATUAL_PATH = os.path.join(PROJECT_ROOT, 'dados', 'sorteio_atual.json')
 CAMINHO_BASE_DECISOR = os.path.join(PROJECT_ROOT, 'decisor')
 PASTA_PREVISOES = os.path.join(PROJECT_ROOT, 'previsoes')
+PERFIL_HEURISTICAS_PATH = os.path.join(PASTA_PREVISOES, 'perfil_heuristicas.json')
 os.makedirs(PASTA_PREVISOES, exist_ok=True)
 
 
@@ -41,13 +42,11 @@ def gerar_previsao():
                 sorteio_mais_recente = json.load(f)
 
         # 2. Carregar o histórico de sorteios e o despachante
-        dados_manager = Dados()
-        despachante = Despachante()
-        todas_dependencias = despachante.obter_todas_dependencias()
-        estatisticas_atuais, _ = dados_manager.obter_estatisticas(todas_dependencias)
+        dados_manager = Dados(usar_cache_persistente=True)
+        despachante = Despachante(usar_cache_previsoes=True)
 
-        # 3. Obter as previsões das heurísticas (sempre recalculado)
-        previsoes_heuristicas = despachante.get_previsoes(estatisticas_atuais)
+        # 3. Obter as previsões das heurísticas (reaproveitadas da cache de previsões, se existirem)
+        previsoes_heuristicas = despachante.get_previsoes_para(dados_manager)
 
         # 4. Formatar as previsões para o decisor
         detalhes_previsoes = [
@@ -89,6 +88,10 @@ def gerar_previsao():
         print(f"✅ Previsão completa salva em: {caminho_ficheiro_completo}")
         print(f"✅ Previsão resumida salva em: {caminho_previsao_atual}")
 
+        # Latência e erros das heurísticas executadas nesta previsão
+        despachante.perfil.exportar_json(PERFIL_HEURISTICAS_PATH)
+        despachante.perfil.imprimir_resumo()
+
     except Exception as e:
         print(f"\n❌ ERRO: Ocorreu um erro ao gerar a previsão.")
         print(f"Detalhes: {e}")
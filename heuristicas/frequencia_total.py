@@ -2,6 +2,10 @@
 from typing import Dict, Any, List
 from collections import Counter
 
+import numpy as np
+
+from lib.pontuacoes import pontuar_contagem, pontuar_contagens_lote
+
 class FrequenciaTotal:
     # --- Metadados da Heurística ---
     NOME = "frequencia_total"
@@ -27,3 +31,11 @@ class FrequenciaTotal:
         sugeridos = [num for num, _ in Counter(frequencia).most_common(n)]
 
         return sorted(sugeridos)
+
+    def pontuar(self, estatisticas: Dict[str, Any]) -> np.ndarray:
+        """Pontuação de cada número: a frequência total (os empates seguem `most_common`)."""
+        return pontuar_contagem(estatisticas.get('frequencia_total', {}))
+
+    def prever_lote(self, estatisticas_lote: Dict[str, Any]) -> np.ndarray:
+        """Pontuações (T x 49) para cada momento de `Dados.obter_estatisticas_lote`."""
+        return pontuar_contagens_lote(estatisticas_lote['frequencia_total'])
@@ -1,6 +1,10 @@
 # heuristicas/gap_medio.py
 from typing import Dict, Any, List
 
+import numpy as np
+
+from lib.pontuacoes import EXCLUIDO, pontuar_valores
+
 class GapMedio:
     NOME = "gap_medio"
     DESCRICAO = "Sugere números que historicamente têm os maiores intervalos médios entre saídas."
@@ -29,3 +33,12 @@ class GapMedio:
         sugeridos = [num for num, _ in sugeridos_brutos[:n]]
 
         return sorted(sugeridos)
+
+    def pontuar(self, estatisticas: Dict[str, Any]) -> np.ndarray:
+        """Pontuação de cada número: o gap médio (os que nunca saíram ficam excluídos)."""
+        return pontuar_valores(estatisticas.get('gaps_medios', {}))
+
+    def prever_lote(self, estatisticas_lote: Dict[str, Any]) -> np.ndarray:
+        """Pontuações (T x 49) para cada momento de `Dados.obter_estatisticas_lote`."""
+        gaps = estatisticas_lote['gaps_medios']
+        return np.where(np.isfinite(gaps), gaps, EXCLUIDO)
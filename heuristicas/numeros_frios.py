@@ -3,6 +3,10 @@
 from typing import Dict, Any, List
 from collections import Counter
 
+import numpy as np
+
+from lib.pontuacoes import pontuar_valores
+
 class NumerosFrios:
     NOME = "numeros_frios"
     DESCRICAO = "Sugere os números que estão ausentes há mais tempo."
@@ -18,3 +22,11 @@ class NumerosFrios:
         sugeridos = sorted(ausencia, key=ausencia.get, reverse=True)[:n]
         
         return sorted(sugeridos)
+
+    def pontuar(self, estatisticas: Dict[str, Any]) -> np.ndarray:
+        """Pontuação de cada número: o tempo de ausência atual."""
+        return pontuar_valores(estatisticas.get('ausencia_atual', {}))
+
+    def prever_lote(self, estatisticas_lote: Dict[str, Any]) -> np.ndarray:
+        """Pontuações (T x 49) para cada momento de `Dados.obter_estatisticas_lote`."""
+        return estatisticas_lote['ausencia_atual'].astype(float)
@@ -32,7 +32,10 @@ class PadroesDeGrupos:
             return []
             
         # Encontrar os grupos mais frequentes (por exemplo, os 10 mais comuns)
-        grupos_mais_frequentes = Counter(frequencia_grupos).most_common(10)
+        # As contagens de `Dados` já expõem `most_common`; só um dict simples é convertido
+        if not hasattr(frequencia_grupos, 'most_common'):
+            frequencia_grupos = Counter(frequencia_grupos)
+        grupos_mais_frequentes = frequencia_grupos.most_common(10)
         
         # Contar a frequência de números individuais dentro desses grupos
         contador_numeros = Counter()
@@ -16,7 +16,9 @@ class ParesFrequentes:
         if not pares_frequentes:
             return []
         
-        pares_mais_frequentes = Counter(pares_frequentes).most_common(10)
+        if not hasattr(pares_frequentes, 'most_common'):
+            pares_frequentes = Counter(pares_frequentes)
+        pares_mais_frequentes = pares_frequentes.most_common(10)
         
         contador_numeros = Counter()
         for par, _ in pares_mais_frequentes:
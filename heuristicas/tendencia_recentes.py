@@ -2,6 +2,10 @@
 from typing import Dict, Any, List
 from collections import Counter
 
+import numpy as np
+
+from lib.pontuacoes import pontuar_contagem, pontuar_contagens_lote
+
 class TendenciaRecentes:
     # --- Metadados da Heurística ---
     NOME = "tendencia_recentes"
@@ -20,3 +24,11 @@ class TendenciaRecentes:
         sugeridos = [num for num, _ in Counter(frequencia_recente).most_common(n)]
         
         return sorted(sugeridos)
+
+    def pontuar(self, estatisticas: Dict[str, Any]) -> np.ndarray:
+        """Pontuação de cada número: a frequência recente (os empates seguem `most_common`)."""
+        return pontuar_contagem(estatisticas.get('frequencia_recente', {}))
+
+    def prever_lote(self, estatisticas_lote: Dict[str, Any]) -> np.ndarray:
+        """Pontuações (T x 49) para cada momento de `Dados.obter_estatisticas_lote`."""
+        return pontuar_contagens_lote(estatisticas_lote['frequencia_recente'])
@@ -17,7 +17,9 @@ class TriosFrequentes:
         if not trios_frequentes:
             return []
         
-        trios_mais_frequentes = Counter(trios_frequentes).most_common(10)
+        if not hasattr(trios_frequentes, 'most_common'):
+            trios_frequentes = Counter(trios_frequentes)
+        trios_mais_frequentes = trios_frequentes.most_common(10)
         
         contador_numeros = Counter()
         for trio, _ in trios_mais_frequentes:
@@ -0,0 +1,353 @@
+# lib/armazem_resultados.py
+
+import os
+import re
+import datetime
+from typing import Dict, Any, List, Tuple, Iterable, Iterator
+
+import numpy as np
+
+from lib.armazem_sorteios import ArmazemSorteios
+from lib.jogos import Jogo, JOGO_PADRAO
+
+ARQUIVO_RESULTADOS = 'resultados.npy'
+ARQUIVO_PREMIOS = 'premios.npy'
+ARQUIVO_MANIFESTO_RESULTADOS = 'manifesto_resultados.json'
+VERSAO_FORMATO_RESULTADOS = 1
+
+_LINHA_PREMIO = re.compile(
+    r'^(\d+)\.º Prémio - (.*?) \| PT: ([\d.]+)(?: \| EU: ([\d.]+))? \| Valor: (.*)$'
+)
+_VALOR_EUROS = re.compile(r'€\s*([\d.]+(?:,\d+)?)')
+_RENDA = re.compile(r'/mês x (\d+) anos')
+
+# Campos do cabeçalho de cada resultado (rótulo no TXT -> chave)
+_CAMPOS_CABECALHO = {
+    'Concurso': 'concurso',
+    'Data': 'data',
+    'Chave': 'chave',
+    'Números': 'chave',
+    'Especial': 'especial',
+    'Ordem de saída': 'ordem_saida',
+    'Código vencedor': 'codigo',
+    'Vencedores': 'vencedores',
+}
+# Estatísticas do M1lhão (rótulo no TXT -> coluna)
+_CAMPOS_ESTATISTICAS = {
+    'Receita ilíquida apostas': 'receita',
+    'Montante para prémios': 'montante_premios',
+    'Nº de Registos': 'registos',
+    'Nº de Códigos atribuídos': 'codigos_atribuidos',
+}
+
+
+def _inteiro(texto: str) -> int:
+    """'1.234.567' -> 1234567 (separador de milhares português)."""
+    return int(texto.replace('.', ''))
+
+
+def _euros(texto: str) -> float:
+    """Primeiro montante em euros de um texto ('€ 1.244,59' -> 1244.59); NaN se não houver."""
+    encontrado = _VALOR_EUROS.search(texto)
+    if not encontrado:
+        return float('nan')
+    return float(encontrado.group(1).replace('.', '').replace(',', '.'))
+
+
+def _bolas(texto: str) -> Tuple[List[int], List[int]]:
+    """'13 24 28 33 35 + 5 9' -> ([13, 24, 28, 33, 35], [5, 9])."""
+    principais, _, especiais = texto.partition('+')
+    return [int(num) for num in principais.split()], [int(num) for num in especiais.split()]
+
+
+def ler_resultados(linhas: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Lê, linha a linha, os resultados escritos pelos scripts `atualizar_*_sc.py` e
+    devolve um dict por sorteio (um ficheiro pode ter mais do que um). Linhas que
+    não se reconhecem são ignoradas.
+    """
+    atual = None
+    seccao = None
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha or linha.startswith('---'):
+            continue
+        rotulo, separador, valor = linha.partition(': ')
+        if rotulo == 'Concurso':
+            if atual is not None:
+                yield atual
+            atual = {'premios': [], 'estatisticas': {}}
+            seccao = None
+        if atual is None:
+            continue
+        if linha in ('Prémios:', 'Estatísticas:'):
+            seccao = linha[:-1]
+            continue
+
+        premio = _LINHA_PREMIO.match(linha) if seccao == 'Prémios' else None
+        if premio:
+            escalao, descricao, pt, eu, valor_texto = premio.groups()
+            renda = _RENDA.search(valor_texto)
+            atual['premios'].append({
+                'escalao': int(escalao),
+                'descricao': descricao,
+                'vencedores_pt': _inteiro(pt),
+                'vencedores_eu': _inteiro(eu) if eu is not None else -1,
+                'valor': _euros(valor_texto),
+                'renda_meses': int(renda.group(1)) * 12 if renda else 0,
+                'valor_texto': valor_texto,
+            })
+        elif separador and seccao == 'Estatísticas' and rotulo in _CAMPOS_ESTATISTICAS:
+            atual['estatisticas'][_CAMPOS_ESTATISTICAS[rotulo]] = (
+                _euros(valor) if '€' in valor else float(_inteiro(valor))
+            )
+        elif separador and rotulo in _CAMPOS_CABECALHO:
+            atual[_CAMPOS_CABECALHO[rotulo]] = valor.strip()
+    if atual is not None:
+        yield atual
+
+
+class ArmazemResultados(ArmazemSorteios):
+    """
+    Resultados e tabelas de prémios dos ficheiros TXT de cada sorteio, compilados
+    em duas tabelas colunares (`.npy`, abertas por mmap) na partição do jogo:
+
+    - `resultados.npy`: uma linha por sorteio, ordenada por data, com `numeros`,
+      `especiais` (estrelas / nº de sonho / número da sorte), a ordem de saída,
+      o código e vencedores do M1lhão e as suas estatísticas de receitas.
+    - `premios.npy`: uma linha por (sorteio, escalão) com `vencedores_pt`,
+      `vencedores_eu`, `valor` em euros (NaN se não foi atribuído), `renda_meses`
+      (prémios pagos como renda mensal) e o texto original do valor.
+
+    A ingestão é incremental: o manifesto guarda mtime, tamanho e SHA-1 de cada
+    TXT e só os ficheiros novos ou alterados são lidos de novo; as linhas dos
+    restantes são reaproveitadas das tabelas já compiladas.
+    """
+
+    def __init__(self, caminho_dados: str, jogo: Jogo = JOGO_PADRAO):
+        super().__init__(caminho_dados, jogo)
+        self.caminho_resultados = os.path.join(self.pasta, ARQUIVO_RESULTADOS)
+        self.caminho_premios = os.path.join(self.pasta, ARQUIVO_PREMIOS)
+        self.caminho_manifesto = os.path.join(self.pasta, ARQUIVO_MANIFESTO_RESULTADOS)
+
+    def _fontes(self) -> List[str]:
+        """Ficheiros TXT de resultados do jogo."""
+        return [nome for nome in sorted(os.listdir(self.caminho_dados)) if self.jogo.resultado_pertence(nome)]
+
+    # --- Leitura dos TXT ---
+    def _ler_ficheiro(self, nome: str) -> List[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.caminho_dados, nome), 'r', encoding='utf-8') as f:
+                resultados = [r for r in ler_resultados(f) if 'concurso' in r and 'data' in r]
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"⚠️  Erro ao ler o resultado {nome}: {e}")
+            return []
+        for resultado in resultados:
+            resultado['ficheiro'] = nome
+        return resultados
+
+    def _tabelas(self, resultados: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Converte resultados lidos dos TXT nas duas tabelas colunares."""
+        bolas = [_bolas(r.get('chave', '')) for r in resultados]
+        ordens = [_bolas(r.get('ordem_saida', '')) for r in resultados]
+        for (_, especiais), resultado in zip(bolas, resultados):
+            if not especiais and 'especial' in resultado:
+                especiais.append(int(resultado['especial']))
+
+        def largura(valores: Iterable, minimo: int = 1) -> int:
+            return max([minimo, *(len(v) for v in valores)])
+
+        resultados_tab = np.zeros(len(resultados), dtype=[
+            ('ficheiro', f"U{largura((r['ficheiro'] for r in resultados))}"),
+            ('concurso', f"U{largura((r['concurso'] for r in resultados))}"),
+            ('data', 'U10'),
+            ('ordinal', '<i4'),
+            ('numeros', 'u1', (largura((b[0] for b in bolas), 0),)),
+            ('quantidade', 'u1'),
+            ('especiais', '<i2', (largura((b[1] for b in bolas), 0),)),
+            ('quantidade_especiais', 'u1'),
+            ('ordem_numeros', 'u1', (largura((o[0] for o in ordens), 0),)),
+            ('ordem_especiais', '<i2', (largura((o[1] for o in ordens), 0),)),
+            ('codigo', f"U{largura((r.get('codigo', '') for r in resultados))}"),
+            ('vencedores', '<i8'),
+            ('receita', '<f8'),
+            ('montante_premios', '<f8'),
+            ('registos', '<f8'),
+            ('codigos_atribuidos', '<f8'),
+        ])
+        premios = [(r['concurso'], p) for r in resultados for p in r['premios']]
+        premios_tab = np.zeros(len(premios), dtype=[
+            ('concurso', f"U{largura((concurso for concurso, _ in premios))}"),
+            ('escalao', 'u1'),
+            ('descricao', f"U{largura((p['descricao'] for _, p in premios))}"),
+            ('vencedores_pt', '<i8'),
+            ('vencedores_eu', '<i8'),
+            ('valor', '<f8'),
+            ('renda_meses', '<i2'),
+            ('valor_texto', f"U{largura((p['valor_texto'] for _, p in premios))}"),
+        ])
+
+        for i, (resultado, (numeros, especiais), (ordem_numeros, ordem_especiais)) in enumerate(
+                zip(resultados, bolas, ordens)):
+            linha = resultados_tab[i]
+            linha['ficheiro'] = resultado['ficheiro']
+            linha['concurso'] = resultado['concurso']
+            linha['data'] = resultado['data']
+            linha['ordinal'] = datetime.datetime.strptime(resultado['data'], '%d/%m/%Y').toordinal()
+            linha['numeros'][:len(numeros)] = numeros
+            linha['quantidade'] = len(numeros)
+            linha['especiais'][:len(especiais)] = especiais
+            linha['quantidade_especiais'] = len(especiais)
+            linha['ordem_numeros'][:len(ordem_numeros)] = ordem_numeros
+            linha['ordem_especiais'][:len(ordem_especiais)] = ordem_especiais
+            linha['codigo'] = resultado.get('codigo', '')
+            linha['vencedores'] = _inteiro(resultado['vencedores']) if 'vencedores' in resultado else -1
+            for campo in _CAMPOS_ESTATISTICAS.values():
+                linha[campo] = resultado['estatisticas'].get(campo, float('nan'))
+
+        for i, (concurso, premio) in enumerate(premios):
+            premios_tab[i] = (concurso, premio['escalao'], premio['descricao'], premio['vencedores_pt'],
+                              premio['vencedores_eu'], premio['valor'], premio['renda_meses'], premio['valor_texto'])
+        return resultados_tab, premios_tab
+
+    @staticmethod
+    def _juntar(tabelas: List[np.ndarray]) -> np.ndarray:
+        """Concatena tabelas estruturadas cujas colunas de texto/arrays podem ter larguras diferentes."""
+        tabelas = [t for t in tabelas if t.size] or tabelas[:1]
+        if len(tabelas) == 1:
+            return np.array(tabelas[0])
+        campos = []
+        for nome in tabelas[0].dtype.names:
+            tipos = [t.dtype.fields[nome][0] for t in tabelas]
+            base = tipos[0].base
+            if base.kind == 'U':
+                base = np.dtype(f"U{max(tipo.base.itemsize // 4 for tipo in tipos)}")
+            forma = max((tipo.shape for tipo in tipos), key=lambda forma: forma[0] if forma else 0)
+            campos.append((nome, base, forma) if forma else (nome, base))
+        juntas = np.zeros(sum(t.size for t in tabelas), dtype=campos)
+        inicio = 0
+        for tabela in tabelas:
+            fim = inicio + tabela.size
+            for nome in tabela.dtype.names:
+                coluna = tabela[nome]
+                if coluna.ndim > 1:
+                    juntas[nome][inicio:fim, :coluna.shape[1]] = coluna
+                else:
+                    juntas[nome][inicio:fim] = coluna
+            inicio = fim
+        return juntas
+
+    # --- Compilação incremental ---
+    def atualizar(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lê só os TXT novos ou alterados, junta-os às linhas já compiladas dos restantes
+        e grava as tabelas. Devolve (resultados, premios).
+        """
+        manifesto = self._ler_manifesto()
+        anteriores = manifesto.get('fontes', {}) if manifesto.get('versao') == VERSAO_FORMATO_RESULTADOS else {}
+        fontes = self._descrever_fontes(anteriores)
+
+        resultados_antigos, premios_antigos = self._carregar_tabelas() if anteriores else (None, None)
+        if resultados_antigos is None:
+            anteriores = {}
+        alterados = [nome for nome, f in fontes.items() if anteriores.get(nome, {}).get('sha1') != f['sha1']]
+        if not alterados and set(fontes) == set(anteriores):
+            if fontes != anteriores:
+                self._gravar_manifesto(fontes)
+            return resultados_antigos, premios_antigos
+
+        novos = [resultado for nome in alterados for resultado in self._ler_ficheiro(nome)]
+        resultados_novos, premios_novos = self._tabelas(novos)
+        tabelas_resultados, tabelas_premios = [resultados_novos], [premios_novos]
+        if resultados_antigos is not None:
+            # Mantém as linhas dos ficheiros que não mudaram (e ainda existem)
+            mantidos = np.isin(resultados_antigos['ficheiro'], [n for n in fontes if n not in alterados])
+            tabelas_resultados.insert(0, resultados_antigos[mantidos])
+            tabelas_premios.insert(0, premios_antigos[np.isin(premios_antigos['concurso'],
+                                                              resultados_antigos['concurso'][mantidos])])
+        resultados = self._juntar(tabelas_resultados)
+        premios = self._juntar(tabelas_premios)
+
+        resultados = resultados[np.lexsort((resultados['concurso'], resultados['ordinal']))]
+        posicao = {concurso: i for i, concurso in enumerate(resultados['concurso'].tolist())}
+        premios = premios[np.lexsort((
+            premios['escalao'], [posicao.get(concurso, -1) for concurso in premios['concurso'].tolist()]
+        ))]
+
+        try:
+            os.makedirs(self.pasta, exist_ok=True)
+            self._escrever_atomico(self.caminho_resultados, lambda caminho: self._gravar_npy(caminho, resultados))
+            self._escrever_atomico(self.caminho_premios, lambda caminho: self._gravar_npy(caminho, premios))
+            self._gravar_manifesto(fontes)
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar os resultados compilados em '{self.pasta}': {e}")
+        return resultados, premios
+
+    def _gravar_manifesto(self, fontes: Dict[str, Dict[str, Any]]):
+        try:
+            self._escrever_atomico(self.caminho_manifesto, lambda caminho: self._gravar_json(
+                caminho, {'versao': VERSAO_FORMATO_RESULTADOS, 'fontes': fontes}
+            ))
+        except OSError:
+            pass
+
+    def _carregar_tabelas(self) -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            return (np.load(self.caminho_resultados, mmap_mode='r'),
+                    np.load(self.caminho_premios, mmap_mode='r'))
+        except (OSError, ValueError):
+            return None, None
+
+    # --- Consulta ---
+    def abrir(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(resultados, premios), atualizados a partir dos TXT se algum tiver mudado."""
+        return self.atualizar()
+
+    def matriz_premios(self, campo: str = 'valor') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devolve (concursos, matriz) com `matriz[i, escalao - 1]` igual a `campo`
+        (ex.: 'valor', 'vencedores_pt') do sorteio `concursos[i]`, pela ordem dos
+        resultados. Escalões sem prémio ficam a NaN (ou -1 nos campos inteiros).
+        """
+        resultados, premios = self.abrir()
+        concursos = resultados['concurso']
+        escaloes = int(premios['escalao'].max()) if premios.size else 0
+        vazio = np.nan if premios.dtype.fields[campo][0].kind == 'f' else -1
+        matriz = np.full((concursos.size, escaloes), vazio, dtype=premios.dtype.fields[campo][0])
+        posicao = {concurso: i for i, concurso in enumerate(concursos.tolist())}
+        linhas = np.array([posicao.get(c, -1) for c in premios['concurso'].tolist()], dtype=np.int64)
+        validas = linhas >= 0
+        matriz[linhas[validas], premios['escalao'][validas].astype(np.int64) - 1] = premios[campo][validas]
+        return concursos, matriz
+
+    def carregar(self) -> List[Dict[str, Any]]:
+        """Resultados como dicts (com `premios`), no formato dos sorteios de `ArmazemSorteios`."""
+        resultados, premios = self.abrir()
+        por_concurso = {}
+        for premio in premios.tolist():
+            concurso, escalao, descricao, pt, eu, valor, renda, texto = premio
+            por_concurso.setdefault(concurso, []).append({
+                'escalao': escalao, 'descricao': descricao, 'vencedores_pt': pt, 'vencedores_eu': eu,
+                'valor': valor, 'renda_meses': renda, 'valor_texto': texto,
+            })
+
+        sorteios = []
+        for linha in resultados:
+            sorteio = {'concurso': str(linha['concurso']), 'data': str(linha['data'])}
+            if linha['quantidade']:
+                sorteio['numeros'] = linha['numeros'][:linha['quantidade']].tolist()
+                ordem = linha['ordem_numeros'][:linha['quantidade']]
+                if ordem.size and ordem.any():
+                    sorteio['ordem_saida'] = ordem.tolist()
+            if linha['quantidade_especiais']:
+                sorteio['especiais'] = linha['especiais'][:linha['quantidade_especiais']].tolist()
+            if linha['codigo']:
+                sorteio['codigo'] = str(linha['codigo'])
+                sorteio['vencedores'] = int(linha['vencedores'])
+            estatisticas = {campo: float(linha[campo]) for campo in _CAMPOS_ESTATISTICAS.values()
+                            if not np.isnan(linha[campo])}
+            if estatisticas:
+                sorteio['estatisticas'] = estatisticas
+            sorteio['premios'] = por_concurso.get(sorteio['concurso'], [])
+            sorteios.append(sorteio)
+        return sorteios
@@ -0,0 +1,246 @@
+# lib/armazem_sorteios.py
+
+import os
+import json
+import hashlib
+import datetime
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from lib.jogos import Jogo, JOGO_PADRAO, obter_jogo
+
+# Pasta (dentro da pasta de dados) onde fica o histórico compilado
+PASTA_COMPILADA = '.compilado'
+ARQUIVO_COLUNAS = 'sorteios.npy'
+ARQUIVO_EXTRAS = 'extras.json'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+VERSAO_FORMATO = 2
+
+# Campos guardados em colunas; os restantes vão para `extras.json`
+CAMPOS_COLUNARES = ('concurso', 'data', 'numeros', 'especial', 'especiais')
+
+
+class ArmazemSorteios:
+    """
+    Histórico de sorteios de um jogo compilado num ficheiro `.npy` colunar (array
+    estruturado), aberto por mmap. Cada jogo tem a sua partição
+    (`dados/.compilado/<jogo>/`) e só lê os ficheiros que lhe pertencem.
+
+    Colunas: `concurso`, `data`, `ordinal` (data como ordinal, para ordenar),
+    `numeros` (preenchidos com 0 até ao maior sorteio), `quantidade` de números,
+    `especial` e `tem_especial`, `especiais` e `quantidade_especiais` (jogos com
+    várias bolas especiais). Campos adicionais (ex.: `premios`) e sorteios que
+    não cabem nas colunas ficam em `extras.json`.
+
+    O ficheiro só é recompilado quando um JSON de origem muda: o manifesto guarda
+    mtime, tamanho e SHA-1 de cada fonte; se o mtime mudar mas o conteúdo não, só o
+    manifesto é atualizado.
+    """
+
+    def __init__(self, caminho_dados: str, jogo: Jogo = JOGO_PADRAO):
+        self.caminho_dados = caminho_dados
+        self.jogo = obter_jogo(jogo)
+        self.pasta = os.path.join(caminho_dados, PASTA_COMPILADA, self.jogo.nome)
+        self.caminho_colunas = os.path.join(self.pasta, ARQUIVO_COLUNAS)
+        self.caminho_extras = os.path.join(self.pasta, ARQUIVO_EXTRAS)
+        self.caminho_manifesto = os.path.join(self.pasta, ARQUIVO_MANIFESTO)
+
+    # --- Fontes ---
+    def _fontes(self) -> List[str]:
+        """Ficheiros JSON de origem do jogo, pela ordem em que são lidos."""
+        return [nome for nome in sorted(os.listdir(self.caminho_dados)) if self.jogo.pertence(nome)]
+
+    @staticmethod
+    def _sha1(caminho: str) -> str:
+        with open(caminho, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def _descrever_fontes(self, anteriores: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """mtime, tamanho e hash de cada fonte; o hash só é recalculado se o mtime ou o tamanho mudarem."""
+        fontes = {}
+        for nome in self._fontes():
+            estado = os.stat(os.path.join(self.caminho_dados, nome))
+            anterior = anteriores.get(nome, {})
+            if anterior.get('mtime_ns') == estado.st_mtime_ns and anterior.get('tamanho') == estado.st_size:
+                sha1 = anterior['sha1']
+            else:
+                sha1 = self._sha1(os.path.join(self.caminho_dados, nome))
+            fontes[nome] = {'mtime_ns': estado.st_mtime_ns, 'tamanho': estado.st_size, 'sha1': sha1}
+        return fontes
+
+    def _ler_manifesto(self) -> Dict[str, Any]:
+        try:
+            with open(self.caminho_manifesto, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _ler_fontes(self) -> List[Dict[str, Any]]:
+        """Lê todos os sorteios dos ficheiros JSON, ordenando-os por data."""
+        todos = []
+        for nome_arquivo in self._fontes():
+            caminho_completo = os.path.join(self.caminho_dados, nome_arquivo)
+            try:
+                with open(caminho_completo, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+                if isinstance(dados, dict):
+                    for sorteios_do_ano in dados.values():
+                        if isinstance(sorteios_do_ano, list):
+                            todos.extend(sorteios_do_ano)
+                elif isinstance(dados, list):
+                    todos.extend(dados)
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                print(f"Erro ao ler o arquivo {nome_arquivo}: {e}")
+
+        todos = [self.jogo.normalizar(s) for s in todos if isinstance(s, dict)]
+        sorteios_validos = [s for s in todos if 'data' in s and 'numeros' in s]
+        sorteios_validos.sort(key=lambda s: datetime.datetime.strptime(s.get('data'), '%d/%m/%Y'))
+        return sorteios_validos
+
+    # --- Compilação ---
+    @staticmethod
+    def _cabe_nas_colunas(sorteio: Dict[str, Any]) -> bool:
+        numeros = sorteio['numeros']
+        especial = sorteio.get('especial')
+        especiais = sorteio.get('especiais', [])
+        return (
+            isinstance(sorteio.get('concurso'), str)
+            and isinstance(sorteio['data'], str)
+            and isinstance(numeros, list)
+            and all(type(num) is int and 0 <= num <= 255 for num in numeros)
+            and (especial is None and 'especial' not in sorteio or type(especial) is int and -32768 <= especial <= 32767)
+            and isinstance(especiais, list)
+            and all(type(num) is int and -32768 <= num <= 32767 for num in especiais)
+        )
+
+    @staticmethod
+    def _escrever_atomico(caminho: str, escrever):
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        escrever(temporario)
+        os.replace(temporario, caminho)
+
+    def compilar(self, sorteios: List[Dict[str, Any]] = None,
+                 fontes: Dict[str, Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Converte os sorteios (lidos das fontes, se não forem dados) no array colunar e grava-o."""
+        if sorteios is None:
+            sorteios = self._ler_fontes()
+        if fontes is None:
+            fontes = self._descrever_fontes({})
+
+        max_numeros = max((len(s['numeros']) for s in sorteios if isinstance(s['numeros'], list)), default=0)
+        max_concurso = max((len(s['concurso']) for s in sorteios if isinstance(s.get('concurso'), str)), default=1)
+        max_data = max((len(s['data']) for s in sorteios if isinstance(s['data'], str)), default=1)
+        max_especiais = max((len(s['especiais']) for s in sorteios if isinstance(s.get('especiais'), list)), default=0)
+        colunas = np.zeros(len(sorteios), dtype=[
+            ('concurso', f'U{max(max_concurso, 1)}'),
+            ('data', f'U{max(max_data, 1)}'),
+            ('ordinal', '<i4'),
+            ('numeros', 'u1', (max_numeros,)),
+            ('quantidade', 'u1'),
+            ('especial', '<i2'),
+            ('tem_especial', '?'),
+            ('especiais', '<i2', (max_especiais,)),
+            ('quantidade_especiais', 'u1'),
+        ])
+
+        extras = {'campos': {}, 'completos': {}}
+        for i, sorteio in enumerate(sorteios):
+            colunas['ordinal'][i] = datetime.datetime.strptime(sorteio['data'], '%d/%m/%Y').toordinal()
+            if not self._cabe_nas_colunas(sorteio):
+                extras['completos'][str(i)] = sorteio
+                continue
+            numeros = sorteio['numeros']
+            colunas['concurso'][i] = sorteio['concurso']
+            colunas['data'][i] = sorteio['data']
+            colunas['numeros'][i, :len(numeros)] = numeros
+            colunas['quantidade'][i] = len(numeros)
+            if 'especial' in sorteio:
+                colunas['especial'][i] = sorteio['especial']
+                colunas['tem_especial'][i] = True
+            if 'especiais' in sorteio:
+                colunas['especiais'][i, :len(sorteio['especiais'])] = sorteio['especiais']
+                colunas['quantidade_especiais'][i] = len(sorteio['especiais'])
+            restantes = {chave: valor for chave, valor in sorteio.items() if chave not in CAMPOS_COLUNARES}
+            if restantes:
+                extras['campos'][str(i)] = restantes
+
+        try:
+            os.makedirs(self.pasta, exist_ok=True)
+            self._escrever_atomico(self.caminho_extras, lambda caminho: self._gravar_json(caminho, extras))
+            self._escrever_atomico(self.caminho_colunas, lambda caminho: self._gravar_npy(caminho, colunas))
+            self._escrever_atomico(self.caminho_manifesto, lambda caminho: self._gravar_json(
+                caminho, {'versao': VERSAO_FORMATO, 'total_sorteios': len(sorteios), 'fontes': fontes}
+            ))
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o histórico compilado em '{self.pasta}': {e}")
+        return colunas, extras
+
+    @staticmethod
+    def _gravar_json(caminho: str, conteudo: Any):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, ensure_ascii=False)
+
+    @staticmethod
+    def _gravar_npy(caminho: str, colunas: np.ndarray):
+        with open(caminho, 'wb') as f:
+            np.save(f, colunas)
+
+    # --- Leitura ---
+    def abrir(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Devolve (colunas, extras), recompilando primeiro se alguma fonte tiver mudado.
+        As colunas são abertas por mmap (só leitura).
+        """
+        manifesto = self._ler_manifesto()
+        anteriores = manifesto.get('fontes', {}) if manifesto.get('versao') == VERSAO_FORMATO else {}
+        fontes = self._descrever_fontes(anteriores)
+
+        atualizado = (
+            anteriores
+            and {nome: f['sha1'] for nome, f in fontes.items()} == {nome: f['sha1'] for nome, f in anteriores.items()}
+            and os.path.exists(self.caminho_colunas)
+        )
+        if not atualizado:
+            return self.compilar(fontes=fontes)
+
+        if fontes != anteriores:
+            # Só os mtimes mudaram (ex.: checkout); o conteúdo é o mesmo
+            manifesto['fontes'] = fontes
+            try:
+                self._escrever_atomico(self.caminho_manifesto, lambda caminho: self._gravar_json(caminho, manifesto))
+            except OSError:
+                pass
+
+        try:
+            colunas = np.load(self.caminho_colunas, mmap_mode='r')
+            with open(self.caminho_extras, 'r', encoding='utf-8') as f:
+                extras = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Histórico compilado ilegível, a recompilar: {e}")
+            return self.compilar(fontes=fontes)
+        return colunas, extras
+
+    def carregar(self) -> List[Dict[str, Any]]:
+        """Reconstrói a lista de sorteios (dicts) a partir do histórico compilado."""
+        colunas, extras = self.abrir()
+        campos, completos = extras.get('campos', {}), extras.get('completos', {})
+
+        sorteios = []
+        nomes = ('concurso', 'data', 'numeros', 'quantidade', 'especial', 'tem_especial',
+                 'especiais', 'quantidade_especiais')
+        for i, (concurso, data, numeros, quantidade, especial, tem_especial, especiais,
+                quantidade_especiais) in enumerate(zip(*(colunas[nome].tolist() for nome in nomes))):
+            chave = str(i)
+            if chave in completos:
+                sorteios.append(completos[chave])
+                continue
+            sorteio = {'concurso': concurso, 'data': data, 'numeros': numeros[:quantidade]}
+            if tem_especial:
+                sorteio['especial'] = especial
+            if quantidade_especiais:
+                sorteio['especiais'] = especiais[:quantidade_especiais]
+            if chave in campos:
+                sorteio.update(campos[chave])
+            sorteios.append(sorteio)
+        return sorteios
@@ -0,0 +1,208 @@
+# lib/assinaturas_funcoes.py
+
+import os
+import json
+import datetime
+from typing import Dict, Any, List, Iterable, Optional
+
+import numpy as np
+
+from lib.armazem_sorteios import PASTA_COMPILADA
+from lib.compilador_logicas import versao_funcao
+from lib.custo_funcoes import ModeloCusto, ORCAMENTO_LOGICA
+from lib.executor_heuristicas import com_limite, TempoEsgotado
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_ASSINATURAS = os.path.join(PROJECT_ROOT, 'dados', PASTA_COMPILADA, 'assinaturas_funcoes.json')
+VERSAO_FORMATO = 1
+TIMEOUT_SONDAGEM = 2.0  # segundos por chamada
+
+
+def _serie_temporal(tamanho: int) -> List[float]:
+    tempo = np.linspace(0, 4 * np.pi, tamanho)
+    return (0.1 * tempo + 2 * np.sin(tempo) + np.random.default_rng(3).normal(0, 0.5, tamanho)).tolist()
+
+
+# Entradas canónicas (os tipos de `_gerar_dados_teste_avancado`), deterministas e pela
+# ordem de preferência do tipo de entrada de cada função
+ENTRADAS_CANONICAS = {
+    'vetor': lambda: (np.random.default_rng(0).random(49) * 20 - 10).tolist(),
+    'inteiro': lambda: np.random.default_rng(1).integers(1, 50, 49).tolist(),
+    'sequencia_temporal': lambda: _serie_temporal(49),
+    'matriz': lambda: (np.random.default_rng(2).random((7, 7)) * 10 - 5).tolist(),
+    'complexo': lambda: [complex(a, b) for a, b in np.random.default_rng(4).uniform(-1, 1, (49, 2))],
+}
+
+# Como cada tipo de saída chega à função seguinte de uma lógica: os escalares são
+# passados como lista de um valor (`executar_logica_com_monitoramento`)
+ENTRADA_DO_TIPO = {'escalar': 'vetor', 'inteiro': 'inteiro', 'vetor': 'vetor', 'matriz': 'matriz',
+                   'complexo': 'complexo', 'sequencia_temporal': 'sequencia_temporal'}
+
+
+def tipo_valor(valor: Any) -> str:
+    """Tipo (no vocabulário do analisador de tipos) de um resultado."""
+    if isinstance(valor, (bool, np.bool_)):
+        return 'booleano'
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return 'escalar'
+    if isinstance(valor, (complex, np.complexfloating)):
+        return 'complexo'
+    if isinstance(valor, dict):
+        return 'dicionario'
+    if valor is None:
+        return 'nulo'
+    try:
+        array = np.asarray(valor)
+    except Exception:
+        return 'objeto'
+    if array.dtype == object:
+        return 'objeto'
+    if array.ndim >= 2:
+        return 'matriz'
+    if np.iscomplexobj(array):
+        return 'complexo'
+    if array.ndim == 1 and array.size and np.issubdtype(array.dtype, np.integer):
+        return 'inteiro'
+    return 'vetor' if array.ndim == 1 else 'escalar'
+
+
+def _forma(valor: Any) -> Optional[List[int]]:
+    try:
+        return list(np.shape(valor))
+    except Exception:
+        return None
+
+
+class IndiceAssinaturas:
+    """
+    Assinaturas sondadas das funções do `UniversalWrapper`, gravadas em
+    `dados/.compilado/assinaturas_funcoes.json`.
+
+    Cada função é chamada com cada entrada de `ENTRADAS_CANONICAS` e fica registado
+    que entradas aceita (sem exceção nem tempo esgotado) e o tipo e a forma da saída.
+    O gerador de lógicas usa o índice para só encadear funções cujo tipo de entrada
+    aceita a saída da anterior; as funções ainda não sondadas continuam a usar o
+    mapeamento manual de tipos. A latência não é registada aqui: `viavel` usa o custo
+    de `ModeloCusto` (`scripts/medir_custo_funcoes.py`), que nenhuma função pode ter
+    acima de `custo_maximo` (por omissão `ORCAMENTO_LOGICA`, o orçamento de uma lógica).
+    Uma função volta a ser sondada se o seu código mudar (`versao_funcao`).
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_ASSINATURAS, modelo_custo: ModeloCusto = None,
+                 custo_maximo: float = ORCAMENTO_LOGICA):
+        self.caminho = caminho
+        self.modelo_custo = modelo_custo if modelo_custo is not None else ModeloCusto()
+        self.custo_maximo = custo_maximo
+        self.funcoes: Dict[str, Dict[str, Any]] = self._ler()
+
+    def _ler(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return conteudo.get('funcoes', {}) if conteudo.get('versao') == VERSAO_FORMATO else {}
+
+    def gravar(self):
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        conteudo = {
+            'versao': VERSAO_FORMATO,
+            'data_geracao': datetime.datetime.now().isoformat(),
+            'entradas': list(ENTRADAS_CANONICAS),
+            'funcoes': self.funcoes,
+        }
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    def __len__(self) -> int:
+        return len(self.funcoes)
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self.funcoes
+
+    # --- Sondagem ---
+    @staticmethod
+    def sondar_funcao(funcao, timeout: float = TIMEOUT_SONDAGEM) -> Dict[str, Any]:
+        """Chama `funcao` com cada entrada canónica e regista o que aceita e o que devolve."""
+        entradas, saida, forma = {}, None, None
+        for tipo, gerar in ENTRADAS_CANONICAS.items():
+            try:
+                resultado = com_limite(lambda: funcao(gerar()), timeout)
+            except TempoEsgotado as e:
+                entradas[tipo] = {'aceita': False, 'erro': str(e)}
+                continue
+            except Exception as e:
+                entradas[tipo] = {'aceita': False, 'erro': f"{type(e).__name__}: {e}"}
+                continue
+            entradas[tipo] = {'aceita': True, 'saida': tipo_valor(resultado), 'forma': _forma(resultado)}
+            if saida is None:
+                saida, forma = entradas[tipo]['saida'], entradas[tipo]['forma']
+        return {
+            'entradas': entradas,
+            'aceita': [tipo for tipo, registo in entradas.items() if registo['aceita']],
+            'saida': saida,
+            'forma': forma,
+        }
+
+    def sondar(self, wrapper, nomes: Iterable[str] = None, timeout: float = TIMEOUT_SONDAGEM,
+               forcar: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Sonda as funções `nomes` do wrapper (por omissão todas as públicas) que ainda
+        não estão no índice ou cujo código mudou, e grava o índice. Devolve as sondadas.
+        """
+        if nomes is None:
+            nomes = [nome for nome in dir(wrapper) if not nome.startswith('_') and callable(getattr(wrapper, nome))]
+        sondadas = {}
+        for nome in nomes:
+            versao = versao_funcao(type(wrapper), nome)
+            registo = self.funcoes.get(nome)
+            if registo is not None and not forcar and registo.get('versao') == versao:
+                continue
+            registo = self.sondar_funcao(getattr(wrapper, nome), timeout)
+            registo['versao'] = versao
+            sondadas[nome] = self.funcoes[nome] = registo
+        if sondadas:
+            self.gravar()
+        return sondadas
+
+    # --- Consulta ---
+    def viavel(self, nome: str) -> bool:
+        """
+        Falso se a função foi sondada e não aceita nenhuma entrada ou se o seu custo
+        em `ModeloCusto` excede o custo máximo.
+        """
+        registo = self.funcoes.get(nome)
+        if registo is not None and not registo['aceita']:
+            return False
+        return self.modelo_custo.custo(nome) <= self.custo_maximo
+
+    def tipo_entrada(self, nome: str) -> Optional[str]:
+        registo = self.funcoes.get(nome)
+        return registo['aceita'][0] if registo and registo['aceita'] else None
+
+    def tipo_saida(self, nome: str) -> Optional[str]:
+        registo = self.funcoes.get(nome)
+        return registo['saida'] if registo else None
+
+    def aceita(self, nome: str, tipo: str) -> Optional[bool]:
+        """
+        Se a função aceita uma entrada do `tipo` de saída dado; None se a função não foi
+        sondada ou o tipo não tem entrada canónica correspondente.
+        """
+        registo = self.funcoes.get(nome)
+        if registo is None or tipo not in ENTRADA_DO_TIPO:
+            return None
+        return ENTRADA_DO_TIPO[tipo] in registo['aceita']
+
+    def resumo(self) -> Dict[str, Any]:
+        """Funções sondadas, viáveis, sem nenhuma entrada aceite e lentas demais."""
+        sem_entrada = sum(1 for registo in self.funcoes.values() if not registo['aceita'])
+        viaveis = sum(1 for nome in self.funcoes if self.viavel(nome))
+        return {
+            'sondadas': len(self.funcoes),
+            'viaveis': viaveis,
+            'sem_entrada': sem_entrada,
+            'lentas': len(self.funcoes) - sem_entrada - viaveis,
+        }
@@ -0,0 +1,44 @@
+# lib/cache_aptidao.py
+
+import os
+import json
+import hashlib
+from typing import Any, List
+
+from lib.cache_estatisticas import CacheEstatisticas
+from lib.compilador_logicas import versao_funcao
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_CACHE_APTIDAO = os.path.join(PROJECT_ROOT, 'decisor', 'aptidao_logicas.sqlite')
+TAMANHO_MAXIMO_PADRAO = 32 * 1024 * 1024  # bytes
+
+
+class CacheAptidao(CacheEstatisticas):
+    """
+    Cache persistente da aptidão (avaliação) das lógicas geradas, em SQLite.
+
+    A chave de cada avaliação combina a lógica, a semente dos dados de teste, o número
+    de testes, o limite de tempo, a versão do código de cada função da lógica (o
+    método do wrapper e o módulo de `lib.funcoes_analiticas` que ele chama) e a versão
+    do próprio código de avaliação: uma evolução ou benchmark repetido não volta a
+    avaliar as mesmas cadeias, e uma função alterada invalida só as lógicas que a
+    usam. As avaliações interrompidas por tempo esgotado não são guardadas. As
+    entradas menos usadas são removidas como em `CacheEstatisticas`.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_CACHE_APTIDAO, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO):
+        super().__init__(caminho, tamanho_maximo)
+
+    @staticmethod
+    def versao_funcao(wrapper: Any, nome: str) -> str:
+        """Hash do código de uma função do wrapper e do módulo analítico que ela chama."""
+        return versao_funcao(type(wrapper), nome)
+
+    def gerar_chave_logica(self, wrapper: Any, logica: List[str], semente: int, num_testes: int,
+                           versao_avaliacao: str, timeout: float = None) -> str:
+        """Chave de conteúdo da avaliação de uma lógica."""
+        partes = json.dumps([
+            list(logica), semente, num_testes, timeout, versao_avaliacao,
+            [self.versao_funcao(wrapper, nome) for nome in logica],
+        ])
+        return hashlib.sha256(partes.encode('utf-8')).hexdigest()
@@ -0,0 +1,176 @@
+# lib/cache_estatisticas.py
+
+import os
+import time
+import json
+import zlib
+import pickle
+import sqlite3
+import hashlib
+from typing import Dict, Any, List, Tuple
+
+ARQUIVO_CACHE = 'estatisticas_cache.sqlite'
+TAMANHO_MAXIMO_PADRAO = 256 * 1024 * 1024  # bytes
+# Compressão rápida: a cache é lida e escrita no caminho quente das avaliações
+NIVEL_COMPRESSAO = 1
+
+
+class CacheEstatisticas:
+    """
+    Cache persistente de estatísticas, partilhado entre processos (SQLite).
+
+    Cada entrada é endereçada pelo conteúdo: a chave combina a assinatura do
+    conjunto de sorteios, o nome da estatística, os parâmetros e a versão do código
+    que a calculou, pelo que nunca devolve um valor de outro histórico ou de uma
+    versão antiga do cálculo. Os valores são guardados em pickle comprimido e as
+    entradas menos usadas recentemente são removidas quando o total ultrapassa
+    `tamanho_maximo` bytes.
+    """
+
+    def __init__(self, caminho: str, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO):
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._conexao = None
+        self._tamanho_estimado = 0
+        try:
+            os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+            self._conexao = sqlite3.connect(caminho, timeout=30)
+            # WAL permite leituras concorrentes de vários processos sem fsync a cada acesso
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+            with self._conexao:
+                self._conexao.execute(
+                    "CREATE TABLE IF NOT EXISTS entradas ("
+                    " chave TEXT PRIMARY KEY,"
+                    " nome TEXT NOT NULL,"
+                    " valor BLOB NOT NULL,"
+                    " tamanho INTEGER NOT NULL,"
+                    " ultimo_acesso REAL NOT NULL)"
+                )
+                self._conexao.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_entradas_acesso ON entradas (ultimo_acesso)"
+                )
+            self._tamanho_estimado = self._conexao.execute(
+                "SELECT COALESCE(SUM(tamanho), 0) FROM entradas"
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"⚠️  Cache de estatísticas indisponível em '{caminho}': {e}")
+            self._conexao = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._conexao is not None
+
+    @staticmethod
+    def gerar_chave(assinatura_sorteios: str, nome: str, parametros: Dict[str, Any], versao_codigo: str) -> str:
+        """Chave de conteúdo de uma estatística."""
+        partes = json.dumps(
+            [assinatura_sorteios, nome, parametros, versao_codigo], sort_keys=True, default=repr
+        )
+        return hashlib.sha256(partes.encode('utf-8')).hexdigest()
+
+    def obter(self, chave: str) -> Tuple[bool, Any]:
+        """Devolve (encontrado, valor) e marca a entrada como usada."""
+        valores = self.obter_varios([chave])
+        return (True, valores[chave]) if chave in valores else (False, None)
+
+    def obter_varios(self, chaves: List[str]) -> Dict[str, Any]:
+        """Devolve {chave: valor} das chaves presentes, numa só consulta, e marca-as como usadas."""
+        if not self.ativo or not chaves:
+            return {}
+        valores = {}
+        try:
+            marcadores = ','.join('?' * len(chaves))
+            linhas = self._conexao.execute(
+                f"SELECT chave, valor FROM entradas WHERE chave IN ({marcadores})", list(chaves)
+            ).fetchall()
+            for chave, valor in linhas:
+                try:
+                    valores[chave] = self._desserializar(valor)
+                except (pickle.UnpicklingError, zlib.error, EOFError, AttributeError, ImportError) as e:
+                    print(f"⚠️  Entrada de cache ilegível ({e}); a recalcular.")
+            if valores:
+                agora = time.time()
+                with self._conexao:
+                    self._conexao.executemany(
+                        "UPDATE entradas SET ultimo_acesso = ? WHERE chave = ?", [(agora, chave) for chave in valores]
+                    )
+        except sqlite3.Error as e:
+            print(f"⚠️  Erro ao ler a cache de estatísticas: {e}")
+        self.acertos += len(valores)
+        self.falhas += len(chaves) - len(valores)
+        return valores
+
+    # --- Formato dos valores (as subclasses podem usar um formato mais compacto) ---
+    @staticmethod
+    def _serializar(valor: Any) -> bytes:
+        return zlib.compress(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL), NIVEL_COMPRESSAO)
+
+    @staticmethod
+    def _desserializar(dados: bytes) -> Any:
+        return pickle.loads(zlib.decompress(dados))
+
+    def guardar(self, chave: str, nome: str, valor: Any):
+        """Guarda um valor e remove as entradas mais antigas se o limite de tamanho for ultrapassado."""
+        self.guardar_varios([(chave, nome, valor)])
+
+    def guardar_varios(self, entradas: List[Tuple[str, str, Any]]):
+        """Guarda vários (chave, nome, valor) numa só transação."""
+        if not self.ativo or not entradas:
+            return
+        linhas = []
+        agora = time.time()
+        for chave, nome, valor in entradas:
+            try:
+                dados = self._serializar(valor)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                print(f"⚠️  Estatística '{nome}' não serializável; não será guardada em cache: {e}")
+                continue
+            linhas.append((chave, nome, sqlite3.Binary(dados), len(dados), agora))
+        try:
+            with self._conexao:
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO entradas (chave, nome, valor, tamanho, ultimo_acesso) VALUES (?, ?, ?, ?, ?)",
+                    linhas
+                )
+            self._tamanho_estimado += sum(linha[3] for linha in linhas)
+            if self._tamanho_estimado > self.tamanho_maximo:
+                self._expulsar()
+        except sqlite3.Error as e:
+            print(f"⚠️  Erro ao guardar na cache de estatísticas: {e}")
+
+    def _expulsar(self):
+        """Remove as entradas menos usadas recentemente até caber em `tamanho_maximo`."""
+        total = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+        remover = []
+        if total > self.tamanho_maximo:
+            for chave, tamanho in self._conexao.execute("SELECT chave, tamanho FROM entradas ORDER BY ultimo_acesso"):
+                if total <= self.tamanho_maximo:
+                    break
+                remover.append((chave,))
+                total -= tamanho
+            with self._conexao:
+                self._conexao.executemany("DELETE FROM entradas WHERE chave = ?", remover)
+        # O total real é relido aqui; entre expulsões é mantido em memória
+        self._tamanho_estimado = total
+
+    def limpar(self):
+        if self.ativo:
+            with self._conexao:
+                self._conexao.execute("DELETE FROM entradas")
+
+    def resumo(self) -> Dict[str, Any]:
+        """Número de entradas, bytes ocupados e acertos/falhas desta sessão."""
+        entradas, tamanho = (0, 0)
+        if self.ativo:
+            entradas, tamanho = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas"
+            ).fetchone()
+        return {'entradas': entradas, 'bytes': tamanho, 'acertos': self.acertos, 'falhas': self.falhas}
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
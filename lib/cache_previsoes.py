@@ -0,0 +1,80 @@
+# lib/cache_previsoes.py
+
+import json
+import hashlib
+from typing import Dict, Any, List, Callable
+
+from lib.cache_estatisticas import CacheEstatisticas
+
+ARQUIVO_CACHE_PREVISOES = 'previsoes_cache.sqlite'
+TAMANHO_MAXIMO_PADRAO = 64 * 1024 * 1024  # bytes
+
+# Primeiro byte de cada valor: previsão compacta (um byte por número) ou pickle
+_FORMATO_NUMEROS = b'\x00'
+_FORMATO_PICKLE = b'\x01'
+
+
+class CachePrevisoes(CacheEstatisticas):
+    """
+    Cache persistente das previsões das heurísticas (SQLite, partilhada entre processos).
+
+    A chave de cada previsão combina a versão do código da heurística (hash do ficheiro),
+    a impressão digital das estatísticas de que depende (`Dados.impressao_estatisticas`,
+    que não obriga a calculá-las) e `n`. Uma ferramenta que peça a previsão de uma
+    heurística no sorteio k reaproveita o que outra já calculou, sem recalcular as
+    estatísticas nem chamar `prever`.
+
+    As previsões (listas de números) são guardadas com um byte por número; a expulsão
+    das entradas menos usadas é a de `CacheEstatisticas`.
+    """
+
+    def __init__(self, caminho: str, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO):
+        super().__init__(caminho, tamanho_maximo)
+
+    @staticmethod
+    def gerar_chave(versao_heuristica: str, impressao_estatisticas: str, n: int) -> str:
+        """Chave de conteúdo de uma previsão."""
+        partes = json.dumps([versao_heuristica, impressao_estatisticas, n])
+        return hashlib.sha256(partes.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _serializar(valor: Any) -> bytes:
+        if isinstance(valor, list) and all(type(num) is int and 0 <= num <= 255 for num in valor):
+            return _FORMATO_NUMEROS + bytes(valor)
+        return _FORMATO_PICKLE + CacheEstatisticas._serializar(valor)
+
+    @staticmethod
+    def _desserializar(dados: bytes) -> Any:
+        dados = bytes(dados)
+        if dados[:1] == _FORMATO_NUMEROS:
+            return list(dados[1:])
+        return CacheEstatisticas._desserializar(dados[1:])
+
+    def obter_ou_calcular(self, dados, heuristicas: Dict[str, Dict[str, Any]], n: int,
+                          prever: Callable[[List[str], Dict[str, Any]], Dict[str, List[int]]],
+                          estatisticas: Dict[str, Any] = None) -> Dict[str, List[int]]:
+        """
+        Previsões de cada heurística sobre o histórico `dados`.
+
+        `heuristicas` é `{nome: {'versao': ..., 'dependencias': [...]}}` (os metadados do
+        Despachante). Só as heurísticas em falta na cache são calculadas: as estatísticas
+        de que precisam são pedidas a `dados` (ou lidas de `estatisticas`, se já existirem)
+        e `prever(nomes, estatisticas)` devolve as previsões, que são guardadas.
+        Heurísticas sem `versao` nunca são guardadas.
+        """
+        chaves = {
+            nome: self.gerar_chave(meta['versao'], dados.impressao_estatisticas(meta['dependencias']), n)
+            for nome, meta in heuristicas.items() if meta.get('versao')
+        }
+        guardadas = self.obter_varios(list(chaves.values()))
+        previsoes = {nome: guardadas[chave] for nome, chave in chaves.items() if chave in guardadas}
+
+        em_falta = [nome for nome in heuristicas if nome not in previsoes]
+        if em_falta:
+            if estatisticas is None:
+                dependencias = {dep for nome in em_falta for dep in heuristicas[nome]['dependencias']}
+                estatisticas, _ = dados.obter_estatisticas(dependencias)
+            novas = prever(em_falta, estatisticas)
+            previsoes.update(novas)
+            self.guardar_varios([(chaves[nome], nome, previsao) for nome, previsao in novas.items() if nome in chaves])
+        return {nome: previsoes[nome] for nome in heuristicas if nome in previsoes}
@@ -0,0 +1,290 @@
+# lib/compilador_logicas.py
+
+import os
+import ast
+import hashlib
+import inspect
+import importlib
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Callable, Optional
+
+import numpy as np
+
+from lib.executor_heuristicas import com_limite
+
+# Ficheiro gerado com os wrappers das funções analíticas (`scripts/gerar_wrappers_funcoes.py`)
+ARQUIVO_WRAPPERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'funcoes_wrappers_auto.py')
+
+# Funções de recurso quando o nome não existe em nenhum wrapper (as de `HeuristicaDinamica`)
+FUNCOES_RECURSO: Dict[str, Callable] = {
+    'mean': lambda x: [np.mean(x)] if len(x) else [0],
+    'sum': lambda x: [sum(x)] if len(x) else [0],
+    'max': lambda x: [max(x)] if len(x) else [0],
+    'min': lambda x: [min(x)] if len(x) else [0],
+    'std': lambda x: [np.std(x)] if len(x) > 1 else [0],
+}
+
+
+@lru_cache(maxsize=None)
+def indice_funcoes() -> Dict[str, Tuple[str, str]]:
+    """
+    `{nome do wrapper: (módulo, função)}` lido da árvore sintática de
+    `funcoes_wrappers_auto.py`: cada wrapper importa a função original de
+    `lib.funcoes_analiticas` e aplica-lhe `GenericFeatureWrapper.apply_function`.
+    """
+    try:
+        with open(ARQUIVO_WRAPPERS, 'r', encoding='utf-8') as f:
+            arvore = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return {}
+    indice = {}
+    for classe in arvore.body:
+        if not isinstance(classe, ast.ClassDef):
+            continue
+        for metodo in classe.body:
+            if not isinstance(metodo, ast.FunctionDef) or metodo.name in indice:
+                continue
+            importacao = next((no for no in ast.walk(metodo) if isinstance(no, ast.ImportFrom)), None)
+            if importacao is not None and importacao.module:
+                indice[metodo.name] = (importacao.module, importacao.names[0].name)
+    return indice
+
+
+@lru_cache(maxsize=None)
+def versao_funcao(classe_wrapper: Optional[type], nome: str) -> str:
+    """
+    Hash do código de uma função de um wrapper: o método e, se vier dos wrappers
+    gerados, o módulo de `lib.funcoes_analiticas` que ele chama (lido do ficheiro,
+    sem o importar). Sem wrapper, o método é a função de recurso, se houver.
+    """
+    resumo = hashlib.sha1()
+    metodo = getattr(classe_wrapper, nome, None) if classe_wrapper is not None else FUNCOES_RECURSO.get(nome)
+    try:
+        resumo.update(inspect.getsource(metodo).encode('utf-8'))
+    except (TypeError, OSError):
+        resumo.update(repr(metodo).encode('utf-8'))
+    origem = indice_funcoes().get(nome)
+    if origem is not None:
+        caminho = os.path.join(os.path.dirname(os.path.dirname(ARQUIVO_WRAPPERS)), *origem[0].split('.')) + '.py'
+        if os.path.exists(caminho):
+            with open(caminho, 'rb') as f:
+                resumo.update(f.read())
+    return resumo.hexdigest()
+
+
+def normalizar(resultado: Any) -> Any:
+    """
+    O mesmo que `GenericFeatureWrapper.apply_function` faz ao resultado de cada função
+    (no máximo 5 valores); os arrays são cortados antes de convertidos em lista.
+    """
+    if isinstance(resultado, list):
+        return resultado[:5]
+    if isinstance(resultado, dict):
+        return list(resultado.values())[:5]
+    if isinstance(resultado, (int, float)):
+        return [resultado]
+    if hasattr(resultado, 'shape'):
+        try:
+            return np.ravel(resultado)[:5].tolist()
+        except Exception:
+            return [float(resultado)]
+    return resultado
+
+
+class PassoCompilado:
+    """
+    Uma função da lógica, já resolvida (e, se vier dos wrappers, com o resultado
+    normalizado). Com `timeout`, cada chamada é interrompida com `TempoEsgotado`
+    ao fim desse tempo (ver `com_limite`).
+    """
+
+    def __init__(self, nome: str, funcao: Callable, normalizar_resultado: bool, timeout: float = None):
+        self.nome = nome
+        self.funcao = funcao
+        self.normalizar_resultado = normalizar_resultado
+        self.timeout = timeout
+
+    def __call__(self, dados: Any) -> Any:
+        if self.timeout:
+            resultado = com_limite(lambda: self.funcao(dados), self.timeout)
+        else:
+            resultado = self.funcao(dados)
+        return normalizar(resultado) if self.normalizar_resultado else resultado
+
+
+class _FuncaoIndisponivel:
+    """Passo cuja função não se pôde importar: falha em cada chamada, como o wrapper original."""
+
+    def __init__(self, erro: Exception):
+        self.erro = erro
+
+    def __call__(self, dados: Any) -> Any:
+        raise self.erro
+
+
+def resolver_funcao(nome: str, wrapper: Any = None, timeout: float = None) -> PassoCompilado:
+    """
+    Resolve uma função da lógica pela ordem de `HeuristicaDinamica`: os wrappers
+    (diretamente para a função original de `lib.funcoes_analiticas`, sem passar pelas
+    importações e conversões que os wrappers repetem em cada chamada), depois o
+    `wrapper` dado e por fim as funções de recurso; um nome desconhecido não altera os dados.
+    """
+    origem = indice_funcoes().get(nome)
+    if origem is not None:
+        try:
+            funcao = getattr(importlib.import_module(origem[0]), origem[1])
+        except Exception as e:
+            funcao = _FuncaoIndisponivel(e)
+        return PassoCompilado(nome, funcao, True, timeout)
+    if wrapper is not None and hasattr(wrapper, nome):
+        return PassoCompilado(nome, getattr(wrapper, nome), False, timeout)
+    return PassoCompilado(nome, FUNCOES_RECURSO.get(nome, lambda x: x), False, timeout)
+
+
+class CadeiaCompilada:
+    """
+    Lógica (lista de nomes de funções) compilada numa cadeia de passos já resolvidos:
+    chamá-la só custa as próprias funções. `timeout` limita cada chamada de função.
+    """
+
+    def __init__(self, logica: List[str], wrapper: Any = None, timeout: float = None):
+        self.logica = list(logica)
+        self.passos = [resolver_funcao(nome, wrapper, timeout) for nome in self.logica]
+
+    def __call__(self, dados: Any) -> Any:
+        for passo in self.passos:
+            dados = passo(dados)
+        return dados
+
+    def __len__(self) -> int:
+        return len(self.passos)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({' → '.join(self.logica)})"
+
+
+def compilar_logica(logica: List[str], wrapper: Any = None, timeout: float = None) -> CadeiaCompilada:
+    """Compila uma lógica numa `CadeiaCompilada`."""
+    return CadeiaCompilada(logica, wrapper, timeout)
+
+
+class _No:
+    """
+    Nó da árvore de lógicas: o passo que leva até ele, as heurísticas que aí terminam
+    e quantas heurísticas passam por ele (quantas vezes o passo correria sem partilha).
+    """
+
+    def __init__(self, passo: PassoCompilado = None):
+        self.passo = passo
+        self.filhos: Dict[str, '_No'] = {}
+        self.terminais: List[str] = []
+        self.num_heuristicas = 0
+
+    def todas_terminais(self) -> List[str]:
+        nomes, pendentes = [], [self]
+        while pendentes:
+            no = pendentes.pop()
+            nomes.extend(no.terminais)
+            pendentes.extend(no.filhos.values())
+        return nomes
+
+
+class ArvoreLogicas:
+    """
+    Avalia várias heurísticas dinâmicas de uma vez, partilhando o trabalho comum.
+
+    As lógicas formam uma árvore de prefixos por assinatura de entrada (as
+    dependências, pela ordem em que `_preparar_dados_entrada` as lê): em cada momento,
+    a entrada de cada assinatura é preparada uma vez e cada prefixo de funções é
+    calculado uma vez, para todas as heurísticas que o partilham. Cada função recebe
+    uma cópia do valor partilhado, para que não o possa alterar para as outras.
+
+    Funções aleatórias passam a ser sorteadas uma vez por prefixo partilhado, e não
+    uma vez por heurística. Cada chamada de função tem o limite `TIMEOUT_FUNCAO` da
+    heurística que a introduziu na árvore.
+    """
+
+    def __init__(self, heuristicas: Dict[str, Any]):
+        self.heuristicas = dict(heuristicas)
+        self.raizes: Dict[Tuple[str, ...], _No] = {}
+        self._representantes: Dict[Tuple[str, ...], Any] = {}
+        self.nos = 0
+        for nome, heuristica in self.heuristicas.items():
+            assinatura = tuple(heuristica.DEPENDENCIAS)
+            if assinatura not in self.raizes:
+                self.raizes[assinatura] = _No()
+                self._representantes[assinatura] = heuristica
+            no = self.raizes[assinatura]
+            for funcao in heuristica.logica:
+                if funcao not in no.filhos:
+                    no.filhos[funcao] = _No(resolver_funcao(
+                        funcao, getattr(heuristica, 'wrapper', None), getattr(heuristica, 'TIMEOUT_FUNCAO', None)
+                    ))
+                    self.nos += 1
+                no = no.filhos[funcao]
+                no.num_heuristicas += 1
+            no.terminais.append(nome)
+        self.passos_sem_partilha = sum(len(h.logica) for h in self.heuristicas.values())
+        self.avaliacoes = 0
+        self.passos_executados = 0
+        # Passos que as heurísticas teriam executado cada uma por si (até à sua falha)
+        self.passos_isolados = 0
+
+    def avaliar(self, estatisticas: Dict[str, Any], n: int = 5) -> Dict[str, List[int]]:
+        """Previsões de todas as heurísticas, iguais às de `prever` de cada uma."""
+        self.avaliacoes += 1
+        previsoes = {}
+        for assinatura, raiz in self.raizes.items():
+            representante = self._representantes[assinatura]
+            try:
+                entrada = representante._preparar_dados_entrada(estatisticas)
+            except Exception as e:
+                self._falhar(raiz, e, previsoes)
+                continue
+            pendentes = [(raiz, entrada)]
+            while pendentes:
+                no, valor = pendentes.pop()
+                for nome in no.terminais:
+                    previsoes[nome] = self.heuristicas[nome]._extrair_numeros_previsao(_copia(valor), n)
+                for filho in no.filhos.values():
+                    self.passos_executados += 1
+                    self.passos_isolados += filho.num_heuristicas
+                    try:
+                        pendentes.append((filho, filho.passo(_copia(valor))))
+                    except Exception as e:
+                        self._falhar(filho, e, previsoes)
+        return {nome: previsoes[nome] for nome in self.heuristicas}
+
+    def _falhar(self, no: _No, erro: Exception, previsoes: Dict[str, List[int]]):
+        """Todas as heurísticas abaixo de `no` falham, como falharia o seu `prever`."""
+        for nome in no.todas_terminais():
+            print(f"Erro na heurística {nome}: {erro}")
+            previsoes[nome] = []
+
+    def relatorio(self) -> Dict[str, Any]:
+        """
+        Trabalho poupado pela partilha: por avaliação e acumulado desde a criação. Os
+        passos evitados comparam com os que cada heurística executaria por si, até à sua
+        própria falha; os que ficam por executar depois de uma falha contam à parte.
+        """
+        sem_partilha = self.passos_sem_partilha * self.avaliacoes
+        return {
+            'heuristicas': len(self.heuristicas),
+            'entradas_por_avaliacao': len(self.raizes),
+            'entradas_sem_partilha': len(self.heuristicas),
+            'passos_por_avaliacao': self.nos,
+            'passos_sem_partilha': self.passos_sem_partilha,
+            'avaliacoes': self.avaliacoes,
+            'passos_executados': self.passos_executados,
+            'passos_isolados': self.passos_isolados,
+            'passos_evitados': self.passos_isolados - self.passos_executados,
+            'passos_apos_falha': sem_partilha - self.passos_isolados,
+            'fracao_poupada': 1 - self.passos_executados / self.passos_isolados if self.passos_isolados else 0.0,
+        }
+
+
+def _copia(valor: Any) -> Any:
+    """Cópia superficial dos valores mutáveis partilhados entre ramos."""
+    if isinstance(valor, (list, dict, set, np.ndarray)):
+        return valor.copy()
+    return valor
@@ -0,0 +1,337 @@
+# lib/coocorrencias.py
+
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Dict, Any, List, Tuple, Iterable
+
+import numpy as np
+
+from lib.matriz_sorteios import NUMERO_MAXIMO
+
+# Tamanhos de grupo contados por `Dados._calcular_frequencia_grupos`
+TAMANHOS_GRUPOS = (2, 3, 4)
+# Maior número suportado pelas tabelas combinatórias (o índice não depende do jogo)
+_LIMITE_TABELAS = 64
+
+_BINOMIAL = np.array(
+    [[comb(n, k) for k in range(max(TAMANHOS_GRUPOS) + 1)] for n in range(_LIMITE_TABELAS + 1)],
+    dtype=np.int64
+)
+_BINOMIAL_PY = _BINOMIAL.tolist()
+
+
+def _indexar(combinacoes: np.ndarray) -> np.ndarray:
+    """Índice combinatório (ordem colexicográfica) de combinações ordenadas de números 0..(máximo - 1)."""
+    indices = np.zeros(combinacoes.shape[:-1], dtype=np.int64)
+    for i in range(combinacoes.shape[-1]):
+        indices += _BINOMIAL[combinacoes[..., i], i + 1]
+    return indices
+
+
+def _indexar_tupla(numeros: Tuple[int, ...]) -> int:
+    """Versão escalar de `_indexar` para uma tupla ordenada de números 1..máximo."""
+    return sum(_BINOMIAL_PY[num - 1][i + 1] for i, num in enumerate(numeros))
+
+
+@lru_cache(maxsize=None)
+def _posicoes_combinacoes(quantidade: int, tamanho: int) -> np.ndarray:
+    """Posições (em `combinations(range(quantidade), tamanho)`) das combinações de um sorteio."""
+    return np.array(list(combinations(range(quantidade), tamanho)), dtype=np.int64).reshape(-1, tamanho)
+
+
+@lru_cache(maxsize=None)
+def _tabela_combinacoes(tamanho: int, numero_maximo: int = NUMERO_MAXIMO) -> np.ndarray:
+    """Tabela (C(máximo, tamanho) x tamanho) que converte um índice combinatório na combinação (1..máximo)."""
+    todas = np.array(list(combinations(range(numero_maximo), tamanho)), dtype=np.int64)
+    tabela = np.empty_like(todas)
+    tabela[_indexar(todas)] = todas
+    return tabela + 1
+
+
+class ContagemCombinacoes(Mapping):
+    """
+    Vista só de leitura, compatível com `Counter`, sobre contagens de combinações
+    guardadas em arrays indexados pelo índice combinatório.
+
+    As chaves são tuplas ordenadas e são iteradas pela ordem de primeira aparição
+    (a mesma de um `Counter` atualizado sorteio a sorteio), pelo que `most_common`
+    desempata exatamente como antes. `most_common(n)` usa `argpartition` e só
+    converte em tuplas as `n` combinações devolvidas.
+    """
+
+    def __init__(self, partes: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray]],
+                 numero_maximo: int = NUMERO_MAXIMO):
+        # Cada parte: (tamanho, contagens, primeira linha, posição na linha)
+        self._partes = partes
+        self.numero_maximo = numero_maximo
+        self._ordem = None
+
+    @classmethod
+    def de_pares(cls, pares: np.ndarray, incidencia: np.ndarray) -> 'ContagemCombinacoes':
+        """
+        Contagem de pares a partir de uma matriz (máximo x máximo) já contada (ex.: mantida
+        incrementalmente); `incidencia` são as linhas contadas, usadas só para a ordem
+        de primeira aparição.
+        """
+        numero_maximo = pares.shape[0]
+        tabela = _tabela_combinacoes(2, numero_maximo) - 1
+        contagens = pares[tabela[:, 0], tabela[:, 1]]
+        juntos = incidencia[:, tabela[:, 0]] & incidencia[:, tabela[:, 1]]
+        primeira_linha = np.where(contagens > 0, juntos.argmax(axis=0) if juntos.shape[0] else 0, -1)
+        # Dentro da mesma linha, os pares surgem por ordem lexicográfica
+        posicao = tabela[:, 0] * numero_maximo + tabela[:, 1]
+        return cls([(2, contagens, primeira_linha, posicao)], numero_maximo)
+
+    def _ordenar(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(parte, índice, contagem) das combinações presentes, pela ordem de primeira aparição."""
+        if self._ordem is None:
+            partes, indices, contagens, linhas, posicoes = [], [], [], [], []
+            for i, (_, contagem, primeira_linha, posicao) in enumerate(self._partes):
+                presentes = np.flatnonzero(contagem)
+                partes.append(np.full(presentes.size, i))
+                indices.append(presentes)
+                contagens.append(contagem[presentes])
+                linhas.append(primeira_linha[presentes])
+                posicoes.append(posicao[presentes])
+            if not indices:
+                vazio = np.zeros(0, dtype=np.int64)
+                self._ordem = (vazio, vazio, vazio)
+                return self._ordem
+            ordem = np.lexsort((np.concatenate(posicoes), np.concatenate(linhas)))
+            self._ordem = tuple(np.concatenate(arrays)[ordem] for arrays in (partes, indices, contagens))
+        return self._ordem
+
+    def _chaves(self, partes: np.ndarray, indices: np.ndarray) -> List[Tuple[int, ...]]:
+        """Converte pares (parte, índice) em tuplas de números, mantendo a ordem."""
+        if len(self._partes) == 1:
+            tabela = _tabela_combinacoes(self._partes[0][0], self.numero_maximo)
+            return list(map(tuple, tabela[indices].tolist()))
+        chaves = [None] * len(indices)
+        for i, (tamanho, *_) in enumerate(self._partes):
+            selecionados = np.flatnonzero(partes == i)
+            tuplas = _tabela_combinacoes(tamanho, self.numero_maximo)[indices[selecionados]].tolist()
+            for posicao, tupla in zip(selecionados.tolist(), tuplas):
+                chaves[posicao] = tuple(tupla)
+        return chaves
+
+    def _contagem_de(self, chave) -> int:
+        if not isinstance(chave, tuple):
+            return 0
+        for tamanho, contagem, _, _ in self._partes:
+            if tamanho == len(chave):
+                if list(chave) != sorted(set(chave)) or not all(1 <= num <= self.numero_maximo for num in chave):
+                    return 0
+                return int(contagem[_indexar_tupla(chave)])
+        return 0
+
+    # --- Interface de Mapping / Counter ---
+    def __getitem__(self, chave) -> int:
+        # Como no Counter, combinações ausentes contam 0
+        return self._contagem_de(chave)
+
+    def __contains__(self, chave) -> bool:
+        return self._contagem_de(chave) > 0
+
+    def get(self, chave, padrao=None):
+        contagem = self._contagem_de(chave)
+        return contagem if contagem else padrao
+
+    def __iter__(self):
+        partes, indices, _ = self._ordenar()
+        return iter(self._chaves(partes, indices))
+
+    def __len__(self) -> int:
+        return int(sum(np.count_nonzero(contagem) for _, contagem, _, _ in self._partes))
+
+    def keys(self) -> List[Tuple[int, ...]]:
+        return list(self)
+
+    def values(self) -> List[int]:
+        return self._ordenar()[2].tolist()
+
+    def items(self) -> List[Tuple[Tuple[int, ...], int]]:
+        partes, indices, contagens = self._ordenar()
+        return list(zip(self._chaves(partes, indices), contagens.tolist()))
+
+    def total(self) -> int:
+        return int(sum(contagem.sum() for _, contagem, _, _ in self._partes))
+
+    def most_common(self, n: int = None) -> List[Tuple[Tuple[int, ...], int]]:
+        """As `n` combinações mais frequentes; empates pela ordem de primeira aparição."""
+        partes, indices, contagens = self._ordenar()
+        if n is None:
+            selecionados = np.argsort(-contagens, kind='stable')
+        else:
+            if n <= 0:
+                return []
+            candidatos = np.arange(contagens.size)
+            if n < contagens.size:
+                # Todos os empatados com a n-ésima contagem continuam candidatos
+                limiar = contagens[np.argpartition(-contagens, n - 1)[n - 1]]
+                candidatos = np.flatnonzero(contagens >= limiar)
+            selecionados = candidatos[np.argsort(-contagens[candidatos], kind='stable')][:n]
+        chaves = self._chaves(partes[selecionados], indices[selecionados])
+        return list(zip(chaves, contagens[selecionados].tolist()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} combinações)"
+
+    # --- Serialização (só as combinações presentes; as tabelas densas ocupam vários MB) ---
+    def __getstate__(self) -> Dict[str, Any]:
+        partes = []
+        for tamanho, contagem, primeira_linha, posicao in self._partes:
+            presentes = np.flatnonzero(contagem)
+            partes.append((tamanho, contagem.size, presentes, contagem[presentes],
+                           primeira_linha[presentes], posicao[presentes]))
+        return {'partes': partes, 'numero_maximo': self.numero_maximo}
+
+    def __setstate__(self, estado: Dict[str, Any]):
+        self.numero_maximo = estado.get('numero_maximo', NUMERO_MAXIMO)
+        self._partes = []
+        for tamanho, total, presentes, contagens, linhas, posicoes in estado['partes']:
+            contagem = np.zeros(total, dtype=contagens.dtype)
+            contagem[presentes] = contagens
+            primeira_linha = np.full(total, -1, dtype=np.int64)
+            primeira_linha[presentes] = linhas
+            posicao = np.zeros(total, dtype=np.int64)
+            posicao[presentes] = posicoes
+            self._partes.append((tamanho, contagem, primeira_linha, posicao))
+        self._ordem = None
+
+
+class Coocorrencias:
+    """
+    Contagens de co-ocorrência de pares, trios e quadras de números.
+
+    Os pares são guardados numa matriz simétrica (49 x 49 no Totoloto) e os trios/quadras
+    em arrays densos indexados pelo índice combinatório (C(49, 3) e C(49, 4) posições).
+    Para cada combinação guarda-se também a linha e a posição da primeira aparição,
+    usadas para reproduzir a ordem de inserção de um `Counter`.
+
+    Pode ser construído de uma vez a partir de uma matriz de incidência
+    (`de_incidencia`) ou atualizado sorteio a sorteio (`adicionar`).
+    """
+
+    def __init__(self, tamanhos: Iterable[int] = TAMANHOS_GRUPOS, numero_maximo: int = NUMERO_MAXIMO):
+        if numero_maximo > _LIMITE_TABELAS:
+            raise ValueError(f"Números até {numero_maximo} excedem o limite das tabelas ({_LIMITE_TABELAS})")
+        self.tamanhos = tuple(sorted(tamanhos))
+        self.numero_maximo = numero_maximo
+        self.total_sorteios = 0
+        self.pares = np.zeros((numero_maximo, numero_maximo), dtype=np.int32)
+        self._contagens = {}
+        self._primeira_linha = {}
+        self._posicao = {}
+        for tamanho in self.tamanhos:
+            total = comb(numero_maximo, tamanho)
+            if tamanho != 2:
+                self._contagens[tamanho] = np.zeros(total, dtype=np.int32)
+            self._primeira_linha[tamanho] = np.full(total, -1, dtype=np.int64)
+            self._posicao[tamanho] = np.zeros(total, dtype=np.int64)
+        self._vistas = {}
+
+    @classmethod
+    def de_incidencia(cls, incidencia: np.ndarray, tamanhos: Iterable[int] = TAMANHOS_GRUPOS) -> 'Coocorrencias':
+        """Conta todas as combinações de uma matriz de incidência (N x máximo) de forma vetorizada."""
+        coocorrencias = cls(tamanhos, incidencia.shape[1])
+        coocorrencias.total_sorteios = incidencia.shape[0]
+        if 2 in coocorrencias.tamanhos:
+            inteiros = incidencia.astype(np.int32)
+            coocorrencias.pares = inteiros.T @ inteiros
+            np.fill_diagonal(coocorrencias.pares, 0)
+
+        # (índices, linhas, posições na linha) de cada combinação, agrupados por tamanho do sorteio
+        blocos = {tamanho: [] for tamanho in coocorrencias.tamanhos}
+        numeros_por_linha = incidencia.sum(axis=1)
+        for quantidade in np.unique(numeros_por_linha).tolist():
+            linhas = np.flatnonzero(numeros_por_linha == quantidade)
+            numeros = np.nonzero(incidencia[linhas])[1].reshape(-1, quantidade)
+            deslocamento = 0
+            for tamanho in TAMANHOS_GRUPOS:
+                posicoes = _posicoes_combinacoes(quantidade, tamanho)
+                if tamanho in blocos and posicoes.size:
+                    indices = _indexar(numeros[:, posicoes])
+                    blocos[tamanho].append((
+                        indices.ravel(),
+                        np.repeat(linhas, len(posicoes)),
+                        np.tile(np.arange(deslocamento, deslocamento + len(posicoes)), linhas.size),
+                    ))
+                deslocamento += len(posicoes)
+
+        for tamanho, partes in blocos.items():
+            if not partes:
+                continue
+            indices, linhas, posicoes = (np.concatenate(arrays) for arrays in zip(*partes))
+            if tamanho != 2:
+                coocorrencias._contagens[tamanho] = np.bincount(
+                    indices, minlength=comb(coocorrencias.numero_maximo, tamanho)
+                ).astype(np.int32)
+            # Primeira aparição: primeiro elemento de cada índice na ordem (linha, posição)
+            ordem = np.lexsort((posicoes, linhas))
+            unicos, primeiros = np.unique(indices[ordem], return_index=True)
+            coocorrencias._primeira_linha[tamanho][unicos] = linhas[ordem][primeiros]
+            coocorrencias._posicao[tamanho][unicos] = posicoes[ordem][primeiros]
+        return coocorrencias
+
+    @classmethod
+    def de_numeros(cls, sorteios: Iterable[List[int]], tamanhos: Iterable[int] = TAMANHOS_GRUPOS,
+                   numero_maximo: int = NUMERO_MAXIMO) -> 'Coocorrencias':
+        """Constrói as contagens a partir de listas de números (números fora de 1..máximo são ignorados)."""
+        sorteios = list(sorteios)
+        incidencia = np.zeros((len(sorteios), numero_maximo), dtype=bool)
+        for linha, numeros in enumerate(sorteios):
+            validos = [num - 1 for num in numeros if 1 <= num <= numero_maximo]
+            incidencia[linha, validos] = True
+        return cls.de_incidencia(incidencia, tamanhos)
+
+    def adicionar(self, numeros: List[int]):
+        """Acrescenta um sorteio ao fim do histórico (números fora de 1..máximo são ignorados)."""
+        linha = self.total_sorteios
+        numeros = np.array(sorted(set(num for num in numeros if 1 <= num <= self.numero_maximo)), dtype=np.int64) - 1
+        deslocamento = 0
+        for tamanho in TAMANHOS_GRUPOS:
+            posicoes = _posicoes_combinacoes(numeros.size, tamanho)
+            if tamanho in self.tamanhos and posicoes.size:
+                grupos = numeros[posicoes]
+                indices = _indexar(grupos)
+                if tamanho == 2:
+                    self.pares[grupos[:, 0], grupos[:, 1]] += 1
+                    self.pares[grupos[:, 1], grupos[:, 0]] += 1
+                else:
+                    # Os índices de um sorteio são distintos, pelo que a soma direta é segura
+                    self._contagens[tamanho][indices] += 1
+                novos = self._primeira_linha[tamanho][indices] < 0
+                self._primeira_linha[tamanho][indices[novos]] = linha
+                self._posicao[tamanho][indices[novos]] = deslocamento + np.flatnonzero(novos)
+            deslocamento += len(posicoes)
+        self.total_sorteios += 1
+        self._vistas = {}
+
+    def contagens(self, tamanho: int) -> np.ndarray:
+        """Array denso de contagens indexado pelo índice combinatório."""
+        if tamanho == 2:
+            tabela = _tabela_combinacoes(2, self.numero_maximo) - 1
+            return self.pares[tabela[:, 0], tabela[:, 1]]
+        return self._contagens[tamanho]
+
+    def _parte(self, tamanho: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        return (tamanho, self.contagens(tamanho), self._primeira_linha[tamanho], self._posicao[tamanho])
+
+    def contagem(self, tamanho: int) -> ContagemCombinacoes:
+        """Contagem (compatível com `Counter`) das combinações de um tamanho."""
+        if tamanho not in self._vistas:
+            self._vistas[tamanho] = ContagemCombinacoes([self._parte(tamanho)], self.numero_maximo)
+        return self._vistas[tamanho]
+
+    def grupos(self) -> ContagemCombinacoes:
+        """Contagem conjunta de todos os tamanhos, como em `frequencia_grupos`."""
+        if 'grupos' not in self._vistas:
+            self._vistas['grupos'] = ContagemCombinacoes(
+                [self._parte(tamanho) for tamanho in self.tamanhos], self.numero_maximo
+            )
+        return self._vistas['grupos']
+
+    def mais_comuns(self, tamanho: int, n: int) -> List[Tuple[Tuple[int, ...], int]]:
+        return self.contagem(tamanho).most_common(n)
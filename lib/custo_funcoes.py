@@ -0,0 +1,124 @@
+# lib/custo_funcoes.py
+
+import os
+import json
+import time
+import datetime
+import statistics
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+from lib.armazem_sorteios import PASTA_COMPILADA
+from lib.compilador_logicas import indice_funcoes, resolver_funcao, versao_funcao
+from lib.executor_heuristicas import TempoEsgotado
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_CUSTO = os.path.join(PROJECT_ROOT, 'dados', PASTA_COMPILADA, 'custo_funcoes.json')
+
+# Tamanhos das entradas de medição: o que sai de cada passo de uma lógica (no máximo
+# 5 valores), uma estatística por número (49) e uma entrada maior
+TAMANHOS_PADRAO = (5, 49, 100)
+TIMEOUT_MEDICAO = 2.0  # segundos por chamada medida
+CUSTO_DESCONHECIDO = 0.01  # segundos, para funções ainda não medidas
+# Tempo estimado máximo (segundos) de uma avaliação de cada lógica gerada; uma função
+# mais lenta do que isto não cabe em nenhuma lógica
+ORCAMENTO_LOGICA = 0.05
+
+
+def entrada_padrao(tamanho: int) -> List[float]:
+    """Entrada determinística de medição: `tamanho` valores no intervalo dos números (1-49)."""
+    return (np.random.default_rng(tamanho).random(tamanho) * 48 + 1).tolist()
+
+
+class ModeloCusto:
+    """
+    Custo por chamada das funções usadas pelas heurísticas dinâmicas, medido nas
+    entradas de `TAMANHOS_PADRAO` e gravado em `dados/.compilado/custo_funcoes.json`.
+
+    O custo de uma função é a pior das medianas por tamanho; uma função que excede
+    `TIMEOUT_MEDICAO` fica com esse custo (e não é medida nos tamanhos seguintes).
+    Uma função volta a ser medida se o seu código mudar (`versao_funcao`). O custo
+    estimado de uma lógica é a soma dos custos das suas funções.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_CUSTO):
+        self.caminho = caminho
+        self.funcoes: Dict[str, Dict[str, Any]] = self._ler()
+
+    def _ler(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                return json.load(f).get('funcoes', {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def gravar(self):
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        conteudo = {
+            'data_geracao': datetime.datetime.now().isoformat(),
+            'tamanhos': list(TAMANHOS_PADRAO),
+            'funcoes': self.funcoes,
+        }
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    # --- Medição ---
+    def medir_funcao(self, nome: str, repeticoes: int = 3, timeout: float = TIMEOUT_MEDICAO) -> Dict[str, Any]:
+        """Mede uma função em cada tamanho padrão (mediana de `repeticoes` chamadas)."""
+        passo = resolver_funcao(nome, timeout=timeout)
+        registo = {'versao': versao_funcao(None, nome), 'por_tamanho': {}, 'erro': None}
+        for tamanho in TAMANHOS_PADRAO:
+            entrada = entrada_padrao(tamanho)
+            tempos, esgotado = [], False
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                try:
+                    passo(list(entrada))
+                except TempoEsgotado as e:
+                    registo['erro'], esgotado = str(e), True
+                    break
+                except Exception as e:
+                    # Uma função que falha também gasta tempo até falhar
+                    registo['erro'] = f"{type(e).__name__}: {e}"
+                tempos.append(time.perf_counter() - inicio)
+            registo['por_tamanho'][str(tamanho)] = timeout if esgotado else statistics.median(tempos)
+            if esgotado:
+                break
+        registo['custo'] = max(registo['por_tamanho'].values())
+        return registo
+
+    def medir(self, nomes: Iterable[str] = None, repeticoes: int = 3,
+              timeout: float = TIMEOUT_MEDICAO, forcar: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Mede as funções `nomes` (por omissão todas as dos wrappers) que ainda não têm
+        custo ou cujo código mudou, e grava o modelo. Devolve os registos medidos.
+        """
+        nomes = sorted(indice_funcoes()) if nomes is None else list(nomes)
+        medidos = {}
+        for nome in nomes:
+            registo = self.funcoes.get(nome)
+            if registo is not None and not forcar and registo.get('versao') == versao_funcao(None, nome):
+                continue
+            medidos[nome] = self.funcoes[nome] = self.medir_funcao(nome, repeticoes, timeout)
+        if medidos:
+            self.gravar()
+        return medidos
+
+    # --- Consulta ---
+    def custo(self, nome: str) -> float:
+        registo = self.funcoes.get(nome)
+        return registo['custo'] if registo is not None else CUSTO_DESCONHECIDO
+
+    def custo_logica(self, logica: List[str], medir: bool = False) -> float:
+        """Custo estimado de uma avaliação da lógica; com `medir`, mede antes as funções em falta."""
+        if medir:
+            self.medir([nome for nome in logica if nome not in self.funcoes])
+        return sum(self.custo(nome) for nome in logica)
+
+    def lentas(self, limite: float) -> Dict[str, float]:
+        """Funções medidas com custo acima de `limite` segundos, da mais lenta para a mais rápida."""
+        custos = {nome: registo['custo'] for nome, registo in self.funcoes.items() if registo['custo'] > limite}
+        return dict(sorted(custos.items(), key=lambda item: -item[1]))
@@ -2,53 +2,177 @@
 
 import os
 import sys
-import json
 from collections import Counter, defaultdict
-from itertools import combinations
-import datetime
 import numpy as np
 import inspect
-from typing import Dict, Any, List, Tuple
+import hashlib
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Tuple, Iterator
+
+from lib.armazem_resultados import ArmazemResultados
+from lib.armazem_sorteios import ArmazemSorteios, PASTA_COMPILADA
+from lib.cache_estatisticas import CacheEstatisticas, ARQUIVO_CACHE
+from lib.estatisticas_incrementais import EstatisticasIncrementais
+from lib.grafo_estatisticas import GrafoEstatisticas, depende_de
+from lib.janelas_deslizantes import JanelasDeslizantes, PorJanela
+from lib.jogos import JOGO_PADRAO, obter_jogo
+from lib.matriz_sorteios import MatrizSorteios
+from lib.pontuacoes import ContagensLote
+from lib.coocorrencias import Coocorrencias, ContagemCombinacoes
 
 # A pasta de dados principal
 PASTA_DADOS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dados'))
-ARQUIVO_CACHE_ESTATISTICAS = os.path.join(PASTA_DADOS, 'estatisticas_cache.json')
+
+
+@lru_cache(maxsize=None)
+def _mascaras_colunas(numero_maximo: int) -> Dict[str, Any]:
+    """Máscaras de colunas da matriz de incidência (coluna `num - 1`) para os números 1..máximo."""
+    numeros = np.arange(1, numero_maximo + 1)
+    return {
+        'pares': numeros % 2 == 0,
+        'primos': np.array([n > 1 and all(n % i for i in range(2, int(n**0.5) + 1)) for n in numeros.tolist()],
+                           dtype=bool),
+        'terminacao': [numeros % 10 == t for t in range(10)],
+    }
+
+
+class VistaSorteios(Sequence):
+    """
+    Vista só de leitura sobre os primeiros `fim` sorteios de uma lista já carregada.
+    Não copia a lista: indexação e iteração leem diretamente da lista original.
+    """
+    __slots__ = ('_base', '_fim')
+
+    def __init__(self, base: List[Dict[str, Any]], fim: int):
+        self._base = base
+        self._fim = max(0, min(fim, len(base)))
+
+    def __len__(self) -> int:
+        return self._fim
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(self._fim)
+            return self._base[inicio:fim:passo]
+        if indice < 0:
+            indice += self._fim
+        if not 0 <= indice < self._fim:
+            raise IndexError('índice de sorteio fora da vista')
+        return self._base[indice]
+
+    def __iter__(self):
+        return islice(self._base, self._fim)
+
+    def __repr__(self) -> str:
+        return f"VistaSorteios({self._fim} de {len(self._base)} sorteios)"
+
 
 class Dados:
-    def __init__(self, caminho_dados: str = PASTA_DADOS):
+    # Nomes dos métodos `_calcular_*` e grafo de dependências, descobertos uma vez por classe
+    _nomes_calculos = None
+    _grafo = None
+    # (parâmetros, versão do código) de cada cálculo, usados nas chaves da cache persistente
+    _versoes_calculos = {}
+
+    def __init__(self, caminho_dados: str = PASTA_DADOS, usar_cache_persistente: bool = False,
+                 jogo: str = JOGO_PADRAO):
+        """
+        Args:
+            caminho_dados: pasta com os ficheiros JSON dos sorteios.
+            usar_cache_persistente: reutiliza estatísticas já calculadas por outros
+                processos (cache SQLite em `dados/.compilado`).
+            jogo: jogo registado em `lib/jogos.py` (ex.: 'totoloto', 'euromilhoes');
+                só os ficheiros desse jogo são lidos.
+        """
+        self.jogo = obter_jogo(jogo)
+        if not self.jogo.tem_numeros:
+            raise ValueError(f"O jogo '{self.jogo.nome}' não sorteia números; não há estatísticas a calcular.")
         self.caminho_dados = caminho_dados
+        self.cache_persistente = None
+        if usar_cache_persistente:
+            self.cache_persistente = CacheEstatisticas(
+                os.path.join(caminho_dados, PASTA_COMPILADA, ARQUIVO_CACHE)
+            )
         self.sorteios = self._carregar_sorteios()
         self.mapeamento_calculos = self._get_mapeamento_calculos()
+
+    @classmethod
+    def a_partir_de(cls, sorteios, caminho_dados: str = PASTA_DADOS,
+                    cache_persistente: CacheEstatisticas = None, jogo: str = JOGO_PADRAO) -> 'Dados':
+        """Cria uma instância sobre sorteios já carregados, sem ler o disco."""
+        instancia = cls.__new__(cls)
+        instancia.jogo = obter_jogo(jogo)
+        instancia.caminho_dados = caminho_dados
+        instancia.cache_persistente = cache_persistente
+        instancia.sorteios = sorteios
+        instancia.mapeamento_calculos = instancia._get_mapeamento_calculos()
+        return instancia
+
+    @property
+    def sorteios(self):
+        return self._sorteios
+
+    @sorteios.setter
+    def sorteios(self, sorteios):
+        # Substituir o histórico invalida as estatísticas memorizadas
+        self._sorteios = sorteios
         self._estatisticas_cache = {}
+        self._matriz = None
+        self._coocorrencias = None
+        self._intermedios = {}
+        self._cadeia_assinaturas = None
+        self.tempos_calculo = {}
+
+    @property
+    def matriz(self) -> MatrizSorteios:
+        """Matriz de incidência do histórico, construída na primeira utilização."""
+        if self._matriz is None:
+            self._matriz = MatrizSorteios.de_sorteios(
+                self._sorteios, self.jogo.numero_maximo, self.jogo.especial_maximo
+            )
+        return self._matriz
+
+    @property
+    def coocorrencias(self) -> Coocorrencias:
+        """Contagens de pares, trios e quadras do histórico, calculadas uma vez."""
+        if self._coocorrencias is None:
+            self._coocorrencias = Coocorrencias.de_incidencia(self.matriz.incidencia)
+        return self._coocorrencias
+
+    def ate(self, indice: int) -> 'Dados':
+        """
+        Devolve uma vista do histórico com os primeiros `indice` sorteios (equivalente
+        a `sorteios[:indice]`). A vista partilha os sorteios já carregados, não lê o
+        disco nem copia a lista, e memoriza as suas próprias estatísticas.
+        """
+        base = self._sorteios
+        if isinstance(base, VistaSorteios):
+            indice = min(indice, len(base))
+            base = base._base
+        vista = self.a_partir_de(VistaSorteios(base, indice), self.caminho_dados, self.cache_persistente, self.jogo)
+        # Todas as vistas partilham a matriz de incidência do histórico completo
+        vista._matriz = self.matriz.fatia(len(vista.sorteios))
+        if self.cache_persistente is not None:
+            self.assinatura()
+            vista._cadeia_assinaturas = self._cadeia_assinaturas
+        return vista
 
     def _carregar_sorteios(self) -> List[Dict[str, Any]]:
-        """Carrega todos os sorteios de arquivos JSON, ordenando-os por data."""
-        todos = []
+        """
+        Carrega os sorteios do jogo, ordenados por data, a partir do histórico compilado
+        (`dados/.compilado/<jogo>`), que só é reconstruído quando algum JSON de origem muda.
+        """
         if not os.path.exists(self.caminho_dados):
             print(f"Diretório '{self.caminho_dados}' não encontrado.")
             return []
-
-        for nome_arquivo in sorted(os.listdir(self.caminho_dados)):
-            if nome_arquivo.endswith('.json'):
-                caminho_completo = os.path.join(self.caminho_dados, nome_arquivo)
-                try:
-                    with open(caminho_completo, "r", encoding="utf-8") as f:
-                        dados = json.load(f)
-                    if isinstance(dados, dict):
-                        for sorteios_do_ano in dados.values():
-                            if isinstance(sorteios_do_ano, list):
-                                todos.extend(sorteios_do_ano)
-                    elif isinstance(dados, list):
-                        todos.extend(dados)
-                except (json.JSONDecodeError, FileNotFoundError) as e:
-                    print(f"Erro ao ler o arquivo {nome_arquivo}: {e}")
-                    
-        if todos:
-            sorteios_validos = [s for s in todos if isinstance(s, dict) and 'data' in s and 'numeros' in s]
-            sorteios_validos.sort(key=lambda s: datetime.datetime.strptime(s.get('data'), '%d/%m/%Y'))
-            return sorteios_validos
-        return []
+        return ArmazemSorteios(self.caminho_dados, self.jogo).carregar()
     
+    def resultados(self) -> ArmazemResultados:
+        """Resultados e tabelas de prémios do jogo, compilados a partir dos TXT de cada sorteio."""
+        return ArmazemResultados(self.caminho_dados, self.jogo)
+
     # Função auxiliar para verificar se um número é primo
     def _is_prime(self, n: int) -> bool:
         if n < 2:
@@ -58,301 +182,340 @@ class Dados:
                 return False
         return True
 
+    def _contar_por_faixas(self, limites: List[Tuple[int, int, int]]) -> Dict[int, int]:
+        """Conta as saídas em cada faixa de números, pela ordem de primeira aparição das faixas."""
+        incidencia = self.matriz.incidencia
+        contagens = {}
+        primeiras = {}
+        for chave, inicio, fim in limites:
+            faixa = incidencia[:, inicio - 1:fim]
+            contagem = int(faixa.sum())
+            if contagem:
+                contagens[chave] = contagem
+                primeiras[chave] = int(faixa.any(axis=1).argmax())
+
+        distribuicao = defaultdict(int)
+        for chave in sorted(contagens, key=lambda c: (primeiras[c], c)):
+            distribuicao[chave] = contagens[chave]
+        return distribuicao
+
+    # --- Intermediários partilhados entre cálculos ---
+    def _intermedio(self, nome: str) -> Any:
+        """Valor de um intermediário, calculado uma vez por histórico."""
+        if nome not in self._intermedios:
+            self._intermedios[nome] = getattr(self, f'_intermedio_{nome}')()
+        return self._intermedios[nome]
+
+    def _intermedio_matriz(self) -> MatrizSorteios:
+        return self.matriz
+
+    @depende_de('matriz')
+    def _intermedio_coocorrencias(self) -> Coocorrencias:
+        return self.coocorrencias
+
+    @depende_de('matriz')
+    def _intermedio_consecutivos(self) -> np.ndarray:
+        """consecutivos[:, k] indica se (k + 1, k + 2) saíram juntos em cada sorteio."""
+        incidencia = self.matriz.incidencia
+        return incidencia[:, :-1] & incidencia[:, 1:]
+
+    @depende_de('matriz')
+    def _intermedio_somas(self) -> np.ndarray:
+        """Soma dos números de cada sorteio."""
+        return self.matriz.somas
+
+    @depende_de('matriz')
+    def _intermedio_janelas(self) -> JanelasDeslizantes:
+        """Frequências e pares das janelas recentes (só lê os últimos sorteios)."""
+        return JanelasDeslizantes.de_incidencia(self.matriz.incidencia)
+
+    @depende_de('matriz')
+    def _intermedio_posicoes(self) -> np.ndarray:
+        """Números ordenados dos sorteios com o tamanho padrão (uma coluna por posição)."""
+        return self.matriz.posicoes[self.matriz.posicoes_validas]
+
     # --- Funções de Cálculo ---
+    @depende_de('matriz')
     def _calcular_frequencia_total(self) -> Counter:
         """Calcula a frequência total de todos os números."""
-        frequencia = Counter()
-        for sorteio in self.sorteios:
-            frequencia.update(sorteio['numeros'])
-        return frequencia
+        return self.matriz.contador(self.matriz.incidencia)
 
+    @depende_de('matriz')
     def _calcular_ausencia_atual(self) -> Dict[int, int]:
         """Calcula o tempo de ausência de cada número."""
-        ausencia = {}
-        todos_numeros = set(range(1, 50))
-        ultima_ocorrencia = {num: -1 for num in todos_numeros}
-        for i, sorteio in enumerate(self.sorteios):
-            for num in sorteio['numeros']:
-                ultima_ocorrencia[num] = i
-            
-        total_concursos = len(self.sorteios)
-        for num in todos_numeros:
-            ausencia[num] = total_concursos - ultima_ocorrencia[num] - 1
-        return ausencia
+        matriz = self.matriz
+        ultima_ocorrencia = matriz.ultima_linha(matriz.incidencia)
+        ausencia = matriz.total - ultima_ocorrencia - 1
+        return dict(zip(range(1, self.jogo.numero_maximo + 1), ausencia.tolist()))
 
+    @depende_de('matriz')
     def _calcular_gaps_medios(self) -> Dict[int, float]:
         """Calcula o gap médio entre as saídas de cada número."""
-        posicoes = defaultdict(list)
+        # A soma das diferenças entre saídas consecutivas é (última - primeira)
+        incidencia = self.matriz.incidencia
+        contagens = incidencia.sum(axis=0).tolist()
+        primeiras = self.matriz.primeira_linha(incidencia).tolist()
+        ultimas = self.matriz.ultima_linha(incidencia).tolist()
+
         gaps_medios = {}
-        todos_numeros = set(range(1, 50))
-        for i, sorteio in enumerate(self.sorteios):
-            for num in sorteio['numeros']:
-                posicoes[num].append(i)
-            
-        for num in todos_numeros:
-            concursos = posicoes.get(num, [])
-            if len(concursos) < 2:
+        for num in range(1, self.jogo.numero_maximo + 1):
+            contagem = contagens[num - 1]
+            if contagem < 2:
                 gaps_medios[num] = float('inf')
             else:
-                diferencas = [j - i for i, j in zip(concursos[:-1], concursos[1:])]
-                gaps_medios[num] = sum(diferencas) / len(diferencas)
+                gaps_medios[num] = (ultimas[num - 1] - primeiras[num - 1]) / (contagem - 1)
         return gaps_medios
 
-    def _calcular_frequencia_pares(self) -> Counter:
+    @depende_de('coocorrencias')
+    def _calcular_frequencia_pares(self) -> ContagemCombinacoes:
         """Calcula a frequência de todos os pares de números."""
-        frequencia_pares = Counter()
-        for sorteio in self.sorteios:
-            pares = combinations(sorted(sorteio['numeros']), 2)
-            frequencia_pares.update(pares)
-        return frequencia_pares
+        return self.coocorrencias.contagem(2)
 
-    def _calcular_frequencia_trios(self) -> Counter:
+    @depende_de('coocorrencias')
+    def _calcular_frequencia_trios(self) -> ContagemCombinacoes:
         """Calcula a frequência de todos os trios de números."""
-        frequencia_trios = Counter()
-        for sorteio in self.sorteios:
-            trios = combinations(sorted(sorteio['numeros']), 3)
-            frequencia_trios.update(trios)
-        return frequencia_trios
-        
-    def _calcular_frequencia_grupos(self) -> Counter:
+        return self.coocorrencias.contagem(3)
+
+    @depende_de('coocorrencias')
+    def _calcular_frequencia_grupos(self) -> ContagemCombinacoes:
         """
         Calcula a frequência de grupos de 2, 3 e 4 números.
         Isso é usado pela heurística de padrões de grupos.
         """
-        frequencia_grupos = Counter()
-        for sorteio in self.sorteios:
-            numeros = sorted(sorteio['numeros'])
-            for i in range(2, 5): # Grupos de tamanho 2, 3 e 4
-                grupos = combinations(numeros, i)
-                frequencia_grupos.update(grupos)
-        return frequencia_grupos
+        return self.coocorrencias.grupos()
 
+    @depende_de('janelas')
     def _calcular_frequencia_recente(self, janela=15) -> Counter:
         """Calcula a frequência dos números numa janela de tempo recente."""
-        janela_sorteios = self.sorteios[-janela:]
-        frequencia = Counter()
-        for sorteio in janela_sorteios:
-            frequencia.update(sorteio['numeros'])
-        return frequencia
+        return self._intermedio('janelas').frequencia(janela)
 
+    @depende_de('janelas')
+    def _calcular_frequencia_recente_janelas(self) -> PorJanela:
+        """Frequência dos números em cada janela registada (`[janela]` -> Counter)."""
+        return self._intermedio('janelas').frequencias()
+
+    @depende_de('posicoes')
     def _calcular_frequencia_por_posicao(self) -> Dict[int, Counter]:
         """Calcula a frequência de cada número por posição, com validação de dados."""
         frequencia_posicao = defaultdict(Counter)
         if not self.sorteios or not self.sorteios[0].get('numeros'):
             return frequencia_posicao
-            
-        num_posicoes = len(self.sorteios[0]['numeros'])
-        for sorteio in self.sorteios:
-            numeros = sorted(sorteio.get('numeros', []))
-            # Adicionando a validação para ignorar sorteios com número de números diferente do padrão
-            if len(numeros) != num_posicoes:
-                continue
-            for i, num in enumerate(numeros):
-                frequencia_posicao[i].update([num])
+
+        # Só os sorteios com o número de números padrão entram na matriz de posições
+        posicoes = self._intermedio('posicoes')
+        if posicoes.shape[0] == 0:
+            return frequencia_posicao
+        for i in range(posicoes.shape[1]):
+            valores, primeiras, contagens = np.unique(posicoes[:, i], return_index=True, return_counts=True)
+            ordem = np.argsort(primeiras, kind='stable')
+            frequencia_posicao[i] = Counter(dict(zip(valores[ordem].tolist(), contagens[ordem].tolist())))
         return frequencia_posicao
 
+    @depende_de('matriz')
     def _calcular_frequencia_terminacoes_padrao(self) -> Dict[int, Counter]:
         """Calcula a frequência de terminações após um determinado final de sorteio."""
         padrao = defaultdict(Counter)
-        if len(self.sorteios) < 2:
+        matriz = self.matriz
+        if matriz.total < 2:
             return padrao
-            
-        for i in range(len(self.sorteios) - 1):
-            numeros_atual = sorted(self.sorteios[i].get('numeros', []))
-            numeros_seguinte = sorted(self.sorteios[i+1].get('numeros', []))
-            terminacoes_atual = {num % 10 for num in numeros_atual}
-            terminacoes_seguinte = {num % 10 for num in numeros_seguinte}
-            
-            for term_atual in terminacoes_atual:
-                padrao[term_atual].update(terminacoes_seguinte)
-                
+
+        terminacoes = np.zeros((matriz.total, 10), dtype=bool)
+        for terminacao in range(10):
+            colunas = _mascaras_colunas(matriz.numero_maximo)['terminacao'][terminacao]
+            terminacoes[:, terminacao] = matriz.incidencia[:, colunas].any(axis=1)
+        atuais, seguintes = terminacoes[:-1], terminacoes[1:]
+        contagens = atuais.T.astype(np.int64) @ seguintes.astype(np.int64)
+
+        def terminacao(num):
+            return num % 10
+
+        # Chaves pela ordem de primeira aparição; empates na mesma linha seguem a ordem do set original
+        primeiras = matriz.primeira_linha(atuais).tolist()
+        chaves_atuais = [t for t in range(10) if primeiras[t] >= 0]
+        chaves_atuais.sort(key=lambda t: (primeiras[t], matriz.ordem_conjunto(primeiras[t], terminacao).index(t)))
+        for term_atual in chaves_atuais:
+            linhas = np.flatnonzero(atuais[:, term_atual])
+            primeiras_seguintes = linhas[seguintes[linhas].argmax(axis=0)]
+            chaves_seguintes = [t for t in range(10) if contagens[term_atual, t] > 0]
+            chaves_seguintes.sort(key=lambda t: (
+                primeiras_seguintes[t],
+                matriz.ordem_conjunto(int(primeiras_seguintes[t]) + 1, terminacao).index(t)
+            ))
+            padrao[term_atual] = Counter({t: int(contagens[term_atual, t]) for t in chaves_seguintes})
+
         return padrao
 
+    @depende_de('matriz', 'somas')
     def _calcular_numeros_soma_mais_frequente(self) -> List[int]:
         """
         Calcula o intervalo de soma mais comum (usando percentis) e retorna os números mais frequentes
         que saíram dentro desse intervalo.
         """
-        somas = [sum(s['numeros']) for s in self.sorteios if s.get('numeros')]
-        if not somas:
+        matriz = self.matriz
+        somas = self._intermedio('somas')
+        com_numeros = matriz.incidencia.any(axis=1)
+        if not com_numeros.any():
             return []
-            
+
         # Usa percentis para encontrar um intervalo mais robusto
-        soma_25_percentil = np.percentile(somas, 25)
-        soma_75_percentil = np.percentile(somas, 75)
-        
-        frequencia_intervalo = Counter()
-        for s in self.sorteios:
-            soma_sorteio = sum(s.get('numeros', []))
-            if soma_25_percentil <= soma_sorteio <= soma_75_percentil:
-                frequencia_intervalo.update(s['numeros'])
-            
+        soma_25_percentil, soma_75_percentil = np.percentile(somas[com_numeros], [25, 75])
+
+        no_intervalo = (somas >= soma_25_percentil) & (somas <= soma_75_percentil)
+        frequencia_intervalo = matriz.contador(matriz.incidencia[no_intervalo])
+
         return sorted(frequencia_intervalo.keys(), key=lambda k: frequencia_intervalo[k], reverse=True)
 
+    @depende_de('matriz')
     def _calcular_padrao_tipos_numeros(self) -> Counter:
         """
         Calcula a distribuição de frequência de padrões de pares, ímpares e primos.
         Retorna o Counter completo, com todos os padrões encontrados.
         """
-        padroes = Counter()
-        for sorteio in self.sorteios:
-            if not sorteio.get('numeros'):
-                continue
-            
-            numeros = sorteio['numeros']
-            contagem_pares = sum(1 for n in numeros if n % 2 == 0)
-            contagem_impares = sum(1 for n in numeros if n % 2 != 0)
-            contagem_primos = sum(1 for n in numeros if self._is_prime(n))
-            
-            padroes.update([(contagem_pares, contagem_impares, contagem_primos)])
-            
-        return padroes
+        incidencia = self.matriz.incidencia
+        com_numeros = incidencia.any(axis=1)
+        if not com_numeros.any():
+            return Counter()
+
+        incidencia = incidencia[com_numeros]
+        mascaras = _mascaras_colunas(self.matriz.numero_maximo)
+        tipos = np.column_stack([
+            incidencia[:, mascaras['pares']].sum(axis=1),
+            incidencia[:, ~mascaras['pares']].sum(axis=1),
+            incidencia[:, mascaras['primos']].sum(axis=1),
+        ])
+        padroes_unicos, primeiras, contagens = np.unique(tipos, axis=0, return_index=True, return_counts=True)
+        ordem = np.argsort(primeiras, kind='stable')
+
+        return Counter({
+            tuple(padroes_unicos[i].tolist()): int(contagens[i]) for i in ordem
+        })
 
     # --- NOVAS FUNÇÕES DE CÁLCULO PARA AS DEPENDÊNCIAS FALTANTES ---
+    @depende_de('matriz')
     def _calcular_distribuicao_quadrantes(self) -> Dict[int, int]:
-        """Calcula a frequência de números por quadrante (1-12, 13-24, 25-36, 37-49)."""
-        distribuicao = defaultdict(int)
-        for sorteio in self.sorteios:
-            for num in sorteio['numeros']:
-                if 1 <= num <= 12:
-                    distribuicao[1] += 1
-                elif 13 <= num <= 24:
-                    distribuicao[2] += 1
-                elif 25 <= num <= 36:
-                    distribuicao[3] += 1
-                else: # 37 <= num <= 49
-                    distribuicao[4] += 1
-        return distribuicao
+        """Calcula a frequência de números por quadrante (1-12, 13-24, 25-36, 37-49 no Totoloto)."""
+        return self._contar_por_faixas(self.jogo.limites_quadrantes)
 
+    @depende_de('matriz', 'consecutivos')
     def _calcular_frequencia_vizinhos(self) -> Dict[int, Counter]:
         """
         Calcula a frequência de cada número ter um de seus vizinhos sorteado,
         distinguindo o vizinho (-1 ou +1).
         """
         frequencia_vizinhos = defaultdict(Counter)
-        for sorteio in self.sorteios:
-            numeros_sorteados = set(sorteio.get('numeros', []))
-            for num in numeros_sorteados:
-                if (num - 1) in numeros_sorteados:
-                    frequencia_vizinhos[num][num - 1] += 1
-                if (num + 1) in numeros_sorteados:
-                    frequencia_vizinhos[num][num + 1] += 1
+        matriz = self.matriz
+        consecutivos = self._intermedio('consecutivos')
+        contagens = consecutivos.sum(axis=0).tolist()
+        primeiras = matriz.primeira_linha(consecutivos).tolist()
+
+        # Para cada número: (linha, vizinho, contagem) de cada vizinho que já saiu com ele
+        vizinhos = {}
+        for k, primeira in enumerate(primeiras):
+            if primeira < 0:
+                continue
+            menor, maior = k + 1, k + 2
+            vizinhos.setdefault(menor, []).append((primeira, 1, maior, contagens[k]))
+            vizinhos.setdefault(maior, []).append((primeira, 0, menor, contagens[k]))
+
+        # Ordem de inserção original: linha da primeira aparição e, na mesma linha, ordem do set
+        chaves = sorted(vizinhos, key=lambda num: (
+            min(vizinhos[num])[0], matriz.ordem_conjunto(min(vizinhos[num])[0]).index(num)
+        ))
+        for num in chaves:
+            frequencia_vizinhos[num] = Counter({vizinho: contagem for _, _, vizinho, contagem in sorted(vizinhos[num])})
         return frequencia_vizinhos
 
-    def _calcular_pares_recentes(self) -> Counter:
+    @depende_de('janelas')
+    def _calcular_pares_recentes(self, janela=20) -> ContagemCombinacoes:
         """Calcula a frequência de pares de números nos últimos 20 sorteios."""
-        janela_sorteios = self.sorteios[-20:]
-        frequencia_pares = Counter()
-        for sorteio in janela_sorteios:
-            pares = combinations(sorted(sorteio['numeros']), 2)
-            frequencia_pares.update(pares)
-        return frequencia_pares
+        return self._intermedio('janelas').pares(janela)
+
+    @depende_de('janelas')
+    def _calcular_pares_recentes_janelas(self) -> PorJanela:
+        """Frequência dos pares em cada janela registada (`[janela]` -> contagem de pares)."""
+        return self._intermedio('janelas').todos_pares()
 
+    @depende_de('matriz', 'consecutivos')
     def _calcular_frequencia_pares_consecutivos(self) -> Counter:
         """Calcula a frequência de pares de números consecutivos (ex: 5 e 6)."""
-        frequencia = Counter()
-        for sorteio in self.sorteios:
-            numeros = sorted(sorteio['numeros'])
-            for i in range(len(numeros) - 1):
-                if numeros[i+1] == numeros[i] + 1:
-                    frequencia[(numeros[i], numeros[i+1])] += 1
-        return frequencia
+        consecutivos = self._intermedio('consecutivos')
+        contagens = consecutivos.sum(axis=0).tolist()
+        primeiras = self.matriz.primeira_linha(consecutivos).tolist()
+        chaves = sorted((k for k in range(len(contagens)) if contagens[k]), key=lambda k: (primeiras[k], k))
+        return Counter({(k + 1, k + 2): contagens[k] for k in chaves})
 
+    @depende_de('posicoes')
     def _calcular_precisao_posicional_historica(self) -> Dict[int, float]:
         """Calcula a precisão média de cada posição do sorteio, de forma otimizada."""
         if not self.sorteios:
             return {}
 
-        num_posicoes = len(self.sorteios[0].get('numeros', []))
-        if num_posicoes == 0:
+        posicoes = self._intermedio('posicoes')
+        if posicoes.shape[1] == 0 or posicoes.shape[0] == 0:
             return {}
-        
-        somas_por_posicao = defaultdict(int)
-        # Adiciona um contador para os sorteios válidos
-        contagem_sorteios_validos = 0
-        
-        for sorteio in self.sorteios:
-            numeros_sorteio = sorted(sorteio.get('numeros', []))
-            if len(numeros_sorteio) != num_posicoes:
-                continue
-            
-            contagem_sorteios_validos += 1
-            for i, num in enumerate(numeros_sorteio):
-                somas_por_posicao[i] += num
-        
-        if contagem_sorteios_validos == 0:
-            return {}
-            
-        media_posicoes = {
-            i: somas_por_posicao[i] / contagem_sorteios_validos
-            for i in range(num_posicoes)
-        }
-        
-        precisao_por_posicao = defaultdict(list)
-        for sorteio in self.sorteios:
-            numeros = sorted(sorteio.get('numeros', []))
-            if len(numeros) != num_posicoes:
-                continue
-            for i, num in enumerate(numeros):
-                precisao = abs(num - media_posicoes[i])
-                precisao_por_posicao[i].append(precisao)
 
-        medias_precisao = {pos: np.mean(vals) for pos, vals in precisao_por_posicao.items()}
-        
+        contagem_sorteios_validos = posicoes.shape[0]
+        somas_por_posicao = posicoes.sum(axis=0, dtype=np.int64).tolist()
+
+        medias_precisao = {}
+        for i, soma in enumerate(somas_por_posicao):
+            media_posicao = soma / contagem_sorteios_validos
+            medias_precisao[i] = np.mean(np.abs(posicoes[:, i] - media_posicao))
+
         return medias_precisao
 
+    @depende_de('matriz')
     def _calcular_frequencia_por_ano(self) -> Dict[int, Counter]:
         """Calcula a frequência de números por ano."""
         frequencia_anual = defaultdict(Counter)
-        for sorteio in self.sorteios:
-            ano = datetime.datetime.strptime(sorteio['data'], '%d/%m/%Y').year
-            frequencia_anual[ano].update(sorteio['numeros'])
+        anos = self.matriz.anos
+        valores, primeiras = np.unique(anos, return_index=True)
+        for ano in valores[np.argsort(primeiras, kind='stable')].tolist():
+            frequencia_anual[ano] = self.matriz.contador(self.matriz.incidencia[anos == ano])
         return frequencia_anual
 
+    @depende_de('matriz')
     def _calcular_distribuicao_dezenas(self) -> Dict[int, int]:
         """Calcula a frequência de números por dezena (1-10, 11-20, etc.)."""
-        distribuicao = defaultdict(int)
-        for sorteio in self.sorteios:
-            for num in sorteio['numeros']:
-                if num == 0:
-                    continue
-                dezena = (num - 1) // 10 + 1
-                distribuicao[dezena] += 1
-        return distribuicao
+        return self._contar_por_faixas(self.jogo.limites_dezenas)
 
-    def _calcular_trios_frequentes(self) -> Counter:
+    @depende_de('coocorrencias')
+    def _calcular_trios_frequentes(self) -> ContagemCombinacoes:
         """Calcula a frequência de todos os trios de números (alternativa)."""
-        frequencia_trios = Counter()
-        for sorteio in self.sorteios:
-            trios = combinations(sorted(sorteio['numeros']), 3)
-            frequencia_trios.update(trios)
-        return frequencia_trios
+        # Partilha as contagens de `frequencia_trios`
+        return self.coocorrencias.contagem(3)
 
+    @depende_de('matriz')
     def _calcular_probabilidades_repeticoes(self) -> Dict[int, float]:
         """Calcula a probabilidade de um número se repetir no sorteio seguinte, dado que saiu no anterior."""
         probabilidades = defaultdict(float)
-        if len(self.sorteios) < 2:
+        matriz = self.matriz
+        if matriz.total < 2:
             return {}
 
-        ocorrencias = defaultdict(int)
-        saidas_anteriores = defaultdict(int)
+        anteriores, atuais = matriz.incidencia[:-1], matriz.incidencia[1:]
+        saidas_anteriores = anteriores.sum(axis=0).tolist()
+        ocorrencias = (anteriores & atuais).sum(axis=0).tolist()
+        primeiras = matriz.primeira_linha(anteriores).tolist()
 
-        for i in range(1, len(self.sorteios)):
-            numeros_anteriores = set(self.sorteios[i-1]['numeros'])
-            numeros_atuais = set(self.sorteios[i]['numeros'])
+        # Mesma ordem de chaves que a contagem sorteio a sorteio sobre os sets originais
+        numeros = range(1, self.jogo.numero_maximo + 1)
+        chaves = sorted((num for num in numeros if saidas_anteriores[num - 1] > 0), key=lambda num: (
+            primeiras[num - 1], matriz.ordem_conjunto(primeiras[num - 1]).index(num)
+        ))
 
-            for num in numeros_anteriores:
-                saidas_anteriores[num] += 1
-                if num in numeros_atuais:
-                    ocorrencias[num] += 1
-        
         # Calcula a probabilidade para cada número
-        for num in saidas_anteriores:
-            if saidas_anteriores[num] > 0:
-                probabilidades[num] = ocorrencias[num] / saidas_anteriores[num]
-        
+        for num in chaves:
+            probabilidades[num] = ocorrencias[num - 1] / saidas_anteriores[num - 1]
+
         return probabilidades
 
+    @depende_de('matriz')
+    def _calcular_frequencia_especial(self) -> Counter:
+        """Calcula a frequência das bolas especiais (número da sorte, estrelas, nº de sonho)."""
+        return self.matriz.contador(self.matriz.especiais)
+
+    @depende_de('matriz')
     def _calcular_frequencia_por_ciclo(self) -> Dict[str, Any]:
         """
         Calcula a frequência de cada número em blocos de 10 sorteios.
@@ -363,54 +526,248 @@ class Dados:
             return frequencia_por_ciclo
 
         tamanho_bloco = 10
-        blocos_de_frequencia = []
-        
-        # Itera sobre os sorteios em blocos de 10
-        for i in range(0, len(self.sorteios), tamanho_bloco):
-            bloco = self.sorteios[i:i + tamanho_bloco]
-            if not bloco:
-                continue
-            
-            frequencia_bloco = Counter()
-            for sorteio in bloco:
-                frequencia_bloco.update(sorteio.get('numeros', []))
-            
-            blocos_de_frequencia.append(frequencia_bloco)
-        
-        frequencia_por_ciclo['blocos_de_10'] = blocos_de_frequencia
-        
+        frequencia_por_ciclo['blocos_de_10'] = self.matriz.contadores_por_blocos(self.matriz.incidencia, tamanho_bloco)
+
         return frequencia_por_ciclo
 
     # --- Lógica de Mapeamento e Obtenção de Estatísticas ---
     def _get_mapeamento_calculos(self) -> Dict[str, callable]:
         """Mapeia automaticamente nomes de estatísticas para funções de cálculo internas."""
-        mapeamento = {}
-        for name, obj in inspect.getmembers(self, predicate=inspect.ismethod):
-            if name.startswith('_calcular_'):
-                estatistica_name = name.replace('_calcular_', '')
-                mapeamento[estatistica_name] = obj
-        return mapeamento
-
-    def obter_estatisticas(self, dependencias: set) -> Tuple[Dict[str, Any], List[str]]:
+        cls = type(self)
+        if cls.__dict__.get('_nomes_calculos') is None:
+            funcoes = inspect.getmembers(cls, predicate=inspect.isfunction)
+            cls._nomes_calculos = [name for name, _ in funcoes if name.startswith('_calcular_')]
+            # Estatísticas e intermediários, com as entradas declaradas em `@depende_de`
+            cls._grafo = GrafoEstatisticas({
+                name.replace('_calcular_', '').replace('_intermedio_', ''): getattr(funcao, '_entradas', ())
+                for name, funcao in funcoes if name.startswith(('_calcular_', '_intermedio_'))
+            })
+        return {name.replace('_calcular_', ''): getattr(self, name) for name in cls._nomes_calculos}
+
+    def _nos_disponiveis(self) -> set:
+        """Estatísticas e intermediários já calculados para este histórico."""
+        disponiveis = set(self._estatisticas_cache) | set(self._intermedios)
+        if self._matriz is not None:
+            disponiveis.add('matriz')
+        if self._coocorrencias is not None:
+            disponiveis.add('coocorrencias')
+        return disponiveis
+
+    def obter_estatisticas(self, dependencias: set, max_threads: int = 0) -> Tuple[Dict[str, Any], List[str]]:
         """
         Calcula e retorna apenas as estatísticas necessárias, juntamente com uma lista de erros.
+
+        O planeador calcula, por ordem topológica, só os nós (estatísticas e intermediários
+        partilhados, como a matriz de incidência ou as tabelas de pares) de que os pedidos
+        dependem. Com `max_threads > 1` os ramos independentes correm em paralelo. Os tempos
+        de cada nó ficam em `tempos_calculo`.
+
+        Os resultados ficam memorizados na instância até o histórico ser substituído e, com a
+        cache persistente ativa, são partilhados entre processos.
         """
         estatisticas = {}
         erros = []
-        for dep in dependencias:
-            if dep in self.mapeamento_calculos:
-                try:
+        dependencias = list(dependencias)
+        em_falta = [dep for dep in dependencias
+                    if dep not in self._estatisticas_cache and dep in self.mapeamento_calculos]
+        chaves = {}
+        if self.cache_persistente is not None and em_falta:
+            chaves = {dep: self._chave_cache(dep) for dep in em_falta}
+            guardados = self.cache_persistente.obter_varios(list(chaves.values()))
+            for dep, chave in chaves.items():
+                if chave in guardados:
+                    self._estatisticas_cache[dep] = guardados[chave]
+            em_falta = [dep for dep in em_falta if dep not in self._estatisticas_cache]
+
+        falhas = {}
+
+        def calcular(no: str):
+            try:
+                if no in self.mapeamento_calculos:
                     # Chamada do método da classe
-                    estatisticas[dep] = self.mapeamento_calculos[dep]()
-                except Exception as e:
-                    erros.append(f"Erro ao calcular a estatística '{dep}': {e}")
-                    estatisticas[dep] = {}
+                    self._estatisticas_cache[no] = self.mapeamento_calculos[no]()
+                else:
+                    self._intermedio(no)
+            except Exception as e:
+                falhas[no] = e
+
+        niveis = type(self)._grafo.planear(em_falta, self._nos_disponiveis())
+        self.tempos_calculo = type(self)._grafo.executar(niveis, calcular, max_threads)
+
+        novos = []
+        for dep in dependencias:
+            if dep in self._estatisticas_cache:
+                estatisticas[dep] = self._estatisticas_cache[dep]
+                if dep in chaves and dep in em_falta:
+                    novos.append((chaves[dep], dep, estatisticas[dep]))
+            elif dep in self.mapeamento_calculos:
+                erros.append(f"Erro ao calcular a estatística '{dep}': {falhas.get(dep)}")
+                estatisticas[dep] = {}
             else:
                 erros.append(f"Função de cálculo para '{dep}' não encontrada.")
                 estatisticas[dep] = {}
-            
+
+        if novos:
+            self.cache_persistente.guardar_varios(novos)
+        return estatisticas, erros
+
+    # --- Cache Persistente ---
+    def assinatura(self) -> str:
+        """
+        Hash do conjunto de sorteios (datas e números, por ordem). As assinaturas de
+        todos os prefixos são calculadas numa só passagem e partilhadas pelas vistas.
+        """
+        if self._cadeia_assinaturas is None:
+            base = self._sorteios._base if isinstance(self._sorteios, VistaSorteios) else self._sorteios
+            resumo = hashlib.sha256()
+            cadeia = [resumo.hexdigest()]
+            for sorteio in base:
+                resumo.update(repr((sorteio.get('data'), sorteio.get('numeros'))).encode('utf-8'))
+                cadeia.append(resumo.hexdigest())
+            self._cadeia_assinaturas = cadeia
+        return self._cadeia_assinaturas[len(self._sorteios)]
+
+    def _parametros_calculo(self, nome: str) -> Dict[str, Any]:
+        """Valores por omissão dos parâmetros de `_calcular_<nome>` (ex.: `janela`)."""
+        assinatura = inspect.signature(getattr(type(self), f'_calcular_{nome}'))
+        return {
+            parametro.name: parametro.default for parametro in assinatura.parameters.values()
+            if parametro.default is not inspect.Parameter.empty
+        }
+
+    def _versao_calculo(self, nome: str) -> str:
+        """
+        Hash do código de `_calcular_<nome>` e dos módulos inteiros de que os cálculos
+        dependem (este, `lib.jogos` e os módulos de cálculo): assim também os auxiliares
+        (`_contar_por_faixas`, os `_intermedio_*`, `_mascaras_colunas`, ...) entram na versão.
+        """
+        partes = []
+        modulos = (sys.modules[__name__], inspect.getmodule(obter_jogo), inspect.getmodule(MatrizSorteios),
+                   inspect.getmodule(Coocorrencias), inspect.getmodule(JanelasDeslizantes))
+        for objeto in (getattr(type(self), f'_calcular_{nome}'), *modulos):
+            try:
+                partes.append(inspect.getsource(objeto))
+            except (OSError, TypeError):
+                partes.append(getattr(getattr(objeto, '__code__', None), 'co_code', b'').hex())
+        return hashlib.sha256('\n'.join(partes).encode('utf-8')).hexdigest()
+
+    def _chave_cache(self, nome: str) -> str:
+        """Chave da estatística `nome` sobre este histórico na cache persistente."""
+        cls = type(self)
+        if (cls, nome) not in Dados._versoes_calculos:
+            Dados._versoes_calculos[(cls, nome)] = (self._parametros_calculo(nome), self._versao_calculo(nome))
+        parametros, versao = Dados._versoes_calculos[(cls, nome)]
+        return CacheEstatisticas.gerar_chave(
+            self.assinatura(), nome, dict(parametros, jogo=self.jogo.nome), versao
+        )
+
+    def impressao_estatisticas(self, dependencias) -> str:
+        """
+        Impressão digital das estatísticas `dependencias` sobre este histórico, obtida
+        sem as calcular: combina as chaves de conteúdo de cada uma (histórico, jogo,
+        parâmetros e versão do código). Serve de chave a resultados que só dependem delas.
+        """
+        partes = sorted(
+            self._chave_cache(dep) if dep in self.mapeamento_calculos else f"sem_calculo:{dep}"
+            for dep in set(dependencias)
+        )
+        return hashlib.sha256('\n'.join(partes).encode('utf-8')).hexdigest()
+
+    # --- Estatísticas em lote (vários momentos de uma vez) ---
+    @depende_de('matriz')
+    def _intermedio_acumulada(self) -> np.ndarray:
+        """acumulada[i]: contagem de cada número nos primeiros `i` sorteios (total + 1 linhas)."""
+        incidencia = self.matriz.incidencia
+        acumulada = np.zeros((incidencia.shape[0] + 1, incidencia.shape[1]), dtype=np.int32)
+        np.cumsum(incidencia, axis=0, out=acumulada[1:])
+        return acumulada
+
+    @staticmethod
+    def _ordem_lote(contagens: np.ndarray, primeiras: np.ndarray) -> np.ndarray:
+        """Posição de cada número na ordem (primeira linha, número) dos presentes; ausentes ficam no fim."""
+        colunas = contagens.shape[1]
+        chaves = primeiras * colunas + np.arange(colunas)
+        posicoes = np.argsort(np.argsort(chaves, axis=1, kind='stable'), axis=1, kind='stable')
+        return np.where(contagens > 0, posicoes, colunas)
+
+    def _lote_frequencia_total(self, indices: np.ndarray) -> ContagensLote:
+        contagens = self._intermedio('acumulada')[indices]
+        # Num prefixo, a primeira aparição de cada número é a do histórico completo
+        primeiras = np.broadcast_to(self.matriz.proxima_ocorrencia(self.matriz.incidencia)[0], contagens.shape)
+        return ContagensLote(contagens, self._ordem_lote(contagens, primeiras))
+
+    def _lote_frequencia_recente(self, indices: np.ndarray, janela=15) -> ContagensLote:
+        acumulada = self._intermedio('acumulada')
+        inicios = np.maximum(indices - janela, 0)
+        contagens = acumulada[indices] - acumulada[inicios]
+        primeiras = self.matriz.proxima_ocorrencia(self.matriz.incidencia)[inicios]
+        return ContagensLote(contagens, self._ordem_lote(contagens, primeiras))
+
+    def _lote_ausencia_atual(self, indices: np.ndarray) -> np.ndarray:
+        anteriores = self.matriz.ocorrencia_anterior(self.matriz.incidencia)[indices]
+        return indices[:, np.newaxis] - anteriores - 1
+
+    def _lote_gaps_medios(self, indices: np.ndarray) -> np.ndarray:
+        incidencia = self.matriz.incidencia
+        contagens = self._intermedio('acumulada')[indices]
+        primeiras = self.matriz.primeira_linha(incidencia)
+        ultimas = self.matriz.ocorrencia_anterior(incidencia)[indices]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gaps = (ultimas - primeiras) / (contagens - 1)
+        return np.where(contagens >= 2, gaps, np.inf)
+
+    def obter_estatisticas_lote(self, dependencias: set, indices) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Calcula estatísticas para vários momentos do histórico numa só passagem. Cada
+        índice `i` corresponde a `ate(i)` (os primeiros `i` sorteios) e cada estatística
+        vem como array com uma linha por índice e uma coluna por número:
+
+        - `Counter` (`frequencia_total`, `frequencia_recente`) -> `ContagensLote`;
+        - `{num: valor}` (`ausencia_atual`, `gaps_medios`) -> `np.ndarray` T x máximo.
+
+        As estatísticas sem versão em lote são devolvidas na lista de erros.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        total = len(self.sorteios)
+        if indices.ndim != 1 or ((indices < 0) | (indices > total)).any():
+            raise ValueError(f"Índices inválidos: devem estar entre 0 e {total}.")
+
+        estatisticas = {}
+        erros = []
+        for dep in dependencias:
+            calcular = getattr(self, f'_lote_{dep}', None)
+            if calcular is None:
+                erros.append(f"A estatística '{dep}' não tem cálculo em lote.")
+                continue
+            try:
+                estatisticas[dep] = calcular(indices)
+            except Exception as e:
+                erros.append(f"Erro ao calcular a estatística '{dep}' em lote: {e}")
         return estatisticas, erros
 
+    # --- Modo Incremental (walk-forward) ---
+    def estatisticas_incrementais(self, ate: int = 0) -> EstatisticasIncrementais:
+        """Cria um motor incremental já alimentado com os primeiros `ate` sorteios."""
+        return EstatisticasIncrementais(self.sorteios[:ate], jogo=self.jogo)
+
+    def percorrer_prefixos(self, dependencias: set, inicio: int = 0,
+                           fim: int = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Percorre o histórico em modo walk-forward. Para cada índice `i` em [inicio, fim)
+        devolve `(i, estatisticas)`, com as estatísticas calculadas sobre `sorteios[:i+1]`.
+
+        As estatísticas são atualizadas incrementalmente, pelo que o percurso completo
+        custa uma única passagem pelo histórico. Os objetos devolvidos só são válidos
+        até à iteração seguinte.
+        """
+        if fim is None:
+            fim = len(self.sorteios)
+        motor = self.estatisticas_incrementais(inicio)
+        for i in range(inicio, fim):
+            motor.adicionar_sorteio(self.sorteios[i])
+            estatisticas, _ = motor.obter_estatisticas(dependencias)
+            yield i, estatisticas
+
     def obter_resumo_calculos_com_metadados(self) -> Dict[str, Dict[str, Any]]:
         """
         Retorna um resumo das funções de cálculo disponíveis, com descrições
@@ -441,6 +798,10 @@ class Dados:
                 "descricao": "Frequência dos números considerando apenas uma janela dos últimos sorteios.",
                 "logica_principais": ["frequencia", "recente", "tendencia"]
             },
+            "frequencia_recente_janelas": {
+                "descricao": "Frequência dos números em várias janelas recentes (5, 10, 15, 20, 50 e 100 sorteios).",
+                "logica_principais": ["frequencia", "recente", "janelas"]
+            },
             "frequencia_por_posicao": {
                 "descricao": "Frequência de cada número por posição no sorteio.",
                 "logica_principais": ["posicao", "frequencia", "historico"]
@@ -465,6 +826,10 @@ class Dados:
                 "descricao": "Frequência dos pares de números nos últimos concursos.",
                 "logica_principais": ["pares", "recente", "tendencia"]
             },
+            "pares_recentes_janelas": {
+                "descricao": "Frequência dos pares de números em várias janelas recentes.",
+                "logica_principais": ["pares", "recente", "janelas"]
+            },
             "frequencia_pares_consecutivos": {
                 "descricao": "Frequência de pares consecutivos (ex: 5 e 6).",
                 "logica_principais": ["pares", "consecutivos", "sequencias"]
@@ -489,48 +854,12 @@ class Dados:
                 "descricao": "Desvio médio entre os números sorteados e a média histórica da sua posição.",
                 "logica_principais": ["precisao", "posicao", "historico"]
             },
+            "frequencia_especial": {
+                "descricao": "Frequência das bolas especiais (número da sorte, estrelas ou nº de sonho).",
+                "logica_principais": ["especial", "frequencia", "historico"]
+            },
             "frequencia_grupos": {
                 "descricao": "Frequência de grupos de 2, 3 e 4 números que já saíram juntos.",
                 "logica_principais": ["grupos", "combinacoes", "frequencia"]
             }
         }
-
-    # --- Lógica de Cache (ajustada para a classe) ---
-    def _preparar_para_salvar(self, obj):
-        if isinstance(obj, Counter):
-            return {"__counter__": dict(obj)}
-        if isinstance(obj, dict):
-            return {k: self._preparar_para_salvar(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._preparar_para_salvar(item) for item in obj]
-        return obj
-
-    def _reconstruir_de_cache(self, obj):
-        if isinstance(obj, dict):
-            if "__counter__" in obj:
-                return Counter(obj["__counter__"])
-            return {k: self._reconstruir_de_cache(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._reconstruir_de_cache(item) for item in obj]
-        return obj
-
-    def salvar_cache(self, estatisticas: Dict[str, Any], caminho: str = ARQUIVO_CACHE_ESTATISTICAS):
-        """Salva as estatísticas calculadas em um arquivo JSON com suporte para estruturas aninhadas."""
-        try:
-            stats_serializaveis = self._preparar_para_salvar(estatisticas)
-            with open(caminho, 'w', encoding='utf-8') as f:
-                json.dump(stats_serializaveis, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Erro ao salvar as estatísticas: {e}")
-
-    def carregar_cache(self, caminho: str = ARQUIVO_CACHE_ESTATISTICAS) -> Dict[str, Any]:
-        """Carrega as estatísticas de um arquivo JSON com suporte para estruturas aninhadas."""
-        if not os.path.exists(caminho):
-            return None
-        try:
-            with open(caminho, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-            return self._reconstruir_de_cache(stats)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"Erro ao carregar o arquivo de estatísticas: {e}")
-            return None
@@ -2,64 +2,81 @@
 
 import os
 import sys
-import importlib
-from typing import Dict, Any, List, Set
+import time
+import hashlib
+import inspect
+from typing import Dict, Any, List, Set, Iterable
+
+from lib import pontuacoes
+from lib.armazem_sorteios import PASTA_COMPILADA
+from lib.cache_previsoes import CachePrevisoes, ARQUIVO_CACHE_PREVISOES
+from lib.manifesto_heuristicas import ManifestoHeuristicas, HeuristicasPreguicosas
+from lib.perfil_heuristicas import PerfilHeuristicas
+from lib.pontuacoes import sugestoes_de_pontuacoes, sugestoes_em_lote
 
 # Adiciona o diretório-pai (raiz do projeto) ao caminho para garantir que as importações funcionem
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+# As previsões por pontuação dependem também do código de `lib/pontuacoes.py`
+_VERSAO_PONTUACOES = hashlib.sha1(inspect.getsource(pontuacoes).encode('utf-8')).hexdigest()
+
 class Despachante:
     """
     Gerencia o carregamento dinâmico de todas as heurísticas e orquestra
     o cálculo de estatísticas e a geração de previsões.
     """
-    def __init__(self, pasta_heuristicas: str = 'heuristicas'):
+    def __init__(self, pasta_heuristicas: str = 'heuristicas', usar_cache_previsoes: bool = False):
+        """
+        Args:
+            pasta_heuristicas: pasta (relativa à raiz do projeto) com as heurísticas.
+            usar_cache_previsoes: reutiliza as previsões já calculadas por outros
+                processos em `get_previsoes_para` (cache SQLite em `dados/.compilado`).
+        """
         self.pasta_heuristicas = os.path.join(PROJECT_ROOT, pasta_heuristicas)
-        self.heuristicas: Dict[str, Any] = {}
+        self.heuristicas: Dict[str, Any] = HeuristicasPreguicosas(self.pasta_heuristicas)
         self.metadados: Dict[str, Dict[str, Any]] = {}
+        # Latência e erros de cada heurística (ver `PerfilHeuristicas`)
+        self.perfil = PerfilHeuristicas()
+        self.cache_previsoes = None
+        if usar_cache_previsoes:
+            self.cache_previsoes = CachePrevisoes(
+                os.path.join(PROJECT_ROOT, 'dados', PASTA_COMPILADA, ARQUIVO_CACHE_PREVISOES)
+            )
         self._carregar_heuristicas()
 
     def _carregar_heuristicas(self):
         """
-        Carrega todas as classes de heurísticas da pasta especificada.
+        Regista todas as heurísticas da pasta especificada a partir do manifesto
+        (`ManifestoHeuristicas`). Cada módulo só é importado quando a heurística
+        é usada pela primeira vez.
         """
         if not os.path.exists(self.pasta_heuristicas):
             print(f"Erro: Pasta '{self.pasta_heuristicas}' não encontrada.")
             return
 
-        sys.path.insert(0, self.pasta_heuristicas)
-
-        for file_name in os.listdir(self.pasta_heuristicas):
-            if file_name.endswith('.py') and file_name != '__init__.py':
-                module_name = file_name[:-3]
-                try:
-                    module = importlib.import_module(module_name)
-                    
-                    # Procura dinamicamente pela classe correta no módulo
-                    for name, obj in module.__dict__.items():
-                        # A CORREÇÃO: Garante que a classe é definida no próprio módulo e não é uma importação
-                        if isinstance(obj, type) and obj.__module__ == module.__name__ and name[0].isupper():
-                            heuristica_classe = obj
-                            instance = heuristica_classe()
-                            nome_heuristica = getattr(instance, 'NOME', module_name)
-                            
-                            self.heuristicas[nome_heuristica] = instance
-                            self.metadados[nome_heuristica] = {
-                                'descricao': getattr(instance, 'DESCRICAO', 'N/A'),
-                                'dependencias': getattr(instance, 'DEPENDENCIAS', []),
-                                'modulo': module_name, # CORREÇÃO: Adiciona o nome do módulo
-                                'funcao': 'prever' # CORREÇÃO: Adiciona o nome da função de previsão
-                            }
-                            print(f"✅ Heurística '{nome_heuristica}' carregada com sucesso.")
-                            break
-                    
-                except Exception as e:
-                    # Mensagem de erro mais detalhada
-                    print(f"❌ Erro ao carregar a heurística '{module_name}'. Detalhes: {e}")
-        
-        sys.path.pop(0)
+        for entrada in ManifestoHeuristicas(self.pasta_heuristicas).entradas().values():
+            module_name = entrada['modulo']
+            if 'erro' in entrada:
+                # Mensagem de erro mais detalhada
+                print(f"❌ Erro ao carregar a heurística '{module_name}'. Detalhes: {entrada['erro']}")
+                continue
+            if entrada['classe'] is None:
+                continue
+
+            nome_heuristica = entrada['nome']
+            self.heuristicas.registar(nome_heuristica, module_name, entrada['classe'])
+            self.metadados[nome_heuristica] = {
+                'descricao': entrada['descricao'],
+                'dependencias': entrada['dependencias'],
+                'modulo': module_name, # CORREÇÃO: Adiciona o nome do módulo
+                'funcao': 'prever', # CORREÇÃO: Adiciona o nome da função de previsão
+                'lote': 'prever_lote' in entrada['metodos'],
+                # Versão do código que produz a previsão (chave da cache de previsões)
+                'versao': entrada['sha1'] + (f":{_VERSAO_PONTUACOES}" if 'pontuar' in entrada['metodos'] else '')
+            }
+            print(f"✅ Heurística '{nome_heuristica}' carregada com sucesso.")
 
     def obter_metadados(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -76,14 +93,87 @@ class Despachante:
             todas_dependencias.update(meta['dependencias'])
         return todas_dependencias
 
-    def get_previsoes(self, estatisticas: Dict[str, Any], n: int = 5) -> Dict[str, List[int]]:
+    def get_previsoes(self, estatisticas: Dict[str, Any], n: int = 5,
+                      nomes: Iterable[str] = None) -> Dict[str, List[int]]:
         """
-        Gera previsões para todas as heurísticas carregadas.
+        Gera previsões para todas as heurísticas carregadas (ou só para `nomes`).
+
+        As heurísticas que sabem pontuar os números (`pontuar`) são escolhidas pelo vetor
+        de pontuações; as restantes usam `prever`.
         """
         previsoes = {}
-        for nome, heuristica in self.heuristicas.items():
+        heuristicas = self.heuristicas.items() if nomes is None else [
+            (nome, self.heuristicas[nome]) for nome in nomes if nome in self.heuristicas
+        ]
+        for nome, heuristica in heuristicas:
+            erro = None
+            inicio = time.perf_counter()
             try:
-                previsoes[nome] = heuristica.prever(estatisticas, n)
+                if hasattr(heuristica, 'pontuar'):
+                    previsoes[nome] = sugestoes_de_pontuacoes(heuristica.pontuar(estatisticas), n)
+                else:
+                    previsoes[nome] = heuristica.prever(estatisticas, n)
             except Exception as e:
+                erro = f"{type(e).__name__}: {e}"
                 print(f"❌ Erro ao gerar previsão para a heurística '{nome}': {e}")
+            self.perfil.registar(nome, time.perf_counter() - inicio, erro, self.metadados.get(nome, {}).get('dependencias', ()))
+        return previsoes
+
+    def get_previsoes_para(self, dados, n: int = 5, estatisticas: Dict[str, Any] = None,
+                           nomes: Iterable[str] = None) -> Dict[str, List[int]]:
+        """
+        Gera as previsões de todas as heurísticas sobre o histórico `dados` (ex.: `dados.ate(k)`).
+
+        Com a cache de previsões ativa, as heurísticas cujas previsões já foram calculadas
+        (por esta ou por outra ferramenta) não voltam a correr, e as estatísticas só são
+        calculadas para as restantes. `estatisticas` pode trazer as estatísticas deste
+        histórico, quando o chamador já as tem (ex.: `Dados.percorrer_prefixos`).
+        Com `nomes`, só essas heurísticas são consideradas.
+        """
+        if self.cache_previsoes is None:
+            if estatisticas is None:
+                estatisticas, _ = dados.obter_estatisticas(self.obter_todas_dependencias())
+            return self.get_previsoes(estatisticas, n, nomes)
+        nomes = self.heuristicas if nomes is None else [nome for nome in nomes if nome in self.heuristicas]
+        return self.cache_previsoes.obter_ou_calcular(
+            dados, {nome: self.metadados[nome] for nome in nomes}, n,
+            lambda nomes, estatisticas: self.get_previsoes(estatisticas, n, nomes), estatisticas
+        )
+
+    def get_previsoes_lote(self, dados, indices: Iterable[int], n: int = 5) -> Dict[str, List[List[int]]]:
+        """
+        Gera previsões de todas as heurísticas para vários momentos do histórico.
+        Cada índice `i` corresponde a `dados.ate(i)`; devolve `{heuristica: [previsão por índice]}`.
+
+        As heurísticas com `prever_lote` recebem as estatísticas de todos os momentos em
+        arrays (`Dados.obter_estatisticas_lote`) e pontuam-nos numa só chamada. As outras,
+        e as que dependam de estatísticas sem versão em lote, usam `prever` em cada momento.
+        """
+        indices = list(indices)
+        lote = {nome: h for nome, h in self.heuristicas.items() if hasattr(h, 'prever_lote')}
+        dependencias_lote = {dep for nome in lote for dep in self.metadados[nome]['dependencias']}
+        estatisticas_lote, _ = dados.obter_estatisticas_lote(dependencias_lote, indices)
+
+        previsoes = {}
+        for nome, heuristica in lote.items():
+            if not all(dep in estatisticas_lote for dep in self.metadados[nome]['dependencias']):
+                continue
+            try:
+                previsoes[nome] = sugestoes_em_lote(heuristica.prever_lote(estatisticas_lote), n)
+            except Exception as e:
+                print(f"❌ Erro ao gerar previsões em lote para a heurística '{nome}': {e}")
+
+        restantes = {nome: h for nome, h in self.heuristicas.items() if nome not in previsoes}
+        if restantes:
+            dependencias = {dep for nome in restantes for dep in self.metadados[nome]['dependencias']}
+            for nome in restantes:
+                previsoes[nome] = []
+            for i in indices:
+                estatisticas, _ = dados.ate(i).obter_estatisticas(dependencias)
+                for nome, heuristica in restantes.items():
+                    try:
+                        previsoes[nome].append(heuristica.prever(estatisticas, n))
+                    except Exception as e:
+                        print(f"❌ Erro ao gerar previsão para a heurística '{nome}': {e}")
+                        previsoes[nome].append([])
         return previsoes
@@ -2,8 +2,7 @@
 
 import os
 import sys
-import importlib
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Iterable
 import json
 import datetime
 
@@ -12,6 +11,12 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from lib.armazem_sorteios import PASTA_COMPILADA
+from lib.cache_previsoes import CachePrevisoes, ARQUIVO_CACHE_PREVISOES
+from lib.executor_heuristicas import ExecutorHeuristicas, TIMEOUT_PADRAO
+from lib.manifesto_heuristicas import ManifestoHeuristicas, HeuristicasPreguicosas
+from lib.perfil_heuristicas import PerfilHeuristicas
+
 # NOVO: Importar o gerador de heurísticas dinâmicas
 try:
     from lib.gerador_heuristicas_dinamicas import GeradorHeuristicasDinamicas, HeuristicaDinamica
@@ -34,15 +39,31 @@ class Despachante:
     e orquestra o cálculo de estatísticas e a geração de previsões.
     """
     
-    def __init__(self, pasta_heuristicas: str = 'heuristicas', usar_dinamicas: bool = True):
+    def __init__(self, pasta_heuristicas: str = 'heuristicas', usar_dinamicas: bool = True,
+                 modo_execucao: str = 'auto', max_workers: int = None,
+                 timeout_heuristica: float = TIMEOUT_PADRAO, usar_cache_previsoes: bool = False):
         self.pasta_heuristicas = os.path.join(PROJECT_ROOT, pasta_heuristicas)
-        self.heuristicas: Dict[str, Any] = {}
+        self.heuristicas: Dict[str, Any] = HeuristicasPreguicosas(self.pasta_heuristicas)
         self.metadados: Dict[str, Dict[str, Any]] = {}
         
         # NOVO: Sistema de heurísticas dinâmicas
         self.usar_dinamicas = usar_dinamicas and GERADOR_DISPONIVEL
         self.gerador_dinamicas = GeradorHeuristicasDinamicas() if self.usar_dinamicas else None
         self.heuristicas_dinamicas: Dict[str, Any] = {}
+
+        # Execução paralela das heurísticas, com tempo máximo por heurística
+        self.executor = ExecutorHeuristicas(
+            modo_execucao, max_workers, timeout_heuristica, caminhos=[self.pasta_heuristicas, PROJECT_ROOT]
+        )
+        # Latência e erros de cada heurística, a partir dos tempos do executor
+        self.perfil = PerfilHeuristicas()
+
+        # Cache persistente das previsões (só heurísticas fixas, versionadas pelo ficheiro)
+        self.cache_previsoes = None
+        if usar_cache_previsoes:
+            self.cache_previsoes = CachePrevisoes(
+                os.path.join(PROJECT_ROOT, 'dados', PASTA_COMPILADA, ARQUIVO_CACHE_PREVISOES)
+            )
         
         # NOVO: Configurações
         self.num_heuristicas_dinamicas = 20
@@ -62,52 +83,42 @@ class Despachante:
 
     def _carregar_heuristicas_fixas(self):
         """
-        Carrega todas as classes de heurísticas FIXAS da pasta especificada.
+        Regista todas as heurísticas FIXAS da pasta especificada a partir do manifesto
+        (`ManifestoHeuristicas`). Cada módulo só é importado quando a heurística é usada.
         """
         if not os.path.exists(self.pasta_heuristicas):
             print(f"❌ Erro: Pasta '{self.pasta_heuristicas}' não encontrada.")
             return
 
-        sys.path.insert(0, self.pasta_heuristicas)
-
         heuristicas_carregadas = 0
-        for file_name in os.listdir(self.pasta_heuristicas):
-            if file_name.endswith('.py') and file_name != '__init__.py':
-                module_name = file_name[:-3]
-                try:
-                    module = importlib.import_module(module_name)
-                    
-                    # Procura dinamicamente pela classe correta no módulo
-                    for name, obj in module.__dict__.items():
-                        if isinstance(obj, type) and obj.__module__ == module.__name__ and name[0].isupper():
-                            heuristica_classe = obj
-                            instance = heuristica_classe()
-                            nome_heuristica = getattr(instance, 'NOME', module_name)
-                            
-                            # Verificar se a heurística tem o método prever
-                            if not hasattr(instance, 'prever'):
-                                print(f"⚠️  Heurística '{nome_heuristica}' não tem método 'prever'. Ignorando.")
-                                continue
-                            
-                            self.heuristicas[nome_heuristica] = instance
-                            self.metadados[nome_heuristica] = {
-                                'descricao': getattr(instance, 'DESCRICAO', 'N/A'),
-                                'dependencias': getattr(instance, 'DEPENDENCIAS', []),
-                                'modulo': module_name,
-                                'funcao': 'prever',
-                                'tipo': 'fixa',  # NOVO: identificar tipo
-                                'data_carregamento': datetime.datetime.now().isoformat()
-                            }
-                            heuristicas_carregadas += 1
-                            print(f"✅ Heurística FIXA '{nome_heuristica}' carregada com sucesso.")
-                            break
-                    else:
-                        print(f"⚠️  Nenhuma classe válida encontrada em {module_name}")
-                    
-                except Exception as e:
-                    print(f"❌ Erro ao carregar a heurística fixa '{module_name}'. Detalhes: {e}")
-        
-        sys.path.pop(0)
+        for entrada in ManifestoHeuristicas(self.pasta_heuristicas).entradas().values():
+            module_name = entrada['modulo']
+            if 'erro' in entrada:
+                print(f"❌ Erro ao carregar a heurística fixa '{module_name}'. Detalhes: {entrada['erro']}")
+                continue
+            if entrada['classe'] is None:
+                print(f"⚠️  Nenhuma classe válida encontrada em {module_name}")
+                continue
+
+            nome_heuristica = entrada['nome']
+            # Verificar se a heurística tem o método prever
+            if 'prever' not in entrada['metodos']:
+                print(f"⚠️  Heurística '{nome_heuristica}' não tem método 'prever'. Ignorando.")
+                continue
+
+            self.heuristicas.registar(nome_heuristica, module_name, entrada['classe'])
+            self.metadados[nome_heuristica] = {
+                'descricao': entrada['descricao'],
+                'dependencias': entrada['dependencias'],
+                'modulo': module_name,
+                'funcao': 'prever',
+                'tipo': 'fixa',  # NOVO: identificar tipo
+                'versao': entrada['sha1'],
+                'data_carregamento': datetime.datetime.now().isoformat()
+            }
+            heuristicas_carregadas += 1
+            print(f"✅ Heurística FIXA '{nome_heuristica}' carregada com sucesso.")
+
         print(f"📦 Total de heurísticas fixas carregadas: {heuristicas_carregadas}")
 
     def _carregar_heuristicas_dinamicas(self, quantidade: int = None):
@@ -139,7 +150,9 @@ class Despachante:
                 'tipo': 'dinamica',  # NOVO: identificar tipo
                 'logica': heuristica.logica,  # NOVO: salvar a lógica usada
                 'data_carregamento': datetime.datetime.now().isoformat(),
-                'versao': '1.0'
+                # Sem versão do código: a mesma lógica pode mudar sob o mesmo nome,
+                # pelo que as previsões não entram na cache nem no tensor de previsões
+                'versao': None
             }
             
             print(f"✅ Heurística DINÂMICA '{nome}' carregada com sucesso.")
@@ -161,38 +174,79 @@ class Despachante:
             todas_dependencias.update(meta['dependencias'])
         return todas_dependencias
 
-    def get_previsoes(self, estatisticas: Dict[str, Any], n: int = 5) -> Dict[str, List[int]]:
+    def get_previsoes(self, estatisticas: Dict[str, Any], n: int = 5,
+                      nomes: Iterable[str] = None) -> Dict[str, List[int]]:
         """
-        Gera previsões para todas as heurísticas carregadas (fixas + dinâmicas).
+        Gera previsões para todas as heurísticas carregadas (fixas + dinâmicas), ou só para `nomes`.
+
+        As heurísticas correm no `executor` (em paralelo, conforme `modo_execucao`); uma
+        heurística que falha ou excede `timeout_heuristica` conta como falha sem parar as outras.
         """
         previsoes = {}
         previsoes_sucesso = 0
         previsoes_falha = 0
         
-        print(f"🔍 Gerando previsões para {len(self.heuristicas)} heurísticas...")
+        # Só as heurísticas pedidas são importadas (o mapeamento carrega-as a pedido);
+        # as que falham ao carregar ficam de fora, como em `items()`
+        if nomes is None:
+            heuristicas = dict(self.heuristicas.items())
+        else:
+            heuristicas = {}
+            for nome in nomes:
+                heuristica = self.heuristicas.get(nome)
+                if heuristica is not None:
+                    heuristicas[nome] = heuristica
+
+        print(f"🔍 Gerando previsões para {len(heuristicas)} heurísticas...")
         
-        for nome, heuristica in self.heuristicas.items():
-            try:
-                resultado = heuristica.prever(estatisticas, n)
+        resultados, erros = self.executor.executar(heuristicas, estatisticas, n)
+        for nome in heuristicas:
+            duracao = self.executor.tempos.get(nome, 0.0)
+            dependencias = self.metadados.get(nome, {}).get('dependencias', ())
+            if nome in erros:
+                print(f"❌ Erro ao gerar previsão para a heurística '{nome}': {erros[nome]}")
+                self.perfil.registar(nome, duracao, erros[nome], dependencias)
+                previsoes_falha += 1
+                continue
+
+            resultado = resultados[nome]
+            # Validar resultado
+            if (isinstance(resultado, list) and 
+                len(resultado) == n and 
+                all(isinstance(x, int) and 1 <= x <= 49 for x in resultado)):
                 
-                # Validar resultado
-                if (isinstance(resultado, list) and 
-                    len(resultado) == n and 
-                    all(isinstance(x, int) and 1 <= x <= 49 for x in resultado)):
-                    
-                    previsoes[nome] = resultado
-                    previsoes_sucesso += 1
-                else:
-                    print(f"⚠️  Previsão inválida de '{nome}': {resultado}")
-                    previsoes_falha += 1
-                    
-            except Exception as e:
-                print(f"❌ Erro ao gerar previsão para a heurística '{nome}': {e}")
+                previsoes[nome] = resultado
+                previsoes_sucesso += 1
+                self.perfil.registar(nome, duracao, None, dependencias)
+            else:
+                print(f"⚠️  Previsão inválida de '{nome}': {resultado}")
+                self.perfil.registar(nome, duracao, "PrevisaoInvalida: resultado fora do formato", dependencias)
                 previsoes_falha += 1
         
         print(f"📊 Previsões: {previsoes_sucesso} sucesso, {previsoes_falha} falha")
         return previsoes
 
+    def get_previsoes_para(self, dados, n: int = 5, estatisticas: Dict[str, Any] = None,
+                           nomes: Iterable[str] = None) -> Dict[str, List[int]]:
+        """
+        Gera as previsões de todas as heurísticas sobre o histórico `dados` (ex.: `dados.ate(k)`).
+
+        Com a cache de previsões ativa, as heurísticas fixas já calculadas (por esta ou
+        por outra ferramenta) não voltam a correr e as estatísticas só são calculadas para
+        as restantes. `estatisticas` pode trazer as estatísticas deste histórico, quando
+        o chamador já as tem (ex.: `Dados.percorrer_prefixos`).
+        Com `nomes`, só essas heurísticas são consideradas.
+        """
+        if self.cache_previsoes is None:
+            if estatisticas is None:
+                estatisticas, _ = dados.obter_estatisticas(self.obter_todas_dependencias())
+            return self.get_previsoes(estatisticas, n, nomes)
+        nomes = self.heuristicas if nomes is None else [nome for nome in nomes if nome in self.heuristicas]
+        return self.cache_previsoes.obter_ou_calcular(
+            dados, {nome: self.metadados[nome] for nome in nomes}, n,
+            lambda nomes, estatisticas: self.get_previsoes(estatisticas, n, nomes), estatisticas
+        )
+
     # ==================== NOVOS MÉTODOS PARA HEURÍSTICAS DINÂMICAS ====================
 
     def reavaliar_heuristicas_dinamicas(self, dados_manager, forcar_reatreinamento: bool = False):
@@ -257,7 +311,8 @@ class Despachante:
                     'tipo': 'dinamica_otimizada',
                     'logica': heuristica.logica,
                     'data_otimizacao': datetime.datetime.now().isoformat(),
-                    'versao': '2.0',
+                    # Como em `_carregar_heuristicas_dinamicas`: fora da cache e do tensor
+                    'versao': None,
                     'desempenho': {
                         'score': desempenho_info.get('score', 0),
                         'taxa_acerto': desempenho_info.get('taxa_acerto', 0),
@@ -364,6 +419,7 @@ class Despachante:
             'estatisticas_gerais': estatisticas,
             'heuristicas_por_tipo': {},
             'dependencias_completas': list(self.obter_todas_dependencias()),
+            'perfil_heuristicas': self.perfil.resumo(),
             'timestamp': datetime.datetime.now().isoformat()
         }
         
@@ -449,14 +505,22 @@ class Despachante:
         
         print("✅ Recarregamento completo concluído")
 
+    def fechar(self):
+        """
+        Termina os processos de trabalho do executor de heurísticas e fecha a cache de previsões
+        """
+        self.executor.fechar()
+        if self.cache_previsoes is not None:
+            self.cache_previsoes.fechar()
+
 
 # Função de utilidade para uso rápido
-def criar_despachante_otimizado() -> Despachante:
+def criar_despachante_otimizado(usar_cache_previsoes: bool = False) -> Despachante:
     """
     Cria um despachante pré-otimizado com heurísticas dinâmicas
     """
     print("🚀 Criando despachante otimizado...")
-    despachante = Despachante(usar_dinamicas=True)
+    despachante = Despachante(usar_dinamicas=True, usar_cache_previsoes=usar_cache_previsoes)
     
     # Tentar otimização inicial se houver dados
     try:
@@ -0,0 +1,328 @@
+# lib/estatisticas_incrementais.py
+
+import bisect
+import datetime
+import inspect
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Tuple, Iterable
+
+from lib.coocorrencias import Coocorrencias, ContagemCombinacoes
+from lib.janelas_deslizantes import JanelasDeslizantes, JANELAS_PADRAO, PorJanela
+from lib.jogos import JOGO_PADRAO, obter_jogo
+
+
+class EstatisticasIncrementais:
+    """
+    Mantém as estatísticas de `Dados` atualizadas sorteio a sorteio.
+
+    Cada chamada a `adicionar_sorteio` atualiza o estado interno em tempo
+    constante (as janelas recentes usam buffers circulares), pelo que um
+    percurso walk-forward sobre todo o histórico custa uma única passagem em vez
+    de um recálculo completo por prefixo.
+
+    Os resultados de `obter_estatisticas` são iguais aos de `Dados.obter_estatisticas`
+    para o mesmo prefixo. As estruturas devolvidas são partilhadas com o estado
+    interno: são válidas até ao próximo `adicionar_sorteio` e não devem ser alteradas.
+    """
+
+    JANELA_RECENTE = 15
+    JANELA_PARES_RECENTES = 20
+    TAMANHO_BLOCO_CICLO = 10
+
+    def __init__(self, sorteios: Iterable[Dict[str, Any]] = (), janelas: Iterable[int] = JANELAS_PADRAO,
+                 jogo: str = JOGO_PADRAO):
+        self.jogo = obter_jogo(jogo)
+        self.total_sorteios = 0
+        self._ultimo_sorteio = None
+        self._numeros = range(1, self.jogo.numero_maximo + 1)
+        self._quadrante = {
+            num: chave for chave, inicio, fim in self.jogo.limites_quadrantes for num in range(inicio, fim + 1)
+        }
+
+        self._frequencia_total = Counter()
+        self._ultima_ocorrencia = {num: -1 for num in self._numeros}
+        self._primeira_ocorrencia = {}
+        self._coocorrencias = Coocorrencias(numero_maximo=self.jogo.numero_maximo)
+        self._janelas = JanelasDeslizantes(
+            set(janelas) | {self.JANELA_RECENTE, self.JANELA_PARES_RECENTES}, self.jogo.numero_maximo
+        )
+        self._frequencia_especial = Counter()
+        self._num_posicoes = None
+        self._frequencia_posicao = defaultdict(Counter)
+        self._terminacoes_padrao = defaultdict(Counter)
+        self._somas_ordenadas = []
+        self._numeros_por_soma = {}
+        self._padrao_tipos = Counter()
+        self._distribuicao_quadrantes = defaultdict(int)
+        self._frequencia_vizinhos = defaultdict(Counter)
+        self._frequencia_consecutivos = Counter()
+        self._valores_posicao = defaultdict(Counter)
+        self._sorteios_posicionais_validos = 0
+        self._frequencia_anual = defaultdict(Counter)
+        self._distribuicao_dezenas = defaultdict(int)
+        self._ocorrencias_repeticao = defaultdict(int)
+        self._saidas_anteriores = defaultdict(int)
+        self._blocos_ciclo = []
+
+        self.mapeamento_calculos = self._get_mapeamento_calculos()
+
+        for sorteio in sorteios:
+            self.adicionar_sorteio(sorteio)
+
+    @staticmethod
+    def _is_prime(n: int) -> bool:
+        if n < 2:
+            return False
+        for i in range(2, int(n**0.5) + 1):
+            if n % i == 0:
+                return False
+        return True
+
+    # --- Atualização ---
+    def adicionar_sorteio(self, sorteio: Dict[str, Any]):
+        """Acrescenta um sorteio ao fim do histórico e atualiza todas as estatísticas."""
+        indice = self.total_sorteios
+        numeros = sorteio.get('numeros', [])
+        numeros_ordenados = sorted(numeros)
+        anterior = self._ultimo_sorteio
+
+        # Frequências, ausências e gaps
+        self._frequencia_total.update(numeros)
+        for num in numeros:
+            self._primeira_ocorrencia.setdefault(num, indice)
+            self._ultima_ocorrencia[num] = indice
+
+        # Combinações
+        self._coocorrencias.adicionar(numeros_ordenados)
+
+        # Janelas recentes
+        self._janelas.adicionar(numeros)
+
+        # Posições
+        if self._num_posicoes is None:
+            self._num_posicoes = len(numeros)
+        if self._num_posicoes and len(numeros_ordenados) == self._num_posicoes:
+            self._sorteios_posicionais_validos += 1
+            for i, num in enumerate(numeros_ordenados):
+                self._frequencia_posicao[i].update([num])
+                self._valores_posicao[i][num] += 1
+
+        # Terminações e repetições (dependem do sorteio anterior)
+        if anterior is not None:
+            numeros_anteriores = sorted(anterior.get('numeros', []))
+            terminacoes_atual = {num % 10 for num in numeros_anteriores}
+            terminacoes_seguinte = {num % 10 for num in numeros_ordenados}
+            for term_atual in terminacoes_atual:
+                self._terminacoes_padrao[term_atual].update(terminacoes_seguinte)
+
+            conjunto_anterior = set(anterior['numeros'])
+            conjunto_atual = set(sorteio['numeros'])
+            for num in conjunto_anterior:
+                self._saidas_anteriores[num] += 1
+                if num in conjunto_atual:
+                    self._ocorrencias_repeticao[num] += 1
+
+        # Somas
+        if numeros:
+            soma = sum(numeros)
+            bisect.insort(self._somas_ordenadas, soma)
+            contagem, primeira = self._numeros_por_soma.setdefault(soma, (Counter(), {}))
+            contagem.update(numeros)
+            for posicao, num in enumerate(numeros):
+                primeira.setdefault(num, (indice, posicao))
+
+            contagem_pares = sum(1 for n in numeros if n % 2 == 0)
+            contagem_impares = sum(1 for n in numeros if n % 2 != 0)
+            contagem_primos = sum(1 for n in numeros if self._is_prime(n))
+            self._padrao_tipos.update([(contagem_pares, contagem_impares, contagem_primos)])
+
+        # Distribuições e vizinhança
+        for num in numeros:
+            # Números fora do intervalo contam no último quadrante, como no cálculo original
+            self._distribuicao_quadrantes[self._quadrante.get(num, 4)] += 1
+            if num != 0:
+                self._distribuicao_dezenas[(num - 1) // 10 + 1] += 1
+
+        numeros_sorteados = set(numeros)
+        for num in numeros_sorteados:
+            if (num - 1) in numeros_sorteados:
+                self._frequencia_vizinhos[num][num - 1] += 1
+            if (num + 1) in numeros_sorteados:
+                self._frequencia_vizinhos[num][num + 1] += 1
+
+        for i in range(len(numeros_ordenados) - 1):
+            if numeros_ordenados[i + 1] == numeros_ordenados[i] + 1:
+                self._frequencia_consecutivos[(numeros_ordenados[i], numeros_ordenados[i + 1])] += 1
+
+        # Ano e ciclos
+        ano = datetime.datetime.strptime(sorteio['data'], '%d/%m/%Y').year
+        self._frequencia_anual[ano].update(numeros)
+
+        if indice % self.TAMANHO_BLOCO_CICLO == 0:
+            self._blocos_ciclo.append(Counter())
+        self._blocos_ciclo[-1].update(numeros)
+
+        # Bolas especiais
+        especiais = sorteio.get('especiais') or ([sorteio['especial']] if 'especial' in sorteio else [])
+        self._frequencia_especial.update(sorted(
+            bola for bola in especiais if isinstance(bola, int) and 1 <= bola <= self.jogo.especial_maximo
+        ))
+
+        self._ultimo_sorteio = sorteio
+        self.total_sorteios += 1
+
+    # --- Leitura das estatísticas ---
+    def _obter_frequencia_total(self) -> Counter:
+        return self._frequencia_total
+
+    def _obter_ausencia_atual(self) -> Dict[int, int]:
+        total = self.total_sorteios
+        return {num: total - self._ultima_ocorrencia[num] - 1 for num in set(self._numeros)}
+
+    def _obter_gaps_medios(self) -> Dict[int, float]:
+        gaps_medios = {}
+        for num in set(self._numeros):
+            ocorrencias = self._frequencia_total.get(num, 0)
+            if ocorrencias < 2:
+                gaps_medios[num] = float('inf')
+            else:
+                intervalo = self._ultima_ocorrencia[num] - self._primeira_ocorrencia[num]
+                gaps_medios[num] = intervalo / (ocorrencias - 1)
+        return gaps_medios
+
+    def _obter_frequencia_pares(self) -> ContagemCombinacoes:
+        return self._coocorrencias.contagem(2)
+
+    def _obter_frequencia_trios(self) -> ContagemCombinacoes:
+        return self._coocorrencias.contagem(3)
+
+    def _obter_trios_frequentes(self) -> ContagemCombinacoes:
+        return self._coocorrencias.contagem(3)
+
+    def _obter_frequencia_grupos(self) -> ContagemCombinacoes:
+        return self._coocorrencias.grupos()
+
+    def _obter_frequencia_recente(self) -> Counter:
+        return self._janelas.frequencia(self.JANELA_RECENTE)
+
+    def _obter_frequencia_recente_janelas(self) -> PorJanela:
+        return self._janelas.frequencias()
+
+    def _obter_frequencia_por_posicao(self) -> Dict[int, Counter]:
+        return self._frequencia_posicao
+
+    def _obter_frequencia_terminacoes_padrao(self) -> Dict[int, Counter]:
+        return self._terminacoes_padrao
+
+    def _percentil(self, percentil: float) -> float:
+        """Percentil com interpolação linear, equivalente a `np.percentile`."""
+        valores = self._somas_ordenadas
+        posicao = (len(valores) - 1) * percentil / 100
+        inferior = int(posicao)
+        if inferior + 1 >= len(valores):
+            return float(valores[inferior])
+        fracao = posicao - inferior
+        return valores[inferior] + (valores[inferior + 1] - valores[inferior]) * fracao
+
+    def _obter_numeros_soma_mais_frequente(self) -> List[int]:
+        if not self._somas_ordenadas:
+            return []
+
+        soma_25_percentil = self._percentil(25)
+        soma_75_percentil = self._percentil(75)
+
+        frequencia_intervalo = Counter()
+        primeira_ocorrencia = {}
+        for soma, (contagem, primeira) in self._numeros_por_soma.items():
+            if soma_25_percentil <= soma <= soma_75_percentil:
+                frequencia_intervalo.update(contagem)
+                for num, ordem in primeira.items():
+                    if num not in primeira_ocorrencia or ordem < primeira_ocorrencia[num]:
+                        primeira_ocorrencia[num] = ordem
+
+        # Mantém o desempate por ordem de aparição do cálculo completo
+        por_aparicao = sorted(frequencia_intervalo, key=primeira_ocorrencia.__getitem__)
+        return sorted(por_aparicao, key=lambda k: frequencia_intervalo[k], reverse=True)
+
+    def _obter_padrao_tipos_numeros(self) -> Counter:
+        return self._padrao_tipos
+
+    def _obter_distribuicao_quadrantes(self) -> Dict[int, int]:
+        return self._distribuicao_quadrantes
+
+    def _obter_frequencia_vizinhos(self) -> Dict[int, Counter]:
+        return self._frequencia_vizinhos
+
+    def _obter_pares_recentes(self) -> ContagemCombinacoes:
+        return self._janelas.pares(self.JANELA_PARES_RECENTES)
+
+    def _obter_pares_recentes_janelas(self) -> PorJanela:
+        return self._janelas.todos_pares()
+
+    def _obter_frequencia_pares_consecutivos(self) -> Counter:
+        return self._frequencia_consecutivos
+
+    def _obter_precisao_posicional_historica(self) -> Dict[int, float]:
+        if not self._num_posicoes or self._sorteios_posicionais_validos == 0:
+            return {}
+
+        medias_precisao = {}
+        validos = self._sorteios_posicionais_validos
+        for pos, valores in self._valores_posicao.items():
+            media = sum(num * vezes for num, vezes in valores.items()) / validos
+            desvio = sum(abs(num - media) * vezes for num, vezes in valores.items())
+            medias_precisao[pos] = desvio / validos
+        return medias_precisao
+
+    def _obter_frequencia_por_ano(self) -> Dict[int, Counter]:
+        return self._frequencia_anual
+
+    def _obter_distribuicao_dezenas(self) -> Dict[int, int]:
+        return self._distribuicao_dezenas
+
+    def _obter_probabilidades_repeticoes(self) -> Dict[int, float]:
+        if self.total_sorteios < 2:
+            return {}
+
+        probabilidades = defaultdict(float)
+        for num, saidas in self._saidas_anteriores.items():
+            if saidas > 0:
+                probabilidades[num] = self._ocorrencias_repeticao[num] / saidas
+        return probabilidades
+
+    def _obter_frequencia_especial(self) -> Counter:
+        return self._frequencia_especial
+
+    def _obter_frequencia_por_ciclo(self) -> Dict[str, Any]:
+        if not self.total_sorteios:
+            return {}
+        return {'blocos_de_10': list(self._blocos_ciclo)}
+
+    # --- Interface igual à de Dados ---
+    def _get_mapeamento_calculos(self) -> Dict[str, callable]:
+        """Mapeia os nomes das estatísticas para os métodos de leitura `_obter_*`."""
+        mapeamento = {}
+        for name, obj in inspect.getmembers(self, predicate=inspect.ismethod):
+            if name.startswith('_obter_'):
+                mapeamento[name.replace('_obter_', '')] = obj
+        return mapeamento
+
+    def obter_estatisticas(self, dependencias: set) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Devolve as estatísticas pedidas para o histórico acumulado até agora,
+        juntamente com uma lista de erros, tal como `Dados.obter_estatisticas`.
+        """
+        estatisticas = {}
+        erros = []
+        for dep in dependencias:
+            if dep in self.mapeamento_calculos:
+                try:
+                    estatisticas[dep] = self.mapeamento_calculos[dep]()
+                except Exception as e:
+                    erros.append(f"Erro ao calcular a estatística '{dep}': {e}")
+                    estatisticas[dep] = {}
+            else:
+                erros.append(f"Função de cálculo para '{dep}' não encontrada.")
+                estatisticas[dep] = {}
+
+        return estatisticas, erros
@@ -0,0 +1,273 @@
+# lib/executor_heuristicas.py
+
+import os
+import sys
+import time
+import pickle
+import signal
+import tempfile
+import threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Tuple
+
+MODOS = ('auto', 'sequencial', 'threads', 'processos')
+
+# Tempo máximo, em segundos, de cada chamada a `prever`
+TIMEOUT_PADRAO = 30.0
+
+# Memória partilhada do sistema (tmpfs) quando existe; senão a pasta temporária
+_PASTA_PARTILHADA = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class TempoEsgotado(Exception):
+    """A heurística excedeu o tempo máximo de execução."""
+
+
+def com_limite(funcao, timeout: float):
+    """
+    Executa `funcao()` interrompendo-a com `TempoEsgotado` ao fim de `timeout` segundos.
+    Usa um temporizador do sistema (SIGALRM), pelo que só atua na thread principal
+    de sistemas Unix; nos restantes casos a função corre sem limite.
+
+    Pode ser usada dentro de outra chamada com limite (ex.: cada função de uma
+    heurística dentro do limite da heurística): o temporizador exterior é retomado
+    no fim e, se expirar primeiro, é ele que interrompe a função.
+    """
+    if (not timeout or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        return funcao()
+    exterior = signal.getitimer(signal.ITIMER_REAL)[0]
+    if exterior and exterior <= timeout:
+        return funcao()
+
+    def expirar(signum, frame):
+        raise TempoEsgotado(f"tempo esgotado ({timeout:g}s)")
+
+    anterior = signal.signal(signal.SIGALRM, expirar)
+    inicio = time.monotonic()
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return funcao()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, anterior)
+        if exterior:
+            signal.setitimer(signal.ITIMER_REAL, max(exterior - (time.monotonic() - inicio), 1e-6))
+
+
+def recolher_com_prazo(tarefas: Dict[Any, Any], timeout: float, rondas: int) -> Tuple[Dict[Any, Any], Dict[Any, Exception]]:
+    """
+    Resultados `{chave: resultado}` e erros `{chave: exceção}` de tarefas de uma pool
+    de processos (`apply_async`) que correm em `rondas` rondas de no máximo `timeout`
+    segundos cada. Cada processo interrompe a sua tarefa com `com_limite`; o prazo
+    global só apanha tarefas bloqueadas em código que não responde ao sinal, que ficam
+    com `mp.TimeoutError` (a pool deve então ser recriada). Sem `timeout` não há prazo.
+    """
+    prazo = time.monotonic() + timeout * (rondas + 1) + 5.0 if timeout else None
+    resultados, erros = {}, {}
+    for chave, tarefa in tarefas.items():
+        try:
+            restante = None if prazo is None else max(prazo - time.monotonic(), 0.0)
+            resultados[chave] = tarefa.get(restante)
+        except Exception as e:
+            erros[chave] = e
+    return resultados, erros
+
+
+def _executar(heuristica, estatisticas: Dict[str, Any], n: int, timeout: float) -> Tuple[Any, str, float]:
+    """Corre uma heurística isolando as falhas: devolve (resultado, erro, duração)."""
+    inicio = time.perf_counter()
+    try:
+        resultado = com_limite(lambda: heuristica.prever(estatisticas, n), timeout)
+        return resultado, None, time.perf_counter() - inicio
+    except TempoEsgotado as e:
+        return None, str(e), time.perf_counter() - inicio
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - inicio
+
+
+# --- Estado dos processos de trabalho ---
+_heuristicas_worker: Dict[str, Any] = {}
+_estatisticas_worker: Tuple[str, Dict[str, Any]] = (None, None)
+
+
+def _iniciar_worker(heuristicas: bytes, caminhos: List[str]):
+    """Recebe as heurísticas uma vez por processo (já herdadas com `fork`)."""
+    global _heuristicas_worker
+    for caminho in reversed(caminhos):
+        if caminho not in sys.path:
+            sys.path.insert(0, caminho)
+    _heuristicas_worker = pickle.loads(heuristicas)
+
+
+def _executar_no_worker(nome: str, arquivo: str, n: int, timeout: float) -> Tuple[Any, str, float]:
+    """
+    Corre a heurística `nome`. As estatísticas são lidas do ficheiro partilhado
+    uma só vez por chamada a `executar` em cada processo, não uma vez por tarefa.
+    """
+    global _estatisticas_worker
+    if _estatisticas_worker[0] != arquivo:
+        with open(arquivo, 'rb') as f:
+            _estatisticas_worker = (arquivo, pickle.load(f))
+    return _executar(_heuristicas_worker[nome], _estatisticas_worker[1], n, timeout)
+
+
+class ExecutorHeuristicas:
+    """
+    Executa as heurísticas de um Despachante em paralelo, com um tempo máximo por
+    heurística e isolamento de falhas: uma heurística que rebenta ou não termina
+    fica registada nos erros e não interrompe as restantes.
+
+    Modos:
+    - 'sequencial': uma a uma, no processo atual;
+    - 'threads': pool de threads; as estatísticas são partilhadas diretamente.
+      Uma heurística que excede o tempo é abandonada (a thread não pode ser parada);
+    - 'processos': pool de processos persistente, que escala com os núcleos. As
+      heurísticas passam para os processos uma vez (herdadas com `fork`) e as
+      estatísticas de cada chamada são serializadas uma só vez para memória
+      partilhada. Um processo bloqueado é terminado e a pool recriada;
+    - 'auto': 'processos' em máquinas com vários núcleos, senão 'sequencial'.
+
+    Os tempos de cada heurística ficam em `tempos`, como em `Dados.tempos_calculo`.
+    """
+
+    def __init__(self, modo: str = 'auto', max_workers: int = None, timeout: float = TIMEOUT_PADRAO,
+                 caminhos: List[str] = ()):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de execução desconhecido: '{modo}'. Disponíveis: {', '.join(MODOS)}")
+        nucleos = os.cpu_count() or 1
+        if modo == 'auto':
+            modo = 'processos' if nucleos > 1 else 'sequencial'
+        self.modo = modo
+        self.max_workers = max_workers or nucleos
+        self.timeout = timeout
+        self.caminhos = list(caminhos)
+        self.tempos: Dict[str, float] = {}
+        self._pool = None
+        self._processos = 0
+        self._heuristicas_pool = None
+
+    # --- Ciclo de vida ---
+    def fechar(self):
+        """Termina a pool de processos (é recriada na próxima execução)."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+        self._pool = None
+        self._heuristicas_pool = None
+
+    def __enter__(self) -> 'ExecutorHeuristicas':
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+    # --- Execução ---
+    def executar(self, heuristicas: Dict[str, Any], estatisticas: Dict[str, Any],
+                 n: int = 5) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Chama `prever(estatisticas, n)` de cada heurística e devolve
+        `(resultados, erros)`, ambos indexados pelo nome da heurística.
+        """
+        self.tempos = {}
+        if not heuristicas:
+            return {}, {}
+        if self.modo == 'processos' and len(heuristicas) > 1:
+            try:
+                return self._executar_processos(heuristicas, estatisticas, n)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                print(f"⚠️  Não foi possível usar processos ({e}). A usar threads.")
+                self.fechar()
+                self.modo = 'threads'
+                return self._executar_threads(heuristicas, estatisticas, n)
+        if self.modo == 'threads' and len(heuristicas) > 1:
+            return self._executar_threads(heuristicas, estatisticas, n)
+        return self._executar_sequencial(heuristicas, estatisticas, n)
+
+    def _registar(self, nome: str, saida: Tuple[Any, str, float], resultados: Dict, erros: Dict):
+        resultado, erro, duracao = saida
+        self.tempos[nome] = duracao
+        if erro is None:
+            resultados[nome] = resultado
+        else:
+            erros[nome] = erro
+
+    def _executar_sequencial(self, heuristicas, estatisticas, n):
+        resultados, erros = {}, {}
+        for nome, heuristica in heuristicas.items():
+            self._registar(nome, _executar(heuristica, estatisticas, n, self.timeout), resultados, erros)
+        return resultados, erros
+
+    def _executar_threads(self, heuristicas, estatisticas, n):
+        resultados, erros = {}, {}
+        inicios = {}
+
+        def tarefa(nome, heuristica):
+            inicios[nome] = time.monotonic()
+            return _executar(heuristica, estatisticas, n, None)
+
+        trabalhadores = min(self.max_workers, len(heuristicas))
+        pool = ThreadPoolExecutor(max_workers=trabalhadores)
+        pendentes = {pool.submit(tarefa, nome, h): nome for nome, h in heuristicas.items()}
+        abandonadas = 0
+        try:
+            while pendentes:
+                concluidas, _ = wait(pendentes, timeout=0.05, return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    self._registar(pendentes.pop(futuro), futuro.result(), resultados, erros)
+
+                agora = time.monotonic()
+                for futuro, nome in list(pendentes.items()):
+                    if self.timeout and nome in inicios and agora - inicios[nome] > self.timeout:
+                        del pendentes[futuro]
+                        abandonadas += 1
+                        self.tempos[nome] = agora - inicios[nome]
+                        erros[nome] = f"tempo esgotado ({self.timeout:g}s)"
+                # Com todas as threads presas em heurísticas abandonadas, as restantes nunca começam
+                if abandonadas >= trabalhadores:
+                    for futuro, nome in pendentes.items():
+                        if nome not in inicios and futuro.cancel():
+                            erros[nome] = "não executada: todas as threads estão ocupadas"
+                    pendentes = {f: nome for f, nome in pendentes.items() if nome in inicios}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return resultados, erros
+
+    def _obter_pool(self, heuristicas):
+        """Pool de processos para este conjunto de heurísticas (recriada se o conjunto mudar)."""
+        assinatura = tuple((nome, id(h)) for nome, h in heuristicas.items())
+        if self._pool is None or self._heuristicas_pool != assinatura:
+            serializadas = pickle.dumps(heuristicas)
+            self.fechar()
+            self._processos = min(self.max_workers, len(heuristicas))
+            self._pool = mp.get_context().Pool(self._processos, _iniciar_worker, (serializadas, self.caminhos))
+            self._heuristicas_pool = assinatura
+        return self._pool
+
+    def _executar_processos(self, heuristicas, estatisticas, n):
+        resultados, erros = {}, {}
+        pool = self._obter_pool(heuristicas)
+
+        descritor, arquivo = tempfile.mkstemp(prefix='estatisticas_', suffix='.pkl', dir=_PASTA_PARTILHADA)
+        try:
+            with os.fdopen(descritor, 'wb') as f:
+                pickle.dump(estatisticas, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            tarefas = {nome: pool.apply_async(_executar_no_worker, (nome, arquivo, n, self.timeout))
+                       for nome in heuristicas}
+            saidas, falhas = recolher_com_prazo(tarefas, self.timeout, -(-len(heuristicas) // self._processos))
+            bloqueado = False
+            for nome in tarefas:
+                if nome in saidas:
+                    self._registar(nome, saidas[nome], resultados, erros)
+                elif isinstance(falhas[nome], mp.TimeoutError):
+                    bloqueado = True
+                    erros[nome] = f"tempo esgotado ({self.timeout:g}s)"
+                else:
+                    erros[nome] = f"{type(falhas[nome]).__name__}: {falhas[nome]}"
+            if bloqueado:
+                self.fechar()
+        finally:
+            os.remove(arquivo)
+        return resultados, erros
@@ -7,14 +7,24 @@ Substitui heurísticas fixas por lógicas geradas automaticamente
 import os
 import sys
 import json
+import random
+import pickle
+import multiprocessing as mp
 import numpy as np
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Tuple
 from collections import Counter
+from collections.abc import Mapping
 from lib.gerador_logicas_ultra import GeradorLogicasEscalavelUltra
+from lib.compilador_logicas import compilar_logica, CadeiaCompilada, ArvoreLogicas
+from lib.custo_funcoes import ModeloCusto, ORCAMENTO_LOGICA
+from lib.registo_logicas import RegistoLogicas
 from universal_wrapper import UniversalWrapper
 
 class HeuristicaDinamica:
     """Classe base para heurísticas dinâmicas geradas automaticamente"""
+
+    # Limite (segundos) de cada chamada de função da lógica; ao excedê-lo a previsão falha
+    TIMEOUT_FUNCAO = 1.0
     
     def __init__(self, nome: str, logica: List[str], descricao: str, dependencias: Set[str]):
         self.NOME = nome
@@ -22,6 +32,23 @@ class HeuristicaDinamica:
         self.DEPENDENCIAS = dependencias
         self.logica = logica
         self.wrapper = UniversalWrapper()
+        self._cadeia: CadeiaCompilada = None
+
+    def compilar(self) -> CadeiaCompilada:
+        """
+        Cadeia de funções da lógica já resolvida (ver `compilar_logica`), compilada na
+        primeira chamada e guardada na heurística: as chamadas seguintes a `prever`
+        só pagam as próprias funções.
+        """
+        if self._cadeia is None or self._cadeia.logica != self.logica:
+            self._cadeia = compilar_logica(self.logica, self.wrapper, self.TIMEOUT_FUNCAO)
+        return self._cadeia
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A cadeia compilada tem funções locais; é recompilada no processo que a recebe
+        estado = self.__dict__.copy()
+        estado['_cadeia'] = None
+        return estado
         
     def prever(self, estatisticas: Dict[str, Any], n: int = 5) -> List[int]:
         """
@@ -31,14 +58,8 @@ class HeuristicaDinamica:
             # Converter estatísticas em formato adequado para as funções
             dados_entrada = self._preparar_dados_entrada(estatisticas)
             
-            # Executar a cadeia de funções
-            resultado = dados_entrada
-            for funcao in self.logica:
-                if hasattr(self.wrapper, funcao):
-                    resultado = getattr(self.wrapper, funcao)(resultado)
-                else:
-                    # Fallback para funções não encontradas
-                    resultado = self._funcao_fallback(funcao, resultado)
+            # Executar a cadeia de funções (compilada uma vez por heurística)
+            resultado = self.compilar()(dados_entrada)
             
             # Converter resultado em números de 1-49
             numeros_previstos = self._extrair_numeros_previsao(resultado, n)
@@ -75,7 +96,7 @@ class HeuristicaDinamica:
         elif isinstance(obj, (list, tuple)):
             for item in obj:
                 valores.extend(self._extrair_valores_numericos(item))
-        elif isinstance(obj, dict):
+        elif isinstance(obj, Mapping):
             for key, value in obj.items():
                 if isinstance(key, (int, float)):
                     valores.append(float(key))
@@ -86,21 +107,6 @@ class HeuristicaDinamica:
         
         return [v for v in valores if 1 <= v <= 49 or 0 < v < 100]
     
-    def _funcao_fallback(self, nome_funcao: str, dados: List[float]) -> List[float]:
-        """Fallback para funções não implementadas"""
-        fallbacks = {
-            'mean': lambda x: [np.mean(x)] if x else [0],
-            'sum': lambda x: [sum(x)] if x else [0],
-            'max': lambda x: [max(x)] if x else [0],
-            'min': lambda x: [min(x)] if x else [0],
-            'std': lambda x: [np.std(x)] if len(x) > 1 else [0],
-        }
-        
-        if nome_funcao in fallbacks:
-            return fallbacks[nome_funcao](dados)
-        else:
-            return dados  # Retorna os dados sem modificação
-    
     def _extrair_numeros_previsao(self, resultado: Any, n: int = 5) -> List[int]:
         """
         Converte o resultado das funções em números de loteria (1-49)
@@ -141,21 +147,114 @@ class HeuristicaDinamica:
             # Fallback: números aleatórios
             return list(np.random.choice(range(1, 50), size=n, replace=False))
 
+# --- Avaliação walk-forward em processos de trabalho ---
+_avaliacao_worker: Dict[str, Any] = {}
+
+
+def _iniciar_avaliacao(heuristicas: bytes, sorteios: List[Dict[str, Any]], classe_dados, caminho_dados: str, jogo):
+    """Recebe as heurísticas e o histórico (só de leitura) uma vez por processo."""
+    _avaliacao_worker['heuristicas'] = pickle.loads(heuristicas)
+    _avaliacao_worker['dados'] = classe_dados.a_partir_de(sorteios, caminho_dados, None, jogo)
+
+
+def _avaliar_bloco(inicio: int, fim: int, semente: int = None,
+                   inicios: Dict[str, int] = None) -> Tuple[List[Dict[str, Any]], int, int, int]:
+    """
+    Avalia as heurísticas nos momentos [inicio, fim) do histórico do processo; com
+    `inicios`, cada heurística só a partir do seu momento inicial.
+    Com `semente`, os geradores aleatórios são reiniciados em cada momento com
+    `semente + i`, pelo que o resultado não depende da divisão em blocos.
+    Devolve (resultados, avaliações, passos executados e passos isolados das árvores
+    de lógicas; ver `ArvoreLogicas.relatorio`).
+    """
+    heuristicas = _avaliacao_worker['heuristicas']
+    dados = _avaliacao_worker['dados']
+    historico = dados.sorteios
+    inicios = inicios or {}
+    # Uma árvore por conjunto de heurísticas ativas (muda só nos seus momentos iniciais)
+    arvores: Dict[Tuple[str, ...], ArvoreLogicas] = {}
+    dependencias = set()
+    for heuristica in heuristicas.values():
+        dependencias.update(heuristica.DEPENDENCIAS)
+
+    resultados = []
+    for i, estatisticas in dados.percorrer_prefixos(dependencias, inicio=inicio, fim=fim):
+        if semente is not None:
+            random.seed(semente + i)
+            np.random.seed((semente + i) % 2 ** 32)
+        ativas = tuple(nome for nome in heuristicas if inicios.get(nome, inicio) <= i)
+        if ativas not in arvores:
+            arvores[ativas] = ArvoreLogicas({nome: heuristicas[nome] for nome in ativas})
+        # Próximo sorteio real (alvo)
+        sorteio_alvo = set(historico[i+1]['numeros'])
+        previsoes = arvores[ativas].avaliar(estatisticas, n=5)
+        for nome in ativas:
+            previsao = set(previsoes[nome])
+            resultados.append({
+                'heuristica': nome,
+                'timestamp': i,
+                'acertos': len(previsao.intersection(sorteio_alvo)),
+                'previsao': list(previsao),
+                'real': list(sorteio_alvo)
+            })
+    return (resultados, sum(arvore.avaliacoes for arvore in arvores.values()),
+            sum(arvore.passos_executados for arvore in arvores.values()),
+            sum(arvore.passos_isolados for arvore in arvores.values()))
+
+
 class GeradorHeuristicasDinamicas:
     """
     Gerencia a criação e evolução de heurísticas dinâmicas
     """
     
+    # Tempo estimado máximo (segundos) de uma avaliação de cada lógica gerada
+    ORCAMENTO_LOGICA = ORCAMENTO_LOGICA
+    # Lógicas sorteadas por heurística até uma caber no orçamento
+    TENTATIVAS_ORCAMENTO = 5
+    # Fração das heurísticas que vêm das melhores lógicas do registo (as restantes são novas)
+    FRACAO_TRANSPORTADA = 0.5
+
     def __init__(self):
         self.gerador_logicas = GeradorLogicasEscalavelUltra()
         self.heuristicas_ativas: Dict[str, HeuristicaDinamica] = {}
         self.historico_desempenho = []
+        self.modelo_custo = ModeloCusto()
+        self.registo = RegistoLogicas()
         
-    def gerar_heuristicas_para_loteria(self, quantidade: int = 20) -> Dict[str, HeuristicaDinamica]:
+    def gerar_heuristicas_para_loteria(self, quantidade: int = 20,
+                                       orcamento_logica: float = None) -> Dict[str, HeuristicaDinamica]:
         """
         Gera heurísticas específicas para análise de loteria
+
+        Até `FRACAO_TRANSPORTADA` das heurísticas são as lógicas com melhor score no
+        registo de lógicas (`RegistoLogicas.melhores`, só as que já acertaram algum
+        número), cujo desempenho já avaliado se mantém; as restantes são lógicas novas,
+        que ficam registadas.
+
+        Cada lógica tem de caber em `orcamento_logica` segundos (por omissão
+        `ORCAMENTO_LOGICA`) segundo o modelo de custo das funções (`ModeloCusto`, que
+        mede as funções ainda desconhecidas); as que excedem são sorteadas de novo.
         """
+        orcamento = self.ORCAMENTO_LOGICA if orcamento_logica is None else orcamento_logica
         print("🎯 Gerando heurísticas dinâmicas para loteria...")
+
+        todas_heuristicas = {}
+
+        # Melhores lógicas já avaliadas, desde que ainda caibam no orçamento
+        transportadas = [
+            entrada for entrada in self.registo.melhores(int(quantidade * self.FRACAO_TRANSPORTADA))
+            if self.modelo_custo.custo_logica(entrada['logica']) <= orcamento
+        ]
+        for i, entrada in enumerate(transportadas):
+            nome = f"heuristica_dinamica_{i+1:02d}"
+            descricao = f"Lógica: {' → '.join(entrada['logica'])}"
+            todas_heuristicas[nome] = HeuristicaDinamica(
+                nome=nome,
+                logica=entrada['logica'],
+                descricao=descricao,
+                dependencias=set(entrada['dependencias'])
+            )
+            print(f"♻️  {nome}: {descricao} (registo, score {self.registo.score(entrada['identificador']):.3f})")
         
         # Objetivos específicos para loteria
         objetivos_loteria = [
@@ -165,17 +264,23 @@ class GeradorHeuristicasDinamicas:
             'otimizacao'
         ]
         
-        todas_heuristicas = {}
-        
-        for i in range(quantidade):
+        for i in range(len(transportadas), quantidade):
             objetivo = np.random.choice(objetivos_loteria)
             
-            # Gerar lógica inteligente
-            logica = self.gerador_logicas.gerar_logica_inteligente_avancada(
-                objetivo=objetivo,
-                complexidade="media",
-                comprimento=(3, 6)
-            )
+            # Gerar lógica inteligente, dentro do orçamento de tempo
+            for _ in range(self.TENTATIVAS_ORCAMENTO):
+                logica = self.gerador_logicas.gerar_logica_inteligente_avancada(
+                    objetivo=objetivo,
+                    complexidade="media",
+                    comprimento=(3, 6)
+                )
+                custo = self.modelo_custo.custo_logica(logica or [], medir=True)
+                if custo <= orcamento:
+                    break
+            else:
+                print(f"⚠️ heuristica_dinamica_{i+1:02d}: nenhuma lógica dentro do orçamento "
+                      f"({custo:.3f}s > {orcamento:.3f}s)")
+                continue
             
             if logica and len(logica) >= 2:
                 # Determinar dependências baseadas nas funções usadas
@@ -193,8 +298,10 @@ class GeradorHeuristicasDinamicas:
                 )
                 
                 todas_heuristicas[nome] = heuristica
+                self.registo.registar(logica, dependencias, str(objetivo))
                 print(f"✅ {nome}: {descricao}")
         
+        self.registo.gravar()
         self.heuristicas_ativas = todas_heuristicas
         return todas_heuristicas
     
@@ -233,9 +340,20 @@ class GeradorHeuristicasDinamicas:
         
         return dependencias if dependencias else {'frequencia_total', 'frequencia_recente'}
     
-    def avaliar_desempenho_heuristicas(self, dados_manager, num_testes: int = 10):
+    def avaliar_desempenho_heuristicas(self, dados_manager, num_testes: int = 10,
+                                       max_workers: int = None, semente: int = None):
         """
-        Avalia o desempenho das heurísticas em dados históricos
+        Avalia o desempenho das heurísticas em dados históricos (walk-forward nos
+        últimos `num_testes` sorteios).
+
+        O desempenho fica no registo de lógicas (`RegistoLogicas`): uma lógica já
+        avaliada neste jogo só é pontuada nos sorteios acrescentados desde a última
+        avaliação, e o ranking usa os acertos acumulados em todas as avaliações.
+
+        Os momentos são divididos em blocos contíguos avaliados numa pool de processos
+        (`max_workers`, por omissão um por núcleo); cada processo recebe o histórico e
+        as heurísticas uma só vez e percorre o seu bloco com estatísticas incrementais.
+        Com `semente` o resultado é determinístico, qualquer que seja o número de processos.
         """
         print("📊 Avaliando desempenho das heurísticas dinâmicas...")
         
@@ -248,65 +366,74 @@ class GeradorHeuristicasDinamicas:
             print("❌ Dados históricos insuficientes para avaliação")
             return
         
+        # As heurísticas com a mesma entrada e o mesmo início de lógica partilham o cálculo
+        arvore = ArvoreLogicas(self.heuristicas_ativas)
+
+        jogo = dados_manager.jogo.nome
+        identificadores = {
+            nome: self.registo.registar(h.logica, h.DEPENDENCIAS) for nome, h in self.heuristicas_ativas.items()
+        }
+        inicio_padrao, fim = len(historico) - num_testes, len(historico) - 1
+        inicios = {
+            nome: self.registo.inicio_avaliacao(ident, jogo, dados_manager, inicio_padrao)
+            for nome, ident in identificadores.items()
+        }
+        inicio = min(inicios.values())
+        anteriores = sum(1 for i in inicios.values() if i != inicio_padrao)
+        print(f"🗂️  Registo de lógicas: {anteriores} heurísticas com avaliação anterior, "
+              f"{fim - inicio} sorteios por avaliar")
+
+        avaliados = []
+        if inicio < fim:
+            processos = max(1, min(max_workers or os.cpu_count() or 1, fim - inicio))
+            # Um bloco por processo: cada bloco paga o arranque das estatísticas incrementais
+            tamanho_bloco = max(-(-(fim - inicio) // processos), 1)
+            blocos = [(b, min(b + tamanho_bloco, fim), semente, inicios) for b in range(inicio, fim, tamanho_bloco)]
+            argumentos = (pickle.dumps(self.heuristicas_ativas), list(historico), type(dados_manager),
+                          dados_manager.caminho_dados, dados_manager.jogo)
+
+            if processos > 1:
+                with mp.get_context().Pool(processos, _iniciar_avaliacao, argumentos) as pool:
+                    avaliados = pool.starmap(_avaliar_bloco, blocos)
+            else:
+                _iniciar_avaliacao(*argumentos)
+                avaliados = [_avaliar_bloco(*bloco) for bloco in blocos]
+                _avaliacao_worker.clear()
+
         resultados = []
-        
-        for i in range(len(historico) - num_testes, len(historico) - 1):
-            # Dados de treino (até o ponto atual)
-            historico_treino = historico[:i+1]
-            dados_treino = type(dados_manager)()  # Nova instância
-            dados_treino.sorteios = historico_treino
-            
-            # Próximo sorteio real (alvo)
-            sorteio_alvo = set(historico[i+1]['numeros'])
-            
-            # Calcular estatísticas para o ponto atual
-            todas_dependencias = set()
-            for heuristica in self.heuristicas_ativas.values():
-                todas_dependencias.update(heuristica.DEPENDENCIAS)
-            
-            estatisticas, _ = dados_treino.obter_estatisticas(todas_dependencias)
-            
-            # Avaliar cada heurística
-            for nome, heuristica in self.heuristicas_ativas.items():
-                try:
-                    previsao = set(heuristica.prever(estatisticas, n=5))
-                    acertos = len(previsao.intersection(sorteio_alvo))
-                    
-                    resultados.append({
-                        'heuristica': nome,
-                        'timestamp': i,
-                        'acertos': acertos,
-                        'previsao': list(previsao),
-                        'real': list(sorteio_alvo)
-                    })
-                    
-                except Exception as e:
-                    print(f"❌ Erro avaliando {nome}: {e}")
+        for resultados_bloco, avaliacoes, passos_executados, passos_isolados in avaliados:
+            resultados.extend(resultados_bloco)
+            arvore.avaliacoes += avaliacoes
+            arvore.passos_executados += passos_executados
+            arvore.passos_isolados += passos_isolados
         
         # Agrupar resultados por heurística
-        desempenho = {}
+        desempenho = {nome: {} for nome in self.heuristicas_ativas}
         for resultado in resultados:
-            nome = resultado['heuristica']
-            if nome not in desempenho:
-                desempenho[nome] = []
-            desempenho[nome].append(resultado['acertos'])
+            desempenho[resultado['heuristica']][resultado['timestamp']] = resultado['acertos']
         
-        # Calcular métricas
+        # Acumular no registo e calcular as métricas sobre todos os sorteios avaliados
         ranking = []
+        acumuladas = set()
         for nome, acertos in desempenho.items():
-            taxa_acerto = np.mean(acertos) / 5.0  # 5 números previstos
-            estabilidade = 1.0 - (np.std(acertos) / np.mean(acertos)) if acertos else 0
-            
-            ranking.append({
-                'nome': nome,
-                'taxa_acerto': taxa_acerto,
-                'estabilidade': estabilidade,
-                'score': taxa_acerto * 0.7 + estabilidade * 0.3
-            })
+            # Heurísticas com a mesma lógica contam uma só vez no registo
+            if identificadores[nome] not in acumuladas:
+                self.registo.acumular(identificadores[nome], jogo, dados_manager, acertos)
+                acumuladas.add(identificadores[nome])
+            ranking.append({'nome': nome, **self.registo.desempenho(identificadores[nome], jogo)})
+        self.registo.gravar()
         
         ranking.sort(key=lambda x: x['score'], reverse=True)
         self.historico_desempenho = ranking
         
+        passos_sem_partilha = sum(len(self.heuristicas_ativas[r['heuristica']].logica) for r in resultados)
+        if arvore.passos_isolados:
+            print(f"♻️  Partilha de prefixos: {arvore.passos_isolados - arvore.passos_executados} de "
+                  f"{arvore.passos_isolados} passos evitados "
+                  f"({1 - arvore.passos_executados / arvore.passos_isolados:.0%}), {len(arvore.raizes)} entradas "
+                  f"preparadas por sorteio em vez de {len(arvore.heuristicas)}; "
+                  f"{passos_sem_partilha - arvore.passos_isolados} passos por executar após falhas")
+        
         print("🏆 RANKING DAS HEURÍSTICAS:")
         for i, heur in enumerate(ranking[:10]):
             print(f"  {i+1}. {heur['nome']}: {heur['taxa_acerto']:.3f} (score: {heur['score']:.3f})")
@@ -0,0 +1,84 @@
+# lib/grafo_estatisticas.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Callable, Iterable
+
+
+def depende_de(*entradas: str):
+    """
+    Declara as entradas (intermediários ou outras estatísticas) de um método de
+    cálculo. Não altera a função: só lhe anexa `_entradas`, lido pelo planeador.
+    """
+    def decorador(funcao):
+        funcao._entradas = tuple(entradas)
+        return funcao
+    return decorador
+
+
+class GrafoEstatisticas:
+    """
+    Grafo declarativo de estatísticas e intermediários partilhados.
+
+    Cada nó tem uma lista de entradas. `planear` devolve o conjunto mínimo de nós
+    necessário para um conjunto de alvos, por ordem topológica, agrupado em níveis:
+    os nós do mesmo nível não dependem uns dos outros e podem correr em paralelo.
+    """
+
+    def __init__(self, entradas: Dict[str, Tuple[str, ...]]):
+        self.entradas = entradas
+
+    def planear(self, alvos: Iterable[str], disponiveis: Iterable[str] = ()) -> List[List[str]]:
+        """
+        Níveis de nós a calcular para obter `alvos`, ignorando os já `disponiveis`
+        (e tudo o que só eles precisariam). Nós desconhecidos ficam no primeiro nível,
+        para que o erro seja registado por quem os executar.
+        """
+        disponiveis = set(disponiveis)
+        profundidade = {}
+        em_visita = set()
+
+        def visitar(no: str) -> int:
+            if no in disponiveis:
+                return -1
+            if no in profundidade:
+                return profundidade[no]
+            if no in em_visita:
+                raise ValueError(f"Dependência circular entre estatísticas em '{no}'")
+            em_visita.add(no)
+            nivel = 1 + max((visitar(entrada) for entrada in self.entradas.get(no, ())), default=-1)
+            em_visita.discard(no)
+            profundidade[no] = nivel
+            return nivel
+
+        for alvo in alvos:
+            visitar(alvo)
+
+        niveis = [[] for _ in range(max(profundidade.values(), default=-1) + 1)]
+        for no, nivel in profundidade.items():
+            niveis[nivel].append(no)
+        return niveis
+
+    def executar(self, niveis: List[List[str]], calcular: Callable[[str], Any],
+                 max_threads: int = 0) -> Dict[str, float]:
+        """
+        Executa `calcular(no)` para cada nó, nível a nível. Com `max_threads > 1` os nós
+        de um mesmo nível correm numa pool de threads (as operações NumPy libertam o GIL).
+        Devolve o tempo (segundos) de cada nó; as exceções ficam a cargo de `calcular`.
+        """
+        tempos = {}
+
+        def cronometrar(no: str):
+            inicio = time.perf_counter()
+            calcular(no)
+            tempos[no] = time.perf_counter() - inicio
+
+        if max_threads and max_threads > 1:
+            with ThreadPoolExecutor(max_workers=max_threads) as executor:
+                for nivel in niveis:
+                    list(executor.map(cronometrar, nivel))
+        else:
+            for nivel in niveis:
+                for no in nivel:
+                    cronometrar(no)
+        return tempos
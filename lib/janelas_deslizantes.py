@@ -0,0 +1,138 @@
+# lib/janelas_deslizantes.py
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+from lib.coocorrencias import ContagemCombinacoes
+from lib.matriz_sorteios import MatrizSorteios, NUMERO_MAXIMO
+
+# Janelas mantidas por omissão (inclui as de `frequencia_recente` e `pares_recentes`)
+JANELAS_PADRAO = (5, 10, 15, 20, 50, 100)
+
+
+class JanelasDeslizantes:
+    """
+    Frequências de números e de pares em várias janelas recentes ao mesmo tempo.
+
+    Os últimos `max(janelas)` sorteios ficam num buffer circular (linhas de
+    incidência). Cada `adicionar` soma o sorteio novo às contagens de todas as
+    janelas e subtrai, em cada uma, o sorteio que dela sai, pelo que o custo por
+    sorteio é constante, independentemente do tamanho do histórico e das janelas.
+
+    `frequencia(janela)` e `pares(janela)` devolvem os mesmos objetos (e a mesma
+    ordem de desempate) que o cálculo direto sobre os últimos `janela` sorteios.
+    """
+
+    def __init__(self, janelas: Iterable[int] = JANELAS_PADRAO, numero_maximo: int = NUMERO_MAXIMO):
+        self.janelas = tuple(sorted(set(janelas)))
+        if not self.janelas or self.janelas[0] < 1:
+            raise ValueError(f"Janelas inválidas: {janelas}")
+        self.capacidade = self.janelas[-1]
+        self.numero_maximo = numero_maximo
+        self.total_sorteios = 0
+        self._indice = {janela: i for i, janela in enumerate(self.janelas)}
+        self._buffer = np.zeros((self.capacidade, numero_maximo), dtype=bool)
+        self._frequencias = np.zeros((len(self.janelas), numero_maximo), dtype=np.int32)
+        self._pares = np.zeros((len(self.janelas), numero_maximo, numero_maximo), dtype=np.int32)
+
+    @classmethod
+    def de_incidencia(cls, incidencia: np.ndarray, janelas: Iterable[int] = JANELAS_PADRAO) -> 'JanelasDeslizantes':
+        """Constrói o estado a partir de uma matriz de incidência; só as últimas linhas são lidas."""
+        estado = cls(janelas, incidencia.shape[1])
+        recentes = incidencia[-estado.capacidade:]
+        n = recentes.shape[0]
+        estado.total_sorteios = incidencia.shape[0]
+        estado._buffer[(estado.total_sorteios - n + np.arange(n)) % estado.capacidade] = recentes
+        for i, janela in enumerate(estado.janelas):
+            linhas = recentes[-janela:].astype(np.int32)
+            estado._frequencias[i] = linhas.sum(axis=0)
+            estado._pares[i] = linhas.T @ linhas
+        return estado
+
+    # --- Atualização ---
+    def adicionar(self, numeros: List[int]):
+        """Acrescenta um sorteio (números fora de 1..máximo são ignorados)."""
+        nova = np.zeros(self.numero_maximo, dtype=bool)
+        nova[[num - 1 for num in numeros if 1 <= num <= self.numero_maximo]] = True
+        entrada = np.flatnonzero(nova)
+
+        for i, janela in enumerate(self.janelas):
+            if self.total_sorteios >= janela:
+                # O sorteio que sai é lido antes de o buffer ser reescrito (janela == capacidade)
+                saida = np.flatnonzero(self._buffer[(self.total_sorteios - janela) % self.capacidade])
+                self._frequencias[i, saida] -= 1
+                self._pares[i][np.ix_(saida, saida)] -= 1
+            self._frequencias[i, entrada] += 1
+            self._pares[i][np.ix_(entrada, entrada)] += 1
+
+        self._buffer[self.total_sorteios % self.capacidade] = nova
+        self.total_sorteios += 1
+
+    # --- Leitura ---
+    def _posicao(self, janela: int) -> int:
+        if janela not in self._indice:
+            raise KeyError(f"Janela {janela} não registada (disponíveis: {self.janelas})")
+        return self._indice[janela]
+
+    def linhas(self, janela: int) -> np.ndarray:
+        """Linhas de incidência dos últimos `janela` sorteios, por ordem cronológica."""
+        n = min(janela, self.total_sorteios, self.capacidade)
+        return self._buffer[(self.total_sorteios - n + np.arange(n)) % self.capacidade]
+
+    def frequencia(self, janela: int) -> Counter:
+        """Frequência dos números nos últimos `janela` sorteios (como `frequencia_recente`)."""
+        i = self._posicao(janela)
+        return MatrizSorteios.contador(self.linhas(janela), self._frequencias[i])
+
+    def pares(self, janela: int) -> ContagemCombinacoes:
+        """Frequência dos pares nos últimos `janela` sorteios (como `pares_recentes`)."""
+        i = self._posicao(janela)
+        return ContagemCombinacoes.de_pares(self._pares[i], self.linhas(janela))
+
+    def frequencias(self) -> 'PorJanela':
+        """`{janela: Counter}` para todas as janelas registadas, materializado a pedido."""
+        return PorJanela(self.janelas, self.frequencia)
+
+    def todos_pares(self) -> 'PorJanela':
+        """`{janela: ContagemCombinacoes}` para todas as janelas registadas, materializado a pedido."""
+        return PorJanela(self.janelas, self.pares)
+
+
+class PorJanela(Mapping):
+    """
+    Dicionário só de leitura `{janela: valor}` que calcula cada valor apenas
+    quando é pedido (ex.: `estatisticas['frequencia_recente_janelas'][50]`).
+    """
+
+    def __init__(self, janelas: Iterable[int], calcular):
+        self._janelas = tuple(janelas)
+        self._calcular = calcular
+        self._valores = {}
+
+    def __getitem__(self, janela: int) -> Any:
+        if janela not in self._janelas:
+            raise KeyError(janela)
+        if janela not in self._valores:
+            self._valores[janela] = self._calcular(janela)
+        return self._valores[janela]
+
+    def __iter__(self):
+        return iter(self._janelas)
+
+    def __len__(self) -> int:
+        return len(self._janelas)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(janelas={self._janelas})"
+
+    # --- Serialização (materializa todas as janelas) ---
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'janelas': self._janelas, 'valores': {janela: self[janela] for janela in self._janelas}}
+
+    def __setstate__(self, estado: Dict[str, Any]):
+        self._janelas = estado['janelas']
+        self._valores = estado['valores']
+        self._calcular = None
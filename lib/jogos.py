@@ -0,0 +1,96 @@
+# lib/jogos.py
+
+import re
+from typing import Dict, Any, List, Tuple
+
+JOGO_PADRAO = 'totoloto'
+
+
+class Jogo:
+    """
+    Descrição de um jogo: intervalo dos números, quantos saem por sorteio,
+    bolas especiais (número da sorte, estrelas, nº de sonho) e os ficheiros
+    de `dados/` que lhe pertencem: os JSON do histórico e os TXT com o resultado
+    (e a tabela de prémios) de cada sorteio.
+
+    Os sorteios gravados no formato do site (`"chave": "13 24 28 33 35 + 5 9"`)
+    são convertidos por `normalizar` para o formato do Totoloto: `numeros` e
+    `especial` (um só número) ou `especiais` (lista, quando saem vários).
+    """
+
+    def __init__(self, nome: str, numero_maximo: int, numeros_por_sorteio: int,
+                 especial_maximo: int, especiais_por_sorteio: int, padrao_ficheiros: str,
+                 padrao_resultados: str):
+        self.nome = nome
+        self.numero_maximo = numero_maximo
+        self.numeros_por_sorteio = numeros_por_sorteio
+        self.especial_maximo = especial_maximo
+        self.especiais_por_sorteio = especiais_por_sorteio
+        self._padrao_ficheiros = re.compile(padrao_ficheiros)
+        self._padrao_resultados = re.compile(padrao_resultados)
+
+    def __repr__(self) -> str:
+        return f"Jogo({self.nome!r}, {self.numeros_por_sorteio}/{self.numero_maximo}" \
+               f" + {self.especiais_por_sorteio}/{self.especial_maximo})"
+
+    @property
+    def tem_numeros(self) -> bool:
+        """Falso para jogos de códigos (M1lhão), sem estatísticas de números."""
+        return self.numero_maximo > 0
+
+    def pertence(self, nome_ficheiro: str) -> bool:
+        """Indica se um ficheiro JSON de `dados/` guarda sorteios deste jogo."""
+        return bool(self._padrao_ficheiros.match(nome_ficheiro))
+
+    def resultado_pertence(self, nome_ficheiro: str) -> bool:
+        """Indica se um ficheiro TXT de `dados/` guarda resultados deste jogo."""
+        return bool(self._padrao_resultados.match(nome_ficheiro))
+
+    # --- Faixas usadas nas distribuições ---
+    @property
+    def limites_quadrantes(self) -> List[Tuple[int, int, int]]:
+        """(chave, primeiro, último) de cada quadrante: blocos de 12, o último vai até ao máximo."""
+        return [(1, 1, 12), (2, 13, 24), (3, 25, 36), (4, 37, self.numero_maximo)]
+
+    @property
+    def limites_dezenas(self) -> List[Tuple[int, int, int]]:
+        """(chave, primeiro, último) de cada dezena (1-10, 11-20, ...)."""
+        return [(k, 10 * (k - 1) + 1, min(10 * k, self.numero_maximo))
+                for k in range(1, (self.numero_maximo + 9) // 10 + 1)]
+
+    # --- Formato dos sorteios ---
+    def normalizar(self, sorteio: Dict[str, Any]) -> Dict[str, Any]:
+        """Acrescenta `numeros` e as bolas especiais a um sorteio gravado só com `chave`."""
+        if 'numeros' in sorteio or not isinstance(sorteio.get('chave'), str):
+            return sorteio
+        principais, _, especiais = sorteio['chave'].partition('+')
+        try:
+            numeros = [int(num) for num in principais.split()]
+            especiais = [int(num) for num in especiais.split()]
+        except ValueError:
+            return sorteio
+        normalizado = dict(sorteio, numeros=numeros)
+        if self.especiais_por_sorteio == 1 and len(especiais) == 1:
+            normalizado['especial'] = especiais[0]
+        elif especiais:
+            normalizado['especiais'] = especiais
+        return normalizado
+
+
+JOGOS = {
+    'totoloto': Jogo('totoloto', 49, 5, 13, 1, r'^\d{4}\.json$', r'^\d{4}\.txt$'),
+    'euromilhoes': Jogo('euromilhoes', 50, 5, 12, 2, r'^euromilhoes_\d{4}\.json$',
+                        r'^euromilhoes_\d{3}_\d{4}\.txt$'),
+    'eurodreams': Jogo('eurodreams', 40, 6, 5, 1, r'^eurodreams_\d{4}\.json$',
+                       r'^eurodreams_\d{3}_\d{4}\.txt$'),
+    'milhao': Jogo('milhao', 0, 0, 0, 0, r'^milhao_\d{4}\.json$', r'^milhao_\d{3}_\d{4}\.txt$'),
+}
+
+
+def obter_jogo(jogo) -> Jogo:
+    """Devolve o `Jogo` registado com esse nome (aceita também um `Jogo`)."""
+    if isinstance(jogo, Jogo):
+        return jogo
+    if jogo not in JOGOS:
+        raise ValueError(f"Jogo desconhecido: '{jogo}'. Disponíveis: {', '.join(JOGOS)}")
+    return JOGOS[jogo]
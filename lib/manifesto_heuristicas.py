@@ -0,0 +1,226 @@
+# lib/manifesto_heuristicas.py
+
+import os
+import ast
+import sys
+import json
+import hashlib
+import importlib
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, Any, List
+
+# Ficheiro (dentro da pasta das heurísticas) com os metadados em cache
+ARQUIVO_MANIFESTO = '.manifesto.json'
+VERSAO_FORMATO = 1
+
+# Atributos de classe lidos sem importar o módulo
+_ATRIBUTOS = ('NOME', 'DESCRICAO', 'DEPENDENCIAS')
+
+
+class ManifestoHeuristicas:
+    """
+    Metadados das heurísticas de uma pasta (NOME, DESCRICAO, DEPENDENCIAS, módulo,
+    classe e métodos), extraídos da árvore sintática de cada ficheiro, sem o importar.
+
+    O manifesto fica em `<pasta>/.manifesto.json` com mtime, tamanho e SHA-1 de cada
+    ficheiro: só os ficheiros que mudaram voltam a ser analisados. Quando os metadados
+    não são literais na classe (ou a classe herda de outra), o módulo é importado
+    para os ler, e o resultado também fica em cache.
+    """
+
+    def __init__(self, pasta: str):
+        self.pasta = pasta
+        self.caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+
+    # --- Fontes ---
+    def _fontes(self) -> List[str]:
+        """Ficheiros das heurísticas, pela ordem de `os.listdir` (a do carregamento original)."""
+        return [nome for nome in os.listdir(self.pasta) if nome.endswith('.py') and nome != '__init__.py']
+
+    @staticmethod
+    def _sha1(caminho: str) -> str:
+        with open(caminho, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def _ler(self) -> Dict[str, Any]:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return manifesto.get('heuristicas', {}) if manifesto.get('versao') == VERSAO_FORMATO else {}
+
+    def _gravar(self, entradas: Dict[str, Dict[str, Any]]):
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({'versao': VERSAO_FORMATO, 'heuristicas': entradas}, f, indent=2, ensure_ascii=False)
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o manifesto das heurísticas: {e}")
+
+    # --- Análise ---
+    def _analisar(self, arquivo: str) -> Dict[str, Any]:
+        """
+        Metadados da primeira classe pública definida no ficheiro (a que o Despachante usa).
+        Ficheiros sem classe ficam com `classe: None`; os que não se conseguem ler, com `erro`.
+        """
+        modulo = arquivo[:-3]
+        try:
+            with open(os.path.join(self.pasta, arquivo), 'r', encoding='utf-8') as f:
+                arvore = ast.parse(f.read(), filename=arquivo)
+        except (SyntaxError, UnicodeDecodeError, OSError) as e:
+            return {'modulo': modulo, 'erro': f"{type(e).__name__}: {e}"}
+
+        classe = next((no for no in arvore.body if isinstance(no, ast.ClassDef) and no.name[0].isupper()), None)
+        if classe is None:
+            return {'modulo': modulo, 'classe': None}
+
+        atributos = {}
+        literais = not classe.bases
+        for no in classe.body:
+            if isinstance(no, ast.Assign) and len(no.targets) == 1 and isinstance(no.targets[0], ast.Name):
+                if no.targets[0].id in _ATRIBUTOS:
+                    try:
+                        atributos[no.targets[0].id] = ast.literal_eval(no.value)
+                    except ValueError:
+                        literais = False
+        metodos = [no.name for no in classe.body if isinstance(no, (ast.FunctionDef, ast.AsyncFunctionDef))]
+
+        entrada = {'modulo': modulo, 'classe': classe.name}
+        if literais:
+            entrada.update(
+                nome=atributos.get('NOME', modulo),
+                descricao=atributos.get('DESCRICAO', 'N/A'),
+                dependencias=list(atributos.get('DEPENDENCIAS', [])),
+                metodos=metodos,
+            )
+            return entrada
+        return self._importar_metadados(entrada)
+
+    def _importar_metadados(self, entrada: Dict[str, Any]) -> Dict[str, Any]:
+        """Recurso para classes cujos metadados só se conhecem importando o módulo."""
+        try:
+            classe = getattr(_importar(self.pasta, entrada['modulo']), entrada['classe'])
+        except Exception as e:
+            return dict(entrada, erro=f"{type(e).__name__}: {e}")
+        entrada.update(
+            nome=getattr(classe, 'NOME', entrada['modulo']),
+            descricao=getattr(classe, 'DESCRICAO', 'N/A'),
+            dependencias=list(getattr(classe, 'DEPENDENCIAS', [])),
+            metodos=[nome for nome in dir(classe) if callable(getattr(classe, nome, None))],
+        )
+        return entrada
+
+    def entradas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        `{ficheiro: metadados}` de todas as heurísticas da pasta; o manifesto é
+        atualizado (e regravado) apenas se algum ficheiro mudou.
+        """
+        if not os.path.exists(self.pasta):
+            return {}
+        anteriores = self._ler()
+        fontes = self._fontes()
+        entradas = {}
+        alterado = set(anteriores) != set(fontes)
+        for arquivo in fontes:
+            caminho = os.path.join(self.pasta, arquivo)
+            estado = os.stat(caminho)
+            anterior = anteriores.get(arquivo, {})
+            if anterior.get('mtime_ns') == estado.st_mtime_ns and anterior.get('tamanho') == estado.st_size:
+                entradas[arquivo] = anterior
+                continue
+            sha1 = self._sha1(caminho)
+            entrada = anterior if anterior.get('sha1') == sha1 else self._analisar(arquivo)
+            entradas[arquivo] = dict(entrada, mtime_ns=estado.st_mtime_ns, tamanho=estado.st_size, sha1=sha1)
+            alterado = True
+        if alterado:
+            self._gravar(entradas)
+        return entradas
+
+
+def _importar(pasta: str, modulo: str):
+    """Importa um módulo da pasta das heurísticas."""
+    sys.path.insert(0, pasta)
+    try:
+        return importlib.import_module(modulo)
+    finally:
+        sys.path.remove(pasta)
+
+
+class _Pendente:
+    """Heurística registada mas ainda não importada."""
+
+    def __init__(self, modulo: str, classe: str):
+        self.modulo = modulo
+        self.classe = classe
+
+
+class HeuristicasPreguicosas(MutableMapping):
+    """
+    Dicionário `{nome: instância}` de heurísticas em que cada módulo só é importado
+    (e a classe instanciada) quando a heurística é pedida pela primeira vez.
+
+    Uma heurística que falha ao carregar é removida (fica em `falhas`); `items()` e
+    `values()` ignoram-na, como o carregamento antecipado fazia.
+    """
+
+    def __init__(self, pasta: str):
+        self.pasta = pasta
+        self.falhas: Dict[str, str] = {}
+        self._itens: Dict[str, Any] = {}
+        self._trinco = threading.Lock()
+
+    def registar(self, nome: str, modulo: str, classe: str):
+        self._itens[nome] = _Pendente(modulo, classe)
+
+    def carregada(self, nome: str) -> bool:
+        return nome in self._itens and not isinstance(self._itens[nome], _Pendente)
+
+    def _carregar(self, nome: str) -> bool:
+        with self._trinco:
+            valor = self._itens.get(nome)
+            if not isinstance(valor, _Pendente):
+                return nome in self._itens
+            try:
+                self._itens[nome] = getattr(_importar(self.pasta, valor.modulo), valor.classe)()
+                return True
+            except Exception as e:
+                print(f"❌ Erro ao carregar a heurística '{valor.modulo}'. Detalhes: {e}")
+                self.falhas[nome] = str(e)
+                del self._itens[nome]
+                return False
+
+    def __getitem__(self, nome: str) -> Any:
+        if not self._carregar(nome):
+            raise KeyError(nome)
+        return self._itens[nome]
+
+    def __setitem__(self, nome: str, heuristica: Any):
+        self._itens[nome] = heuristica
+
+    def __delitem__(self, nome: str):
+        del self._itens[nome]
+
+    def __iter__(self):
+        return iter(list(self._itens))
+
+    def __contains__(self, nome) -> bool:
+        return nome in self._itens
+
+    def clear(self):
+        self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def items(self) -> List:
+        return [(nome, self._itens[nome]) for nome in list(self._itens) if self._carregar(nome)]
+
+    def values(self) -> List:
+        return [heuristica for _, heuristica in self.items()]
+
+    def __repr__(self) -> str:
+        carregadas = sum(self.carregada(nome) for nome in self._itens)
+        return f"{type(self).__name__}({len(self._itens)} heurísticas, {carregadas} carregadas)"
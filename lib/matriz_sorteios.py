@@ -0,0 +1,182 @@
+# lib/matriz_sorteios.py
+
+import datetime
+from collections import Counter
+from typing import Dict, Any, List, Sequence
+
+import numpy as np
+
+# Totoloto; os outros jogos indicam o seu máximo (ver `lib/jogos.py`)
+NUMERO_MAXIMO = 49
+NUMEROS = np.arange(1, NUMERO_MAXIMO + 1)
+
+
+class MatrizSorteios:
+    """
+    Representação em arrays NumPy do histórico de sorteios.
+
+    - `incidencia`: matriz booleana (N x máximo do jogo, 49 no Totoloto);
+      `incidencia[i, num - 1]` indica se `num` saiu no sorteio `i`.
+    - `posicoes`: matriz (N x k) com os números de cada sorteio ordenados; só as linhas
+      marcadas em `posicoes_validas` (sorteios com o mesmo tamanho do primeiro) são usadas.
+    - `especiais`: matriz booleana (N x máximo das bolas especiais) com o número da
+      sorte / estrelas de cada sorteio (`especial` ou `especiais`).
+    - `anos`: ano de cada sorteio, calculado apenas quando é pedido.
+
+    As fatias (`fatia`) partilham a memória da matriz original, pelo que as vistas de
+    `Dados.ate` não copiam dados.
+    """
+
+    def __init__(self, incidencia: np.ndarray, posicoes: np.ndarray, posicoes_validas: np.ndarray,
+                 sorteios: Sequence[Dict[str, Any]], anos: np.ndarray = None, especiais: np.ndarray = None):
+        self.incidencia = incidencia
+        self.posicoes = posicoes
+        self.posicoes_validas = posicoes_validas
+        self.especiais = especiais if especiais is not None else np.zeros((incidencia.shape[0], 0), dtype=bool)
+        self._sorteios = sorteios
+        self._anos = anos
+
+    @classmethod
+    def de_sorteios(cls, sorteios: Sequence[Dict[str, Any]], numero_maximo: int = NUMERO_MAXIMO,
+                    especial_maximo: int = 0) -> 'MatrizSorteios':
+        """Constrói as matrizes a partir de uma lista de sorteios (uma única passagem)."""
+        total = len(sorteios)
+        num_posicoes = len(sorteios[0].get('numeros', [])) if total else 0
+
+        incidencia = np.zeros((total, numero_maximo), dtype=bool)
+        posicoes = np.zeros((total, num_posicoes), dtype=np.uint8)
+        posicoes_validas = np.zeros(total, dtype=bool)
+        especiais = np.zeros((total, especial_maximo), dtype=bool)
+
+        for i, sorteio in enumerate(sorteios):
+            numeros = sorteio.get('numeros', [])
+            for num in numeros:
+                if 1 <= num <= numero_maximo:
+                    incidencia[i, num - 1] = True
+            if num_posicoes and len(numeros) == num_posicoes:
+                posicoes[i] = sorted(numeros)
+                posicoes_validas[i] = True
+            if especial_maximo:
+                bolas = sorteio.get('especiais') or ([sorteio['especial']] if 'especial' in sorteio else [])
+                for bola in bolas:
+                    if isinstance(bola, int) and 1 <= bola <= especial_maximo:
+                        especiais[i, bola - 1] = True
+
+        return cls(incidencia, posicoes, posicoes_validas, sorteios, especiais=especiais)
+
+    def fatia(self, fim: int) -> 'MatrizSorteios':
+        """Devolve as primeiras `fim` linhas, partilhando a memória (sem cópia)."""
+        return MatrizSorteios(self.incidencia[:fim], self.posicoes[:fim], self.posicoes_validas[:fim],
+                              self._sorteios, self.anos[:fim], self.especiais[:fim])
+
+    @property
+    def total(self) -> int:
+        return self.incidencia.shape[0]
+
+    @property
+    def numero_maximo(self) -> int:
+        return self.incidencia.shape[1]
+
+    @property
+    def anos(self) -> np.ndarray:
+        if self._anos is None:
+            self._anos = np.array(
+                [datetime.datetime.strptime(self._sorteios[i]['data'], '%d/%m/%Y').year
+                 for i in range(self.total)],
+                dtype=np.int32
+            )
+        return self._anos
+
+    @property
+    def somas(self) -> np.ndarray:
+        return self.incidencia @ np.arange(1, self.numero_maximo + 1)
+
+    # --- Ocorrências ---
+    @staticmethod
+    def primeira_linha(matriz: np.ndarray) -> np.ndarray:
+        """Índice da primeira linha com `True` em cada coluna (-1 se nunca ocorre)."""
+        if matriz.shape[0] == 0:
+            return np.full(matriz.shape[1], -1)
+        primeira = matriz.argmax(axis=0)
+        return np.where(matriz.any(axis=0), primeira, -1)
+
+    @staticmethod
+    def ultima_linha(matriz: np.ndarray) -> np.ndarray:
+        """Índice da última linha com `True` em cada coluna (-1 se nunca ocorre)."""
+        if matriz.shape[0] == 0:
+            return np.full(matriz.shape[1], -1)
+        ultima = matriz.shape[0] - 1 - matriz[::-1].argmax(axis=0)
+        return np.where(matriz.any(axis=0), ultima, -1)
+
+    @staticmethod
+    def ocorrencia_anterior(matriz: np.ndarray) -> np.ndarray:
+        """
+        anterior[i, c]: última linha antes de `i` com `True` na coluna `c` (-1 se não há).
+        Tem uma linha a mais do que `matriz`, para os prefixos de 0 a `total` linhas.
+        """
+        linhas = np.where(matriz, np.arange(matriz.shape[0])[:, np.newaxis], -1)
+        anterior = np.full((matriz.shape[0] + 1, matriz.shape[1]), -1, dtype=np.int64)
+        if matriz.shape[0]:
+            anterior[1:] = np.maximum.accumulate(linhas, axis=0)
+        return anterior
+
+    @staticmethod
+    def proxima_ocorrencia(matriz: np.ndarray) -> np.ndarray:
+        """
+        proxima[i, c]: primeira linha a partir de `i` com `True` na coluna `c` (`total` se não há).
+        Tem uma linha a mais do que `matriz`, como em `ocorrencia_anterior`.
+        """
+        total = matriz.shape[0]
+        linhas = np.where(matriz, np.arange(total)[:, np.newaxis], total)
+        proxima = np.full((total + 1, matriz.shape[1]), total, dtype=np.int64)
+        if total:
+            proxima[:-1] = np.minimum.accumulate(linhas[::-1], axis=0)[::-1]
+        return proxima
+
+    def ordem_conjunto(self, linha: int, chave=None) -> List[int]:
+        """
+        Ordem de iteração do `set` de números (ou de `chave(num)`) do sorteio `linha`,
+        construído da mesma forma que nos cálculos originais. Serve para reproduzir
+        a ordem de inserção dos dicionários quando há empates na mesma linha.
+        """
+        numeros = sorted(self._sorteios[linha].get('numeros', []))
+        if chave is None:
+            return list(set(numeros))
+        return list({chave(num) for num in numeros})
+
+    # --- Materialização ---
+    @classmethod
+    def contadores_por_blocos(cls, incidencia: np.ndarray, tamanho_bloco: int) -> List[Counter]:
+        """Um `Counter` (como em `contador`) para cada bloco consecutivo de `tamanho_bloco` linhas."""
+        total = incidencia.shape[0]
+        completos = total // tamanho_bloco * tamanho_bloco
+        blocos = incidencia[:completos].reshape(-1, tamanho_bloco, incidencia.shape[1])
+        contagens = blocos.sum(axis=1)
+        # Ordena por (primeira linha no bloco, número); ausentes vão para o fim
+        colunas = incidencia.shape[1]
+        chaves = np.where(contagens > 0, blocos.argmax(axis=1) * colunas + np.arange(colunas), -1)
+        ordens = np.argsort(np.where(chaves >= 0, chaves, np.iinfo(np.int64).max), axis=1, kind='stable')
+
+        contadores = []
+        for contagem, ordem in zip(contagens.tolist(), ordens.tolist()):
+            contadores.append(Counter({num + 1: contagem[num] for num in ordem if contagem[num]}))
+        if completos < total:
+            contadores.append(cls.contador(incidencia[completos:]))
+        return contadores
+
+    @staticmethod
+    def contador(incidencia: np.ndarray, contagens: np.ndarray = None) -> Counter:
+        """
+        Materializa a frequência dos números de um bloco de linhas como `Counter`,
+        com as chaves pela ordem de primeira aparição (a mesma de um `Counter.update`
+        sorteio a sorteio sobre números ordenados), preservando os desempates de `most_common`.
+        As `contagens` por número podem ser dadas se já forem conhecidas.
+        """
+        if contagens is None:
+            contagens = incidencia.sum(axis=0)
+        presentes = np.flatnonzero(contagens)
+        if presentes.size == 0:
+            return Counter()
+        primeira = incidencia[:, presentes].argmax(axis=0)
+        ordem = presentes[np.lexsort((presentes, primeira))]
+        return Counter(dict(zip((ordem + 1).tolist(), contagens[ordem].tolist())))
@@ -0,0 +1,112 @@
+# lib/perfil_heuristicas.py
+
+import os
+import json
+import datetime
+from collections import Counter
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+# Percentis de latência incluídos no resumo
+PERCENTIS = (50, 90, 99)
+
+
+def _tipo_erro(erro: str) -> str:
+    """Tipo de exceção de uma mensagem `"<Tipo>: <mensagem>"` (os tempos esgotados não têm prefixo)."""
+    if erro.startswith('tempo esgotado'):
+        return 'TempoEsgotado'
+    tipo, separador, _ = erro.partition(':')
+    return tipo if separador and tipo.isidentifier() else 'Erro'
+
+
+class PerfilHeuristicas:
+    """
+    Instrumentação das chamadas às heurísticas de um Despachante: número de chamadas,
+    tempo acumulado e percentis de latência, erros por tipo de exceção e as
+    estatísticas de que cada heurística depende.
+
+    Só contam as chamadas efetivas a `prever`/`pontuar` (as previsões servidas pela
+    cache de previsões não custam nada). `resumo()` ordena as heurísticas pelo tempo
+    total, para se verem as que dominam a execução.
+    """
+
+    def __init__(self):
+        self._registos: Dict[str, Dict[str, Any]] = {}
+
+    def _registo(self, nome: str) -> Dict[str, Any]:
+        if nome not in self._registos:
+            self._registos[nome] = {'tempos': [], 'erros': Counter(), 'dependencias': set()}
+        return self._registos[nome]
+
+    def registar(self, nome: str, duracao: float, erro: str = None, dependencias: Iterable[str] = ()):
+        """Regista uma chamada de `duracao` segundos; `erro` é a mensagem, se falhou."""
+        registo = self._registo(nome)
+        registo['tempos'].append(duracao)
+        registo['dependencias'].update(dependencias)
+        if erro is not None:
+            registo['erros'][_tipo_erro(erro)] += 1
+
+    def limpar(self):
+        self._registos.clear()
+
+    def __len__(self) -> int:
+        return len(self._registos)
+
+    # --- Resumo ---
+    def resumo(self) -> Dict[str, Dict[str, Any]]:
+        """`{heuristica: métricas}`, da heurística com mais tempo acumulado para a com menos."""
+        tempo_global = sum(sum(r['tempos']) for r in self._registos.values())
+        resumo = {}
+        for nome, registo in self._registos.items():
+            tempos = np.array(registo['tempos'])
+            total = float(tempos.sum())
+            erros = sum(registo['erros'].values())
+            metricas = {
+                'chamadas': len(tempos),
+                'erros': erros,
+                'taxa_erro': erros / len(tempos) if len(tempos) else 0.0,
+                'excecoes': dict(registo['erros'].most_common()),
+                'tempo_total': total,
+                'fracao_tempo': total / tempo_global if tempo_global else 0.0,
+                'tempo_medio': total / len(tempos) if len(tempos) else 0.0,
+                'tempo_maximo': float(tempos.max()) if len(tempos) else 0.0,
+                'dependencias': sorted(registo['dependencias']),
+            }
+            for percentil, valor in zip(PERCENTIS, np.percentile(tempos, PERCENTIS) if len(tempos) else [0.0] * len(PERCENTIS)):
+                metricas[f'p{percentil}'] = float(valor)
+            resumo[nome] = metricas
+        return dict(sorted(resumo.items(), key=lambda item: -item[1]['tempo_total']))
+
+    def exportar_json(self, caminho: str) -> Dict[str, Any]:
+        """Grava o resumo em JSON (com a data de geração) e devolve-o."""
+        conteudo = {'data_geracao': datetime.datetime.now().isoformat(), 'heuristicas': self.resumo()}
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, indent=2, ensure_ascii=False)
+        return conteudo
+
+    def linhas_resumo(self, limite: int = 10) -> List[str]:
+        """Tabela das `limite` heurísticas mais lentas (tempo total), pronta a imprimir."""
+        resumo = self.resumo()
+        if not resumo:
+            return ["⏱️  Nenhuma heurística foi executada (previsões vindas da cache)."]
+        linhas = [
+            f"⏱️  Perfil das heurísticas ({len(resumo)} executadas, {limite} mais lentas):",
+            f"  {'heurística':<32} {'chamadas':>8} {'total(s)':>9} {'%':>6} {'média(ms)':>10}"
+            f" {'p90(ms)':>9} {'p99(ms)':>9} {'erros':>6}",
+        ]
+        for nome, m in list(resumo.items())[:limite]:
+            linhas.append(
+                f"  {nome[:32]:<32} {m['chamadas']:>8} {m['tempo_total']:>9.3f} {m['fracao_tempo'] * 100:>5.1f}%"
+                f" {m['tempo_medio'] * 1000:>10.2f} {m['p90'] * 1000:>9.2f} {m['p99'] * 1000:>9.2f} {m['erros']:>6}"
+            )
+        com_erros = {nome: m['excecoes'] for nome, m in resumo.items() if m['erros']}
+        for nome, excecoes in com_erros.items():
+            linhas.append(f"  ⚠️  {nome}: " + ", ".join(f"{tipo} x{n}" for tipo, n in excecoes.items()))
+        return linhas
+
+    def imprimir_resumo(self, limite: int = 10):
+        print("\n".join(self.linhas_resumo(limite)))
@@ -0,0 +1,84 @@
+# lib/pontuacoes.py
+
+from collections.abc import Mapping
+from typing import List
+
+import numpy as np
+
+from lib.matriz_sorteios import NUMERO_MAXIMO
+
+# Pontuação dos números que uma heurística nunca sugere
+EXCLUIDO = -np.inf
+
+
+class ContagensLote:
+    """
+    Estatística do tipo `Counter` (ex.: `frequencia_total`) para T momentos:
+
+    - `contagens[t, num - 1]`: contagem do número no momento `t`;
+    - `ordem[t, num - 1]`: posição do número na ordem de iteração do `Counter`
+      (a de primeira aparição, usada por `most_common` nos empates); os números
+      ausentes ficam com `ordem == numero_maximo`.
+    """
+
+    def __init__(self, contagens: np.ndarray, ordem: np.ndarray):
+        self.contagens = contagens
+        self.ordem = ordem
+
+    @property
+    def presentes(self) -> np.ndarray:
+        return self.contagens > 0
+
+
+def _tamanho(valores: Mapping, numero_maximo: int = None) -> int:
+    """Tamanho do vetor: o dado ou 49, alargado se houver números maiores (ex.: EuroMilhões)."""
+    if numero_maximo is not None:
+        return numero_maximo
+    return max(NUMERO_MAXIMO, max(valores, default=0))
+
+
+def pontuar_contagem(contagem: Mapping, numero_maximo: int = None) -> np.ndarray:
+    """
+    Vetor de pontuações de um `Counter` que ordena os números como `most_common`:
+    a parte inteira é a contagem e a fracionária desempata pela ordem de iteração.
+    """
+    numero_maximo = _tamanho(contagem, numero_maximo)
+    pontuacoes = np.full(numero_maximo, EXCLUIDO)
+    for posicao, (num, valor) in enumerate(contagem.items()):
+        if 1 <= num <= numero_maximo and valor > 0:
+            pontuacoes[num - 1] = valor - posicao / numero_maximo
+    return pontuacoes
+
+
+def pontuar_contagens_lote(contagens: ContagensLote) -> np.ndarray:
+    """Versão em lote de `pontuar_contagem` (T x máximo)."""
+    numero_maximo = contagens.contagens.shape[1]
+    pontuacoes = contagens.contagens - contagens.ordem / numero_maximo
+    return np.where(contagens.presentes, pontuacoes, EXCLUIDO)
+
+
+def pontuar_valores(valores: Mapping, numero_maximo: int = None) -> np.ndarray:
+    """Vetor de pontuações de um dict {num: valor}; valores infinitos e números em falta ficam excluídos."""
+    numero_maximo = _tamanho(valores, numero_maximo)
+    pontuacoes = np.full(numero_maximo, EXCLUIDO)
+    for num, valor in valores.items():
+        if 1 <= num <= numero_maximo and np.isfinite(valor):
+            pontuacoes[num - 1] = valor
+    return pontuacoes
+
+
+def sugestoes_de_pontuacoes(pontuacoes: np.ndarray, n: int = 5) -> List[int]:
+    """
+    Os `n` números com maior pontuação, por ordem crescente. Em caso de empate
+    ganha o número mais baixo; números excluídos nunca são sugeridos.
+    """
+    return sugestoes_em_lote(pontuacoes[np.newaxis, :], n)[0]
+
+
+def sugestoes_em_lote(pontuacoes: np.ndarray, n: int = 5) -> List[List[int]]:
+    """`sugestoes_de_pontuacoes` para cada linha de uma matriz T x máximo."""
+    if n <= 0:
+        return [[] for _ in range(pontuacoes.shape[0])]
+    melhores = np.argsort(-pontuacoes, axis=1, kind='stable')[:, :n]
+    validos = np.isfinite(np.take_along_axis(pontuacoes, melhores, axis=1))
+    return [sorted((linha[valido] + 1).tolist()) for linha, valido in zip(melhores, validos)]
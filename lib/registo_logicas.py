@@ -0,0 +1,161 @@
+# lib/registo_logicas.py
+
+import os
+import json
+import hashlib
+import datetime
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+from lib.armazem_sorteios import PASTA_COMPILADA
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_REGISTO = os.path.join(PROJECT_ROOT, 'dados', PASTA_COMPILADA, 'registo_logicas.json')
+VERSAO_FORMATO = 1
+MAXIMO_LOGICAS = 500  # saem primeiro as sem acertos, depois as nunca avaliadas e por fim as piores
+MAXIMO_HISTORICO = 50  # avaliações guardadas no histórico de cada lógica e jogo
+
+
+def metricas(sorteios: int, soma: float, soma_quadrados: float) -> Dict[str, float]:
+    """
+    Métricas de `avaliar_desempenho_heuristicas` a partir das somas dos acertos
+    (5 números previstos por sorteio): taxa de acerto, estabilidade e score.
+    """
+    if not sorteios:
+        return {'taxa_acerto': 0.0, 'estabilidade': 0.0, 'score': 0.0}
+    media = soma / sorteios
+    desvio = np.sqrt(max(soma_quadrados / sorteios - media ** 2, 0.0))
+    taxa_acerto = media / 5.0
+    estabilidade = 1.0 - desvio / media if media else 0.0
+    return {'taxa_acerto': taxa_acerto, 'estabilidade': estabilidade,
+            'score': taxa_acerto * 0.7 + estabilidade * 0.3}
+
+
+class RegistoLogicas:
+    """
+    Registo persistente das lógicas das heurísticas dinâmicas e do seu desempenho,
+    em `dados/.compilado/registo_logicas.json`.
+
+    Cada lógica é identificada pelas funções e dependências (`identificador`) e guarda,
+    por jogo, as somas dos acertos em todos os sorteios já avaliados, o último
+    momento avaliado (com a assinatura do histórico até ao sorteio previsto) e o
+    histórico das métricas em cada avaliação. Uma reavaliação só pontua os sorteios
+    acrescentados desde então; se o histórico já avaliado mudar, a lógica volta a
+    ser avaliada de raiz nesse jogo.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_REGISTO):
+        self.caminho = caminho
+        self.logicas: Dict[str, Dict[str, Any]] = self._ler()
+
+    def _ler(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return conteudo.get('logicas', {}) if conteudo.get('versao') == VERSAO_FORMATO else {}
+
+    def gravar(self):
+        self._podar()
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': VERSAO_FORMATO, 'logicas': self.logicas}, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    def _podar(self):
+        if len(self.logicas) <= MAXIMO_LOGICAS:
+            return
+        ordem = sorted(self.logicas, key=self._ordem_poda, reverse=True)
+        self.logicas = {ident: self.logicas[ident] for ident in ordem[:MAXIMO_LOGICAS]}
+
+    def _ordem_poda(self, ident: str) -> tuple:
+        # O score de uma lógica útil é quase sempre negativo (desvio dos acertos acima
+        # da média) e o de uma sem acertos ou nunca avaliada é 0: não se comparam
+        if self.util(ident):
+            return (2, self.score(ident), self.logicas[ident]['criada'])
+        return (0 if self.logicas[ident]['jogos'] else 1, 0.0, self.logicas[ident]['criada'])
+
+    def __len__(self) -> int:
+        return len(self.logicas)
+
+    @staticmethod
+    def identificador(logica: List[str], dependencias: Iterable[str]) -> str:
+        conteudo = json.dumps([list(logica), sorted(dependencias)])
+        return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+
+    def registar(self, logica: List[str], dependencias: Iterable[str], objetivo: str = None) -> str:
+        """Acrescenta a lógica ao registo (se ainda não existir) e devolve o identificador."""
+        ident = self.identificador(logica, dependencias)
+        if ident not in self.logicas:
+            self.logicas[ident] = {
+                'logica': list(logica),
+                'dependencias': sorted(dependencias),
+                'objetivo': objetivo,
+                'criada': datetime.datetime.now().isoformat(),
+                'jogos': {},
+            }
+        return ident
+
+    # --- Avaliação incremental ---
+    def inicio_avaliacao(self, ident: str, jogo: str, dados, inicio_padrao: int) -> int:
+        """
+        Primeiro momento por avaliar da lógica em `dados` (o histórico completo do
+        jogo): o seguinte ao último avaliado ou, sem avaliação válida, `inicio_padrao`.
+        """
+        desempenho = self.logicas.get(ident, {}).get('jogos', {}).get(jogo)
+        if desempenho is None:
+            return inicio_padrao
+        ultimo = desempenho['ultimo_momento']
+        if ultimo + 2 > len(dados.sorteios) or dados.ate(ultimo + 2).assinatura() != desempenho['assinatura']:
+            del self.logicas[ident]['jogos'][jogo]
+            return inicio_padrao
+        return ultimo + 1
+
+    def acumular(self, ident: str, jogo: str, dados, acertos: Dict[int, int]):
+        """Soma os acertos `{momento: acertos}` da lógica e regista a avaliação no histórico."""
+        if not acertos:
+            return
+        desempenho = self.logicas[ident]['jogos'].setdefault(
+            jogo, {'sorteios': 0, 'soma': 0, 'soma_quadrados': 0, 'ultimo_momento': -1,
+                   'assinatura': None, 'historico': []}
+        )
+        desempenho['sorteios'] += len(acertos)
+        desempenho['soma'] += sum(acertos.values())
+        desempenho['soma_quadrados'] += sum(a * a for a in acertos.values())
+        desempenho['ultimo_momento'] = max(acertos)
+        desempenho['assinatura'] = dados.ate(desempenho['ultimo_momento'] + 2).assinatura()
+        desempenho['historico'].append({
+            'data': datetime.datetime.now().isoformat(),
+            'ultimo_momento': desempenho['ultimo_momento'],
+            'sorteios': desempenho['sorteios'],
+            **self.desempenho(ident, jogo),
+        })
+        del desempenho['historico'][:-MAXIMO_HISTORICO]
+
+    # --- Consulta ---
+    def desempenho(self, ident: str, jogo: str) -> Dict[str, float]:
+        """Métricas acumuladas da lógica no jogo (zeros se nunca foi avaliada)."""
+        desempenho = self.logicas.get(ident, {}).get('jogos', {}).get(jogo, {})
+        return metricas(desempenho.get('sorteios', 0), desempenho.get('soma', 0), desempenho.get('soma_quadrados', 0))
+
+    def util(self, ident: str, jogo: str = None) -> bool:
+        """Se a lógica já acertou algum número no jogo (ou, sem jogo, em algum jogo)."""
+        jogos = [jogo] if jogo is not None else list(self.logicas.get(ident, {}).get('jogos', {}))
+        return any(self.desempenho(ident, j)['taxa_acerto'] > 0 for j in jogos)
+
+    def score(self, ident: str, jogo: str = None) -> float:
+        """Score da lógica no jogo ou, sem jogo, o melhor entre os jogos em que foi avaliada."""
+        jogos = [jogo] if jogo is not None else list(self.logicas.get(ident, {}).get('jogos', {}))
+        return max((self.desempenho(ident, j)['score'] for j in jogos), default=0.0)
+
+    def melhores(self, quantidade: int, jogo: str = None) -> List[Dict[str, Any]]:
+        """
+        As `quantidade` lógicas com melhor score (ver `score`) entre as que já acertaram
+        algum número (`util`); as sem acertos ou nunca avaliadas ficam de fora.
+        """
+        avaliadas = [ident for ident in self.logicas if self.util(ident, jogo)]
+        avaliadas.sort(key=lambda ident: self.score(ident, jogo), reverse=True)
+        return [dict(self.logicas[ident], identificador=ident) for ident in avaliadas[:quantidade]]
@@ -0,0 +1,101 @@
+# /scripts/benchmark_despachante.py
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+# Adiciona o diretório raiz para resolver as importações
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from lib.manifesto_heuristicas import ARQUIVO_MANIFESTO
+
+PASTA_HEURISTICAS = os.path.join(PROJECT_ROOT, 'heuristicas')
+
+# Cada medição corre num processo novo, para que nenhum módulo venha já importado
+CODIGO_MEDICAO = """
+import sys, time, json
+sys.path.insert(0, {raiz!r})
+inicio = time.perf_counter()
+from {modulo} import Despachante
+importacao = time.perf_counter() - inicio
+inicio = time.perf_counter()
+despachante = Despachante({argumentos})
+construtor = time.perf_counter() - inicio
+despachante.obter_todas_dependencias()
+metadados = time.perf_counter() - inicio
+carregadas = len(despachante.heuristicas.items())
+completo = time.perf_counter() - inicio
+print(json.dumps({{'importacao': importacao, 'construtor': construtor, 'metadados': metadados,
+                  'completo': completo, 'heuristicas': carregadas}}))
+"""
+
+DESPACHANTES = {
+    'despachante': ('lib.despachante', ''),
+    'despachante_new': ('lib.despachante_new', 'usar_dinamicas=False'),
+}
+
+
+def medir(despachante: str, frio: bool) -> dict:
+    """Uma medição num processo novo; `frio` apaga antes o manifesto das heurísticas."""
+    if frio:
+        caminho_manifesto = os.path.join(PASTA_HEURISTICAS, ARQUIVO_MANIFESTO)
+        if os.path.exists(caminho_manifesto):
+            os.remove(caminho_manifesto)
+    modulo, argumentos = DESPACHANTES[despachante]
+    codigo = CODIGO_MEDICAO.format(raiz=PROJECT_ROOT, modulo=modulo, argumentos=argumentos)
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr.strip().splitlines()[-1] if saida.stderr else 'erro desconhecido')
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def executar_benchmark(repeticoes: int = 5) -> dict:
+    """
+    Mede o arranque de cada Despachante com o manifesto das heurísticas por gerar
+    (frio) e já em cache (quente). Para cada caso regista a mediana de:
+    - `importacao`: importar o módulo do Despachante (igual nos dois casos);
+    e do tempo, desde a chamada ao construtor, até:
+    - `construtor`: o Despachante estar criado;
+    - `metadados`: `obter_todas_dependencias()` (não importa nenhuma heurística);
+    - `completo`: todas as heurísticas importadas e instanciadas (o custo antigo do construtor).
+    """
+    resultados = {}
+    for despachante in DESPACHANTES:
+        resultados[despachante] = {}
+        for caso, frio in (('frio', True), ('quente', False)):
+            medicoes = [medir(despachante, frio) for _ in range(repeticoes)]
+            resultados[despachante][caso] = {
+                chave: statistics.median(m[chave] for m in medicoes)
+                for chave in ('importacao', 'construtor', 'metadados', 'completo')
+            }
+            resultados[despachante][caso]['heuristicas'] = medicoes[-1]['heuristicas']
+    return resultados
+
+
+def imprimir_relatorio(resultados: dict):
+    print("\n" + "=" * 60)
+    print("⏱️  ARRANQUE DO DESPACHANTE (mediana, segundos)")
+    print("=" * 60)
+    for despachante, casos in resultados.items():
+        print(f"\n{despachante} ({casos['quente']['heuristicas']} heurísticas)")
+        print(f"  {'caso':<8} {'importacao':>12} {'construtor':>12} {'metadados':>12} {'completo':>12}")
+        for caso, tempos in casos.items():
+            print(f"  {caso:<8} {tempos['importacao']:>12.4f} {tempos['construtor']:>12.4f}"
+                  f" {tempos['metadados']:>12.4f} {tempos['completo']:>12.4f}")
+        ganho = casos['frio']['construtor'] / max(casos['quente']['construtor'], 1e-9)
+        print(f"  Construtor quente {ganho:.1f}x mais rápido do que frio")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mede o arranque a frio e a quente do Despachante')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Número de processos medidos por caso (default: 5)')
+    args = parser.parse_args()
+
+    imprimir_relatorio(executar_benchmark(args.repeticoes))
@@ -3,15 +3,24 @@ GERADOR DE LÓGICAS ESCALÁVEL ULTRA - Para 800+ Funções com UniversalWrapper
 Sistema inteligente para compor sequências de funções matemáticas avançadas
 """
 
+import os
+import zlib
+import queue
 import random
+import pickle
+import multiprocessing as mp
 import numpy as np
 from typing import List, Dict, Any, Tuple, Set, Optional, Callable
 import json
+import hashlib
 import logging
 import inspect
 import time
 from functools import lru_cache
 from universal_wrapper import UniversalWrapper
+from lib.executor_heuristicas import com_limite, recolher_com_prazo, TempoEsgotado
+from lib.cache_aptidao import CacheAptidao
+from lib.assinaturas_funcoes import IndiceAssinaturas
 
 # Configurar logging avançado
 logging.basicConfig(
@@ -24,13 +33,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Limite (segundos) da avaliação de cada indivíduo da evolução
+TIMEOUT_INDIVIDUO = 10.0
+# Lotes por processo em cada avaliação de população (equilibra a carga entre processos)
+LOTES_POR_PROCESSO = 4
+# Modelo de ilhas: espera máxima (segundos) pelos migrantes da ilha vizinha
+TIMEOUT_MIGRACAO = 300.0
+# Métodos cujo código determina a avaliação de uma lógica (entram na chave da cache de aptidão)
+METODOS_AVALIACAO = ('avaliar_logica_avancada', 'executar_logica_com_monitoramento',
+                     '_gerar_dados_teste_avancado', '_calcular_complexidade_logica')
+
 class AnalisadorTiposFuncoesAvancado:
     """
     Analisador avançado para mapear tipos e compatibilidades das 506+ funções
+
+    Com um índice de assinaturas sondadas (`IndiceAssinaturas`), os tipos e a
+    compatibilidade das funções sondadas vêm do índice; as restantes usam o
+    mapeamento manual.
     """
     
-    def __init__(self, wrapper):
+    def __init__(self, wrapper, assinaturas: IndiceAssinaturas = None):
         self.wrapper = wrapper
+        self.assinaturas = assinaturas
         self.mapeamento_tipos = self._construir_mapeamento_completo()
         self.grafo_compatibilidade = self._construir_grafo_compatibilidade()
     
@@ -205,18 +229,27 @@ class AnalisadorTiposFuncoesAvancado:
     
     def obter_tipo_saida(self, nome_funcao: str) -> str:
         """Obtém o tipo de saída de uma função"""
+        if self.assinaturas is not None and self.assinaturas.tipo_saida(nome_funcao):
+            return self.assinaturas.tipo_saida(nome_funcao)
         if nome_funcao in self.mapeamento_tipos:
             return self.mapeamento_tipos[nome_funcao]['saida']
         return 'numerico'  # Fallback padrão
     
     def obter_tipo_entrada(self, nome_funcao: str) -> str:
         """Obtém o tipo de entrada de uma função"""
+        if self.assinaturas is not None and self.assinaturas.tipo_entrada(nome_funcao):
+            return self.assinaturas.tipo_entrada(nome_funcao)
         if nome_funcao in self.mapeamento_tipos:
             return self.mapeamento_tipos[nome_funcao]['entrada']
         return 'numerico'  # Fallback padrão
     
     def sao_compatíveis(self, tipo_saida: str, nome_funcao_destino: str) -> bool:
         """Verifica se dois tipos são compatíveis"""
+        if self.assinaturas is not None:
+            # A sondagem diz diretamente que entradas a função aceita
+            aceita = self.assinaturas.aceita(nome_funcao_destino, tipo_saida)
+            if aceita is not None:
+                return aceita
         tipo_entrada_destino = self.obter_tipo_entrada(nome_funcao_destino)
         
         if tipo_saida in self.grafo_compatibilidade:
@@ -224,26 +257,105 @@ class AnalisadorTiposFuncoesAvancado:
         
         return tipo_saida == tipo_entrada_destino
 
+# --- Avaliação de populações em processos de trabalho ---
+_avaliador_worker: Dict[str, Any] = {}
+
+
+def _iniciar_avaliador(gerador: bytes):
+    """Recebe o gerador (wrapper e analisador de tipos) uma vez por processo."""
+    _avaliador_worker['gerador'] = pickle.loads(gerador)
+
+
+def _avaliar_lote(lote: List[Tuple[List[str], int]], num_testes: int, timeout: float) -> List[Dict[str, Any]]:
+    """Avalia um lote de (lógica, semente) no gerador do processo."""
+    gerador = _avaliador_worker['gerador']
+    return [gerador._avaliar_individuo(logica, semente, num_testes, timeout) for logica, semente in lote]
+
+
+def _evoluir_ilha(gerador: bytes, indice: int, estrategia: str, tamanho_populacao: int, geracoes: int,
+                  intervalo_migracao: int, num_migrantes: int, semente: Optional[int],
+                  caminho_cache_aptidao: Optional[str], entrada, saida, resultados):
+    """
+    Evolui uma ilha (processo próprio) e devolve a população final em `resultados`.
+    De `intervalo_migracao` em `intervalo_migracao` gerações, as `num_migrantes`
+    melhores lógicas seguem para a ilha seguinte (`saida`) e as que chegam da
+    anterior (`entrada`) substituem as piores.
+    """
+    gerador = pickle.loads(gerador)
+    if caminho_cache_aptidao is not None:
+        gerador.cache_aptidao = CacheAptidao(caminho_cache_aptidao)
+    # A semente das avaliações é a mesma em todas as ilhas (os scores dos migrantes
+    # são comparáveis); a da seleção, cruzamento e mutação é própria de cada ilha
+    gerador.semente = semente
+    if semente is not None:
+        random.seed(semente + indice)
+        np.random.seed((semente + indice) % 2 ** 32)
+
+    def migrar(geracao: int, populacao: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if (geracao + 1) % intervalo_migracao or geracao + 1 == geracoes:
+            return populacao
+        populacao.sort(key=lambda x: x['score'], reverse=True)
+        saida.put(populacao[:num_migrantes])
+        try:
+            chegados = entrada.get(timeout=TIMEOUT_MIGRACAO)
+        except queue.Empty:
+            logger.warning(f"⚠️ Ilha {indice}: sem migrantes na geração {geracao}")
+            return populacao
+        presentes = {tuple(p['logica']) for p in populacao}
+        novos = [m for m in chegados if tuple(m['logica']) not in presentes]
+        for migrante in novos:
+            gerador.cache_validacao.setdefault(tuple(migrante['logica']), migrante)
+        return populacao[:len(populacao) - len(novos)] + novos
+
+    populacao = gerador._evoluir(tamanho_populacao, geracoes, estrategia, migrar)
+    logger.info(f"🏝️ Ilha {indice} ({estrategia}): melhor score {populacao[0]['score']:.3f}")
+    resultados.put((indice, populacao))
+
+
+@lru_cache(maxsize=None)
+def _versao_avaliacao(classe: type) -> str:
+    """Hash do código de avaliação de lógicas de `classe` (ver `METODOS_AVALIACAO`)."""
+    resumo = hashlib.sha1()
+    for nome in METODOS_AVALIACAO:
+        try:
+            resumo.update(inspect.getsource(getattr(classe, nome)).encode('utf-8'))
+        except (TypeError, OSError):
+            resumo.update(nome.encode('utf-8'))
+    return resumo.hexdigest()
+
+
 class GeradorLogicasEscalavelUltra:
     """
     Gerador ultra-escalável para 800+ funções com UniversalWrapper
     """
     
-    def __init__(self, wrapper=None):
+    def __init__(self, wrapper=None, usar_cache_aptidao: bool = True, assinaturas: IndiceAssinaturas = None):
         self.wrapper = wrapper or UniversalWrapper()
-        self.analisador_tipos = AnalisadorTiposFuncoesAvancado(self.wrapper)
+        # Assinaturas sondadas (`scripts/sondar_funcoes.py`) e custo medido
+        # (`ModeloCusto`): só entram nas lógicas as funções viáveis e só se encadeiam
+        # funções de tipos compatíveis
+        self.assinaturas = assinaturas if assinaturas is not None else IndiceAssinaturas()
+        self.analisador_tipos = AnalisadorTiposFuncoesAvancado(self.wrapper, self.assinaturas)
         self.categorias_dinamicas = self._categorizar_funcoes_dinamicamente()
         self.logicas_avaliadas = []
         self.cache_validacao = {}
         self.estatisticas_execucao = {}
+        # Avaliação das populações (ver `avaliar_populacao`)
+        self.timeout_individuo = TIMEOUT_INDIVIDUO
+        self.semente = None
+        self._pool = None
+        self._processos = 1
+        # Avaliações persistentes entre execuções (ver `CacheAptidao`)
+        self.cache_aptidao = CacheAptidao() if usar_cache_aptidao else None
         
         logger.info(f"🚀 GERADOR ULTRA inicializado com {len(self._obter_todas_funcoes())} funções")
         logger.info(f"📊 {len(self.categorias_dinamicas)} categorias dinâmicas detectadas")
     
     def _obter_todas_funcoes(self) -> List[str]:
-        """Obtém automaticamente todas as funções do wrapper"""
+        """Obtém automaticamente todas as funções do wrapper (só as viáveis, ver `IndiceAssinaturas.viavel`)"""
         return [attr for attr in dir(self.wrapper) 
-                if not attr.startswith('_') and callable(getattr(self.wrapper, attr))]
+                if not attr.startswith('_') and callable(getattr(self.wrapper, attr))
+                and self.assinaturas.viavel(attr)]
     
     def _categorizar_funcoes_dinamicamente(self) -> Dict[str, List[str]]:
         """Categoriza automaticamente todas as funções disponíveis"""
@@ -473,6 +585,8 @@ class GeradorLogicasEscalavelUltra:
                     estatisticas['erros'].append(f"Função {funcao} não encontrada")
                     logger.warning(f"⚠️ Função {funcao} não encontrada")
                     
+            except TempoEsgotado:
+                raise
             except Exception as e:
                 erro_msg = f"Erro em {funcao} (posição {i+1}): {str(e)}"
                 estatisticas['erros'].append(erro_msg)
@@ -484,6 +598,14 @@ class GeradorLogicasEscalavelUltra:
             'estatisticas': estatisticas,
             'sucesso': len(estatisticas['erros']) == 0
         }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Enviado aos processos de avaliação: sem a pool nem as caches do processo principal
+        estado = self.__dict__.copy()
+        estado['_pool'] = None
+        estado['cache_validacao'] = {}
+        estado['cache_aptidao'] = None
+        return estado
     
     def avaliar_logica_avancada(self, logica: List[str], num_testes: int = 8) -> Dict[str, Any]:
         """
@@ -522,6 +644,8 @@ class GeradorLogicasEscalavelUltra:
                     
                     resultados.append(resultado)
                     
+            except TempoEsgotado:
+                raise
             except Exception as e:
                 logger.debug(f"Teste falhou: {e}")
                 continue
@@ -552,6 +676,112 @@ class GeradorLogicasEscalavelUltra:
         
         self.cache_validacao[cache_key] = avaliacao
         return avaliacao
+
+    def semente_individuo(self, logica: List[str]) -> int:
+        """
+        Semente dos dados de teste de uma lógica: depende só da lógica e da semente da
+        evolução, pelo que a avaliação não depende da ordem nem do processo em que corre.
+        """
+        return (zlib.crc32(json.dumps(list(logica)).encode('utf-8')) + (self.semente or 0)) % 2 ** 32
+
+    def _avaliar_individuo(self, logica: List[str], semente: int, num_testes: int = 8,
+                           timeout: float = None) -> Dict[str, Any]:
+        """
+        `avaliar_logica_avancada` com os geradores aleatórios iniciados em `semente`
+        (e repostos no fim) e interrompida ao fim de `timeout` segundos, caso em que
+        a lógica fica com score 0.
+        """
+        estado_random, estado_numpy = random.getstate(), np.random.get_state()
+        random.seed(semente)
+        np.random.seed(semente)
+        try:
+            return com_limite(lambda: self.avaliar_logica_avancada(logica, num_testes), timeout)
+        except TempoEsgotado as e:
+            logger.warning(f"⏱️ Lógica {' → '.join(logica)}: {e}")
+            avaliacao = self._avaliacao_esgotada(logica, str(e))
+            self.cache_validacao[tuple(logica)] = avaliacao
+            return avaliacao
+        finally:
+            random.setstate(estado_random)
+            np.random.set_state(estado_numpy)
+
+    def _avaliacao_esgotada(self, logica: List[str], erro: str) -> Dict[str, Any]:
+        """Avaliação (score 0) de uma lógica interrompida por tempo esgotado."""
+        return {
+            'logica': logica,
+            'score': 0.0,
+            'taxa_sucesso': 0.0,
+            'tempo_medio': float('inf'),
+            'estabilidade': 0.0,
+            'num_funcoes': len(logica),
+            'complexidade_estimada': self._calcular_complexidade_logica(logica),
+            'categorias_envolvidas': list(set(self.analisador_tipos.categorizar_funcao(f) for f in logica)),
+            'erro': erro
+        }
+
+    def avaliar_populacao(self, logicas: List[List[str]], num_testes: int = 8) -> List[Dict[str, Any]]:
+        """
+        Avaliações de várias lógicas (ver `avaliar_logica_avancada`), pela ordem dada.
+
+        As lógicas que ainda não estão na cache em memória são procuradas de uma vez na
+        cache de aptidão persistente e as restantes são avaliadas uma vez cada: em lotes,
+        na pool de processos da evolução em curso, ou neste processo se não houver pool.
+        Cada indivíduo usa a sua semente (`semente_individuo`) e o limite
+        `timeout_individuo`, pelo que o resultado não depende do número de processos.
+        Os lotes que não terminam dentro do prazo global da população (lógicas presas
+        em código que não responde ao sinal) ficam com score 0 e a pool é recriada.
+        """
+        em_falta = list(dict.fromkeys(tuple(logica) for logica in logicas
+                                      if tuple(logica) not in self.cache_validacao))
+        chaves = {}
+        if em_falta and self.cache_aptidao is not None:
+            versao = _versao_avaliacao(type(self))
+            chaves = {
+                chave: self.cache_aptidao.gerar_chave_logica(
+                    self.wrapper, chave, self.semente_individuo(chave), num_testes, versao, self.timeout_individuo
+                )
+                for chave in em_falta
+            }
+            guardadas = self.cache_aptidao.obter_varios(list(chaves.values()))
+            for chave, chave_cache in chaves.items():
+                if chave_cache in guardadas:
+                    self.cache_validacao[chave] = guardadas[chave_cache]
+            em_falta = [chave for chave in em_falta if chave not in self.cache_validacao]
+        tarefas = [(list(chave), self.semente_individuo(chave)) for chave in em_falta]
+        if self._pool is not None and len(tarefas) > 1:
+            tamanho_lote = max(1, -(-len(tarefas) // (self._processos * LOTES_POR_PROCESSO)))
+            lotes = [tarefas[i:i + tamanho_lote] for i in range(0, len(tarefas), tamanho_lote)]
+            pendentes = {i: self._pool.apply_async(_avaliar_lote, (lote, num_testes, self.timeout_individuo))
+                         for i, lote in enumerate(lotes)}
+            avaliados, falhas = recolher_com_prazo(pendentes, self.timeout_individuo,
+                                                   -(-len(tarefas) // self._processos))
+            for falha in falhas.values():
+                if not isinstance(falha, mp.TimeoutError):
+                    raise falha
+            for i, lote in enumerate(lotes):
+                if i in avaliados:
+                    avaliacoes = avaliados[i]
+                else:
+                    avaliacoes = [self._avaliacao_esgotada(logica, f"tempo esgotado ({self.timeout_individuo:g}s)")
+                                  for logica, _ in lote]
+                for (logica, _), avaliacao in zip(lote, avaliacoes):
+                    self.cache_validacao[tuple(logica)] = avaliacao
+            if falhas:
+                logger.warning("⏱️ Prazo da população esgotado: a recriar a pool de avaliação")
+                processos = self._processos
+                self._fechar_pool()
+                self._abrir_pool(processos)
+        else:
+            for logica, semente in tarefas:
+                self._avaliar_individuo(logica, semente, num_testes, self.timeout_individuo)
+        if self.cache_aptidao is not None:
+            # As lógicas interrompidas por tempo esgotado não ficam guardadas: o tempo
+            # depende da carga da máquina e voltam a ser avaliadas na próxima execução
+            self.cache_aptidao.guardar_varios([
+                (chaves[chave], ' → '.join(chave), self.cache_validacao[chave]) for chave in em_falta
+                if 'erro' not in self.cache_validacao[chave]
+            ])
+        return [self.cache_validacao[tuple(logica)] for logica in logicas]
     
     def _calcular_complexidade_logica(self, logica: List[str]) -> float:
         """Calcula complexidade estimada da lógica"""
@@ -583,24 +813,117 @@ class GeradorLogicasEscalavelUltra:
     def evoluir_logicas_avancado(self, 
                                tamanho_populacao: int = 40,
                                geracoes: int = 25,
-                               estrategia: str = "balanceada") -> List[Dict[str, Any]]:
+                               estrategia: str = "balanceada",
+                               max_workers: int = None,
+                               semente: int = None,
+                               timeout_individuo: float = None) -> List[Dict[str, Any]]:
         """
         Algoritmo genético avançado para evolução de lógicas
+
+        Cada geração é avaliada de uma vez (`avaliar_populacao`) numa pool de
+        `max_workers` processos (por omissão um por núcleo; 1 avalia neste processo),
+        com `timeout_individuo` segundos por lógica. Com `semente` a evolução é
+        determinística, qualquer que seja o número de processos.
         """
-        logger.info(f"🧬 EVOLUÇÃO AVANÇADA: {tamanho_populacao} lógicas, {geracoes} gerações")
-        
+        processos = max(1, max_workers or os.cpu_count() or 1)
+        logger.info(f"🧬 EVOLUÇÃO AVANÇADA: {tamanho_populacao} lógicas, {geracoes} gerações, {processos} processos")
+        
+        if semente is not None:
+            random.seed(semente)
+            np.random.seed(semente % 2 ** 32)
+        self.semente = semente
+        if timeout_individuo is not None:
+            self.timeout_individuo = timeout_individuo
+        if processos > 1:
+            self._abrir_pool(processos)
+        try:
+            return self._evoluir(tamanho_populacao, geracoes, estrategia)
+        finally:
+            self._fechar_pool()
+
+    def _abrir_pool(self, processos: int):
+        """Pool de avaliação de `processos` processos, cada um com uma cópia do gerador."""
+        self._pool = mp.get_context().Pool(processos, _iniciar_avaliador, (pickle.dumps(self),))
+        self._processos = processos
+
+    def _fechar_pool(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool, self._processos = None, 1
+
+    def evoluir_ilhas(self,
+                      num_ilhas: int = 4,
+                      tamanho_populacao: int = 40,
+                      geracoes: int = 25,
+                      estrategias: Tuple[str, ...] = ("balanceada", "exploratoria"),
+                      intervalo_migracao: int = 5,
+                      num_migrantes: int = 2,
+                      semente: int = None,
+                      timeout_individuo: float = None) -> List[Dict[str, Any]]:
+        """
+        Modelo de ilhas: `num_ilhas` populações de `tamanho_populacao` lógicas evoluem
+        em processos separados, cada uma com uma estratégia (`estrategias`, em rotação),
+        e trocam as `num_migrantes` melhores lógicas em anel de `intervalo_migracao` em
+        `intervalo_migracao` gerações (filas locais). Devolve as 15 melhores lógicas de
+        todas as ilhas, como `evoluir_logicas_avancado`.
+        """
+        logger.info(f"🏝️ EVOLUÇÃO EM ILHAS: {num_ilhas} ilhas de {tamanho_populacao} lógicas, {geracoes} gerações, "
+                    f"migração de {num_migrantes} a cada {intervalo_migracao}")
+        if timeout_individuo is not None:
+            self.timeout_individuo = timeout_individuo
+        contexto = mp.get_context()
+        filas = [contexto.Queue() for _ in range(num_ilhas)]
+        resultados = contexto.Queue()
+        gerador = pickle.dumps(self)
+        caminho_cache = self.cache_aptidao.caminho if self.cache_aptidao is not None else None
+        processos = [
+            contexto.Process(target=_evoluir_ilha, args=(
+                gerador, i, estrategias[i % len(estrategias)], tamanho_populacao, geracoes,
+                max(1, intervalo_migracao), num_migrantes, semente, caminho_cache,
+                filas[i], filas[(i + 1) % num_ilhas], resultados
+            ))
+            for i in range(num_ilhas)
+        ]
+        for processo in processos:
+            processo.start()
+
+        finais = {}
+        while len(finais) < num_ilhas:
+            try:
+                indice, populacao = resultados.get(timeout=1.0)
+                finais[indice] = populacao
+            except queue.Empty:
+                if not any(processo.is_alive() for processo in processos) and resultados.empty():
+                    logger.error(f"❌ {num_ilhas - len(finais)} ilhas terminaram sem resultado")
+                    break
+        for processo in processos:
+            processo.join()
+
+        # Junta as ilhas (pela ordem das ilhas, para um resultado determinístico)
+        unicas = {}
+        for indice in sorted(finais):
+            for avaliacao in finais[indice]:
+                unicas.setdefault(tuple(avaliacao['logica']), avaliacao)
+        self.cache_validacao.update(unicas)
+        populacao = sorted(unicas.values(), key=lambda x: x['score'], reverse=True)
+        if populacao:
+            logger.info(f"🏆 EVOLUÇÃO EM ILHAS COMPLETA. Melhor score: {populacao[0]['score']:.3f}")
+        return populacao[:15]
+
+    def _evoluir(self, tamanho_populacao: int, geracoes: int, estrategia: str,
+                 migrar: Callable[[int, List[Dict]], List[Dict]] = None) -> List[Dict[str, Any]]:
         # População inicial diversificada
-        populacao = []
-        while len(populacao) < tamanho_populacao:
+        logicas_iniciais = []
+        while len(logicas_iniciais) < tamanho_populacao:
             complexidade = random.choice(["simples", "media", "avancada"])
             logica = self.gerar_logica_inteligente_avancada(complexidade=complexidade)
             
-            if logica and logica not in [p['logica'] for p in populacao]:
-                avaliacao = self.avaliar_logica_avancada(logica)
-                populacao.append(avaliacao)
+            if logica and logica not in logicas_iniciais:
+                logicas_iniciais.append(logica)
+        populacao = self.avaliar_populacao(logicas_iniciais)
         
         estrategias_evolucao = {
-            "exploratoria": self._evolucao_exploratoria,
             "exploratoria": self._evolucao_exploratoria,
             "balanceada": self._evolucao_balanceada
         }
@@ -609,6 +932,8 @@ class GeradorLogicasEscalavelUltra:
         
         for geracao in range(geracoes):
             populacao = estrategia_fn(populacao, tamanho_populacao, geracao)
+            if migrar is not None:
+                populacao = migrar(geracao, populacao)
             
             # Log detalhado
             if geracao % 5 == 0:
@@ -632,7 +957,9 @@ class GeradorLogicasEscalavelUltra:
         # Elitismo (20% melhores)
         nova_populacao = populacao[:max(8, tamanho_populacao // 5)]
         
-        while len(nova_populacao) < tamanho_populacao:
+        # Os filhos são gerados primeiro e avaliados todos de uma vez
+        filhos = []
+        while len(nova_populacao) + len(filhos) < tamanho_populacao:
             # Seleção adaptativa baseada na geração
             if geracao < 10:
                 # Fase inicial: mais exploração
@@ -653,12 +980,43 @@ class GeradorLogicasEscalavelUltra:
             if random.random() < taxa_mutacao:
                 filho_logica = self._mutar_avancado(filho_logica)
             
-            # Avaliar e adicionar
             if filho_logica:
-                avaliacao_filho = self.avaliar_logica_avancada(filho_logica)
-                nova_populacao.append(avaliacao_filho)
+                # Cópia: a mutação altera a lista no lugar e a mesma lógica pode voltar a ser escolhida
+                filhos.append(list(filho_logica))
+        
+        return nova_populacao + self.avaliar_populacao(filhos)
+
+    def _evolucao_exploratoria(self, populacao: List[Dict], tamanho_populacao: int, geracao: int) -> List[Dict]:
+        """Estratégia de evolução exploratória: pouco elitismo, muita mutação e lógicas novas"""
+        populacao.sort(key=lambda x: x['score'], reverse=True)
+        
+        # Elitismo reduzido (10% melhores)
+        nova_populacao = populacao[:max(2, tamanho_populacao // 10)]
+        
+        filhos = []
+        # Imigrantes: 20% de lógicas novas em cada geração
+        while len(filhos) < tamanho_populacao // 5:
+            logica = self.gerar_logica_inteligente_avancada(complexidade=random.choice(["simples", "avancada"]))
+            if logica:
+                filhos.append(logica)
+        
+        while len(nova_populacao) + len(filhos) < tamanho_populacao:
+            # Seleção em toda a população
+            pai1, pai2 = random.sample(populacao, 2)
+            
+            if random.random() < 0.6:
+                filho_logica = self._crossover_avancado(pai1['logica'], pai2['logica'])
+            else:
+                filho_logica = random.choice([pai1['logica'], pai2['logica']])
+            
+            # Mutação frequente
+            if random.random() < 0.4:
+                filho_logica = self._mutar_avancado(list(filho_logica))
+            
+            if filho_logica:
+                filhos.append(list(filho_logica))
         
-        return nova_populacao
+        return nova_populacao + self.avaliar_populacao(filhos)
     
     def _crossover_avancado(self, logica1: List[str], logica2: List[str]) -> List[str]:
         """Crossover avançado que preserva compatibilidade"""
@@ -14,6 +14,7 @@ if PROJECT_ROOT not in sys.path:
 
 from lib.dados import Dados
 from lib.despachante import Despachante
+from decisor.tensor_previsoes import TensorPrevisoes
 
 # Caminhos de ficheiro
 RELATORIOS_DIR = os.path.join(PROJECT_ROOT, "relatorios")
@@ -116,9 +117,8 @@ def main():
         return
 
     # Usa a nova classe Despachante para carregar as heurísticas
-    despachante = Despachante()
+    despachante = Despachante(usar_cache_previsoes=True)
     metadados_heuristicas = despachante.obter_metadados()
-    todas_dependencias = despachante.obter_todas_dependencias()
     
     if not metadados_heuristicas:
         print("Nenhuma heurística encontrada. O processo será encerrado.")
@@ -129,19 +129,15 @@ def main():
     print("Simulando previsões de heurísticas para dados históricos...")
     previsoes_por_sorteio = defaultdict(dict)
     
-    for i in range(len(sorteios) - 1):
-        historico_parcial = sorteios[:i+1]
-        
-        # Cria uma instância temporária de Dados para calcular estatísticas com o histórico parcial
-        dados_parciais = Dados()
-        dados_parciais.sorteios = historico_parcial
-        estatisticas, _ = dados_parciais.obter_estatisticas(todas_dependencias)
-        
-        # Obtém as previsões do despachante para o próximo sorteio
-        previsoes_sorteio_atual = despachante.get_previsoes(estatisticas)
-        
+    # As previsões para cada sorteio vêm do tensor persistente de previsões (a linha i
+    # é a previsão para o sorteio i + 1); só o que ainda lá não está é simulado
+    tensor = TensorPrevisoes.para_dados(dados_manager).atualizar(dados_manager, despachante)
+    previsoes_tensor = tensor.previsoes(0, len(sorteios) - 1, list(metadados_heuristicas))
+    for i, previsoes_sorteio_atual in enumerate(previsoes_tensor):
         for nome_heuristica, numeros_previstos in previsoes_sorteio_atual.items():
-            previsoes_por_sorteio[sorteios[i+1]['concurso']][nome_heuristica] = numeros_previstos
+            # Previsões vazias no tensor são heurísticas que falharam nesse sorteio
+            if numeros_previstos:
+                previsoes_por_sorteio[sorteios[i+1]['concurso']][nome_heuristica] = numeros_previstos
 
     print("Pré-cálculo concluído. A gerar o relatório detalhado...")
     relatorio = analisar_performance_detalhada(sorteios, previsoes_por_sorteio, descricoes_heuristicas)
@@ -0,0 +1,44 @@
+# /scripts/medir_custo_funcoes.py
+
+import os
+import sys
+
+# Adiciona o diretório raiz para resolver as importações
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from lib.custo_funcoes import ModeloCusto, TAMANHOS_PADRAO, TIMEOUT_MEDICAO
+
+
+def imprimir_relatorio(modelo: ModeloCusto, limite: int = 20):
+    custos = sorted(modelo.funcoes.items(), key=lambda item: -item[1]['custo'])
+    print("\n" + "=" * 60)
+    print(f"⏱️  CUSTO DAS FUNÇÕES ({len(custos)} medidas, {limite} mais lentas)")
+    print("=" * 60)
+    print(f"  {'função':<36} " + " ".join(f"{f'n={t}(ms)':>11}" for t in TAMANHOS_PADRAO))
+    for nome, registo in custos[:limite]:
+        tempos = [registo['por_tamanho'].get(str(t)) for t in TAMANHOS_PADRAO]
+        print(f"  {nome[:36]:<36} " + " ".join(f"{t * 1000:>11.2f}" if t is not None else f"{'-':>11}" for t in tempos))
+    com_erro = sum(1 for registo in modelo.funcoes.values() if registo['erro'])
+    if com_erro:
+        print(f"  ⚠️  {com_erro} funções falharam ou esgotaram o tempo na medição")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mede e grava o custo das funções das heurísticas dinâmicas')
+    parser.add_argument('funcoes', nargs='*', help='Funções a medir (default: todas as dos wrappers)')
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help='Chamadas medidas por tamanho de entrada (default: 3)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_MEDICAO,
+                        help=f'Limite de cada chamada, em segundos (default: {TIMEOUT_MEDICAO:g})')
+    parser.add_argument('--forcar', action='store_true', help='Volta a medir as funções já medidas')
+    parser.add_argument('--limite', type=int, default=20, help='Funções mostradas no relatório (default: 20)')
+    args = parser.parse_args()
+
+    modelo = ModeloCusto()
+    medidas = modelo.medir(args.funcoes or None, args.repeticoes, args.timeout, args.forcar)
+    print(f"✅ {len(medidas)} funções medidas → {modelo.caminho}")
+    imprimir_relatorio(modelo, args.limite)
@@ -0,0 +1,46 @@
+# /scripts/sondar_funcoes.py
+
+import os
+import sys
+from collections import Counter
+
+# Adiciona o diretório raiz para resolver as importações
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from lib.assinaturas_funcoes import IndiceAssinaturas, ENTRADAS_CANONICAS, TIMEOUT_SONDAGEM
+
+
+def imprimir_relatorio(indice: IndiceAssinaturas):
+    resumo = indice.resumo()
+    print("\n" + "=" * 60)
+    print(f"🔎 ASSINATURAS DAS FUNÇÕES ({resumo['sondadas']} sondadas)")
+    print("=" * 60)
+    print(f"  Viáveis: {resumo['viaveis']}  |  Sem nenhuma entrada aceite: {resumo['sem_entrada']}"
+          f"  |  Acima de {indice.custo_maximo * 1000:g} ms: {resumo['lentas']}")
+    print("\n  Entradas aceites:")
+    for tipo in ENTRADAS_CANONICAS:
+        aceites = sum(1 for registo in indice.funcoes.values() if tipo in registo['aceita'])
+        print(f"    {tipo:<20} {aceites:>5}")
+    print("\n  Tipos de saída:")
+    for tipo, n in Counter(registo['saida'] for registo in indice.funcoes.values() if registo['saida']).most_common():
+        print(f"    {tipo:<20} {n:>5}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from lib.universal_wrapper import UniversalWrapper
+
+    parser = argparse.ArgumentParser(description='Sonda os tipos de entrada/saída das funções do UniversalWrapper')
+    parser.add_argument('funcoes', nargs='*', help='Funções a sondar (default: todas)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_SONDAGEM,
+                        help=f'Limite de cada chamada, em segundos (default: {TIMEOUT_SONDAGEM:g})')
+    parser.add_argument('--forcar', action='store_true', help='Volta a sondar as funções já sondadas')
+    args = parser.parse_args()
+
+    indice = IndiceAssinaturas()
+    sondadas = indice.sondar(UniversalWrapper(), args.funcoes or None, args.timeout, args.forcar)
+    print(f"✅ {len(sondadas)} funções sondadas → {indice.caminho}")
+    imprimir_relatorio(indice)
@@ -28,7 +28,7 @@ def testar_heuristica():
         todas_dependencias = despachante.obter_todas_dependencias()
         
         # Carrega os dados históricos, pois algumas heurísticas precisam deles
-        dados_manager = Dados()
+        dados_manager = Dados(usar_cache_persistente=True)
         estatisticas, erros_dados = dados_manager.obter_estatisticas(todas_dependencias)
 
         if erros_dados:
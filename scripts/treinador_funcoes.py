@@ -36,6 +36,9 @@ def treinar_e_encontrar_logica(ano_alvo: int):
     total_sorteios_analisados = len(sorteios_do_ano) - 1
     dados_numeros_em_falta = defaultdict(list)
     
+    # Vistas sobre os sorteios do ano: cada prefixo reutiliza os dados já carregados
+    dados_do_ano = Dados.a_partir_de(sorteios_do_ano, dados_manager.caminho_dados)
+
     # Simulação incremental do histórico
     for i in range(1, len(sorteios_do_ano)):
         historico_incremental = sorteios_do_ano[:i]
@@ -74,8 +77,7 @@ def treinar_e_encontrar_logica(ano_alvo: int):
         # Analisa e acumula dados sobre os números em falta
         numeros_em_falta = sorted(list(numeros_alvo - numeros_previstos_unicos))
         if numeros_em_falta:
-            dados_parciais = Dados()
-            dados_parciais.sorteios = historico_incremental
+            dados_parciais = dados_do_ano.ate(i)
             
             estatisticas_completas, _ = dados_parciais.obter_estatisticas(todas_dependencias)
             
@@ -101,8 +103,7 @@ def treinar_e_encontrar_logica(ano_alvo: int):
         })
 
     # ATUALIZADO: Calcula as médias gerais das estatísticas
-    dados_manager_completo = Dados()
-    estatisticas_completas_finais, _ = dados_manager_completo.obter_estatisticas(todas_dependencias)
+    estatisticas_completas_finais, _ = dados_manager.obter_estatisticas(todas_dependencias)
     estatisticas_medias_dict = {}
 
     for estat_nome, estat_dict in estatisticas_completas_finais.items():
@@ -80,11 +80,9 @@ def treinar_decisor():
         heuristicas_ordenadas = sorted(list(metadados_heuristicas.keys()))
 
         for i in range(len(sorteios_historico) - 1):
-            # IMPORTANTE: Cria uma nova instância de Dados com um subconjunto do histórico
+            # IMPORTANTE: Usa uma vista de Dados com um subconjunto do histórico
             # Isso simula o conhecimento do sistema em cada ponto do tempo.
-            historico_parcial = sorteios_historico[:i+1]
-            dados_parciais = Dados()
-            dados_parciais.sorteios = historico_parcial
+            dados_parciais = dados_manager.ate(i + 1)
             
             sorteio_alvo = sorteios_historico[i+1]
             
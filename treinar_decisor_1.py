@@ -2,7 +2,6 @@
 import os
 import sys
 import json
-import numpy as np
 import joblib
 from collections import defaultdict
 from typing import Dict, Any, List
@@ -20,6 +19,7 @@ if PROJECT_ROOT not in sys.path:
 # IMPORTANTE: Agora importamos a classe 'Dados' em vez das funções
 from lib.dados import Dados 
 from lib.despachante_new import Despachante
+from decisor.tensor_previsoes import TensorPrevisoes
 
 # Adicionamos os imports para os modelos e o scaler
 from sklearn.preprocessing import StandardScaler
@@ -30,6 +30,7 @@ from sklearn.metrics import accuracy_score
 MODELOS_DIR = os.path.join(PROJECT_ROOT, 'decisor', 'modelos_salvos')
 PERFORMANCE_PATH = os.path.join(MODELOS_DIR, 'performance_modelos.json')
 METADADOS_PATH = os.path.join(PROJECT_ROOT, 'decisor', 'metadados_modelo.json')
+PERFIL_HEURISTICAS_PATH = os.path.join(PROJECT_ROOT, 'decisor', 'perfil_heuristicas.json')
 MODELOS_ML_DIR = os.path.join(PROJECT_ROOT, 'modelos_ml')
 
 if not os.path.exists(MODELOS_DIR):
@@ -64,7 +65,7 @@ def treinar_decisor(usar_heuristicas_dinamicas: bool = True, num_heuristicas_din
     try:
         # 1. Carrega o despachante COM HEURÍSTICAS DINÂMICAS
         print("🎯 Iniciando o treino. Carregando heurísticas e dados...")
-        despachante = Despachante(usar_dinamicas=usar_heuristicas_dinamicas)
+        despachante = Despachante(usar_dinamicas=usar_heuristicas_dinamicas, usar_cache_previsoes=True)
         
         # IMPORTANTE: Instancia a classe Dados para carregar os sorteios
         dados_manager = Dados()
@@ -90,8 +91,6 @@ def treinar_decisor(usar_heuristicas_dinamicas: bool = True, num_heuristicas_din
             return
 
         print("🔄 Simulando previsões de heurísticas (fixas + dinâmicas) para dados históricos...")
-        X_treino = []
-        y_treino = []
         
         # CORREÇÃO: Altera o nome do método de 'get_metadados' para 'obter_metadados'
         metadados_heuristicas = despachante.obter_metadados()
@@ -105,30 +104,13 @@ def treinar_decisor(usar_heuristicas_dinamicas: bool = True, num_heuristicas_din
         total_sorteios = len(sorteios_historico)
         print(f"📈 Processando {total_sorteios - 1} pontos de treino...")
 
-        for i in range(len(sorteios_historico) - 1):
-            if (i + 1) % 50 == 0:
-                print(f"   Processados {i + 1}/{total_sorteios - 1} sorteios...")
-                
-            # IMPORTANTE: Cria uma nova instância de Dados com um subconjunto do histórico
-            # Isso simula o conhecimento do sistema em cada ponto do tempo.
-            historico_parcial = sorteios_historico[:i+1]
-            dados_parciais = Dados()
-            dados_parciais.sorteios = historico_parcial
-            
-            sorteio_alvo = sorteios_historico[i+1]
-            
-            # Chama o método da instância para obter as estatísticas
-            estatisticas_parciais, _ = dados_parciais.obter_estatisticas(todas_dependencias)
-            
-            previsoes_sorteio_atual = despachante.get_previsoes(estatisticas_parciais)
-            
-            for num in range(1, 50):
-                feature_vector = [1 if num in previsoes_sorteio_atual.get(h, []) else 0 for h in heuristicas_ordenadas]
-                X_treino.append(feature_vector)
-                y_treino.append(1 if num in sorteio_alvo.get("numeros", []) else 0)
+        # As previsões de cada ponto do histórico vêm do tensor persistente de previsões:
+        # só os sorteios e as heurísticas que ainda lá não estão são simulados.
+        tensor = TensorPrevisoes.para_dados(dados_manager).atualizar(dados_manager, despachante)
 
-        X_treino_np = np.array(X_treino)
-        y_treino_np = np.array(y_treino)
+        # Linha i: previsões conhecendo os primeiros i + 1 sorteios; alvo: o sorteio i + 1
+        X_treino_np = tensor.caracteristicas(heuristicas_ordenadas, fim=total_sorteios - 1)
+        y_treino_np = dados_manager.matriz.incidencia[1:total_sorteios, :49].reshape(-1).astype(int)
 
         print(f"✅ Conjunto de treino criado: {X_treino_np.shape[0]} amostras, {X_treino_np.shape[1]} características")
 
@@ -208,6 +190,10 @@ def treinar_decisor(usar_heuristicas_dinamicas: bool = True, num_heuristicas_din
         print(f"   • Dependências únicas: {stats['dependencias_unicas']}")
         print(f"   • Modelos treinados: {len(resultados_treino)}")
         print(f"   • Dimensões do dataset: {X_treino_np.shape}")
+
+        # Heurísticas que dominaram o tempo de simulação (só as que não vieram da cache)
+        despachante.perfil.exportar_json(PERFIL_HEURISTICAS_PATH)
+        despachante.perfil.imprimir_resumo()
         
         if resultados_treino:
             melhor_modelo = max(resultados_treino.items(), key=lambda x: x[1]['score_treino'])